@@ -0,0 +1,124 @@
+import pygame
+from safe_loader import load_frames
+from memory_accountant import track, track_all
+
+# Общие наборы анимаций по имени: все экземпляры сущности используют один набор
+_animation_sets = {}
+
+
+def _bake_rage(frame):
+    # Красный оттенок ярости (то же, что раньше делал BossStrong.draw каждый кадр)
+    baked = frame.copy()
+    red_overlay = pygame.Surface(baked.get_size())
+    red_overlay.fill((255, 100, 100))
+    red_overlay.set_alpha(80)
+    baked.blit(red_overlay, (0, 0), special_flags=pygame.BLEND_ADD)
+    return baked
+
+
+def _bake_hurt(frame):
+    # Полупрозрачное мигание при получении урона
+    baked = frame.copy()
+    baked.set_alpha(128)
+    return baked
+
+
+def _bake_flash(frame):
+    # Белая вспышка от попадания
+    baked = frame.copy()
+    baked.fill((255, 255, 255), special_flags=pygame.BLEND_RGB_MAX)
+    return baked
+
+
+EFFECTS = {
+    "rage": _bake_rage,
+    "hurt": _bake_hurt,
+    "flash": _bake_flash,
+}
+
+# (кадр, эффект) -> запеченный кадр; кадры общие, поэтому ключ - сам Surface
+_effect_cache = {}
+
+
+def register_effect(name, bake):
+    """Adds a frame effect: bake(frame) -> new Surface, called once per frame"""
+    EFFECTS[name] = bake
+
+
+def effect_frame(frame, effect, owner=None):
+    """Baked variant of a single frame, built on first use and then reused"""
+    key = (frame, effect)
+    baked = _effect_cache.get(key)
+    if baked is None:
+        baked = EFFECTS[effect](frame)
+        track(baked, "entities" if owner else "assets", owner or "baked effects")
+        _effect_cache[key] = baked
+    return baked
+
+
+class AnimationSet:
+    """Directional animation states built once from the shared sprite registry.
+
+    Left frames are mirrored from the right sheet unless a real left sheet is
+    given (for sprites whose left version is drawn differently).
+    """
+
+    def __init__(self, scale=1):
+        self.scale = scale
+        self.states = {}
+        self.variants = {}
+        self.owner = None   # тип сущности для memory_accountant
+
+    def add(self, name, path, frame_count=None, frame_w=None, frame_h=None,
+            left_path=None, directional=True):
+        right = load_frames(path, frame_count, frame_w, frame_h, self.scale)
+        if left_path:
+            left = load_frames(left_path, frame_count, frame_w, frame_h, self.scale)
+        elif directional:
+            left = load_frames(path, frame_count, frame_w, frame_h, self.scale, flip=True)
+        else:
+            left = right
+        self.states[(name, "right")] = right
+        self.states[(name, "left")] = left
+        # Доступ по составному имени, например "run_left"
+        self.states[f"{name}_right"] = right
+        self.states[f"{name}_left"] = left
+        return self
+
+    def frames(self, name, facing="right"):
+        return self.states[(name, facing)]
+
+    def get(self, key, default=None):
+        return self.states.get(key, default)
+
+    def variant(self, effect):
+        """Same states with an effect ("rage", "hurt", ...) baked into every frame"""
+        baked = self.variants.get(effect)
+        if baked is None:
+            baked = AnimationSet(self.scale)
+            baked.owner = self.owner
+            for key, frames in self.states.items():
+                baked.states[key] = tuple(effect_frame(frame, effect, self.owner) for frame in frames)
+            self.variants[effect] = baked
+        return baked
+
+
+def get_animation_set(key, build, owner=None):
+    """Returns the shared AnimationSet for key, calling build() on first use
+
+    owner: entity type its frames are accounted to (memory_accountant)
+    """
+    animations = _animation_sets.get(key)
+    if animations is None:
+        animations = build()
+        if owner:
+            animations.owner = owner
+            for frames in animations.states.values():
+                track_all(frames, "entities", owner)
+        _animation_sets[key] = animations
+    return animations
+
+
+def clear_animation_sets():
+    _animation_sets.clear()
+    _effect_cache.clear()
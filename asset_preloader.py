@@ -0,0 +1,161 @@
+# asset_preloader.py - decodes game assets in background threads while the menu runs
+#
+# PNG decoding happens in a thread pool (pygame releases the GIL inside
+# image.load), convert_alpha() must run on the main thread, so poll() is called
+# once per menu frame and converts a few finished images at a time.
+import os
+import sys
+import glob
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+import safe_loader
+import tracing
+from safe_loader import resource_path
+
+
+def get_preload_manifest():
+    """Asset paths to warm up: atlas pages if the atlas is built, else loose PNGs"""
+    if safe_loader.asset_exists(safe_loader.ATLAS_MANIFEST):
+        try:
+            manifest = json.loads(safe_loader.read_asset_text(safe_loader.ATLAS_MANIFEST))
+            atlas_dir = os.path.dirname(safe_loader.ATLAS_MANIFEST)
+            return [f"{atlas_dir}/{page}" for page in manifest["pages"]]
+        except Exception as e:
+            print(f"Error reading atlas manifest: {e}, preloading loose files")
+
+    packed = sorted(
+        name for name in safe_loader.open_pack()
+        if name.startswith("assets/") and name.endswith(".png") and name.count("/") == 1
+    )
+    if packed:
+        return packed
+
+    assets_dir = resource_path("assets")
+    return [
+        "assets/" + os.path.basename(path)
+        for path in sorted(glob.glob(os.path.join(assets_dir, "*.png")))
+    ]
+
+
+def _decode(path):
+    # Только декодирование - без convert, его можно делать лишь в главном потоке
+    return safe_loader.decode_image(path)
+
+
+class AssetPreloader:
+    def __init__(self, paths=None, workers=4, convert_per_poll=4):
+        self.paths = list(paths) if paths is not None else get_preload_manifest()
+        self.workers = workers
+        self.convert_per_poll = convert_per_poll
+        self.executor = None
+        self.pending = {}
+        self.loaded = 0
+        self.failed = 0
+        self.start_time = 0
+        self.elapsed = None
+
+    def start(self):
+        """Submits every asset to the thread pool and returns immediately"""
+        self.start_time = time.perf_counter()
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        for path in self.paths:
+            if safe_loader.asset_exists(path):
+                self.pending[path] = self.executor.submit(_decode, path)
+            else:
+                self.failed += 1
+        if not self.pending:
+            self._finish()
+        return self
+
+    @property
+    def total(self):
+        return len(self.paths)
+
+    @property
+    def done(self):
+        return self.elapsed is not None
+
+    @property
+    def progress(self):
+        if not self.total:
+            return 1.0
+        return (self.loaded + self.failed) / self.total
+
+    @tracing.traced("preloader.convert")
+    def poll(self, limit=None):
+        """Converts up to `limit` finished images on the main thread"""
+        if self.done:
+            return True
+
+        limit = self.convert_per_poll if limit is None else limit
+        for path, future in list(self.pending.items()):
+            if limit <= 0:
+                break
+            if not future.done():
+                continue
+            del self.pending[path]
+            try:
+                safe_loader.register_preloaded(path, future.result().convert_alpha())
+                self.loaded += 1
+            except Exception as e:
+                print(f"Preload failed for {path}: {e}")
+                self.failed += 1
+            limit -= 1
+
+        if not self.pending:
+            self._finish()
+        return self.done
+
+    def finish(self):
+        """Blocks until every asset is decoded and converted"""
+        while not self.done:
+            self.poll(limit=len(self.pending))
+            if not self.done:
+                time.sleep(0.001)
+        return self
+
+    def _finish(self):
+        # Атлас нарезается сразу, чтобы первая загрузка сущностей не платила за это
+        safe_loader.load_atlas()
+        self.elapsed = time.perf_counter() - self.start_time
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        print(f"Preloaded {self.loaded}/{self.total} assets in {self.elapsed * 1000:.1f} ms")
+
+    def draw_progress(self, surface, font):
+        """Progress bar at the bottom of the screen while preloading"""
+        if self.done:
+            return
+        width, height = 300, 6
+        x = (surface.get_width() - width) // 2
+        y = surface.get_height() - 90
+        pygame.draw.rect(surface, (50, 50, 50), (x, y, width, height))
+        pygame.draw.rect(surface, (100, 255, 150), (x, y, int(width * self.progress), height))
+        text = safe_loader.render_text(font, f"Loading {int(self.progress * 100)}%", (150, 150, 150))
+        surface.blit(text, text.get_rect(center=(surface.get_width() // 2, y - 12)))
+
+
+def measure_preload(runs=2, workers=4):
+    """Preload timings: the first run is cold (process caches empty), the rest warm.
+
+    Only process-level caches are cleared between runs; the OS file cache stays
+    warm, so drop it by hand (or reboot) for a true cold-disk number.
+    """
+    timings = []
+    for run in range(runs):
+        safe_loader.clear_cache()
+        preloader = AssetPreloader(workers=workers).start().finish()
+        timings.append(preloader.elapsed)
+    return {"cold_ms": timings[0] * 1000, "warm_ms": [t * 1000 for t in timings[1:]]}
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    print(json.dumps(measure_preload(runs=3, workers=workers), indent=2))
+    pygame.quit()
@@ -0,0 +1,163 @@
+# bench_ecs.py - hand-written entity lists vs the ecs.World systems
+#
+#   python benchmarks/bench_ecs.py
+#
+# Both sides keep a steady population of fireballs (2 s lifetime) and
+# lightning effects (one-shot animation) alive for a number of 60 Hz ticks
+# and draw them to an offscreen surface. "lists" is the old start_game_loop
+# code (update loop + list comprehension, lightnings[:] copy + remove()) with
+# the self-updating ListFireball / ListLightning bodies the game had before;
+# "ecs" runs movement/animation/lifetime/render systems with deferred
+# swap-remove. Reported: median ms per tick for the update and draw parts
+# and gen-0 GC collections.
+import os
+import sys
+import gc
+import json
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from bench_swarm import median_ms
+from pool import Pool
+from fireball import Fireball
+from lightning_spell import LightningSpell
+
+DT = 1 / 60
+
+
+class ListFireball(Fireball):
+    """Baseline: a fireball that moves and ages itself (pre-ECS)"""
+    __slots__ = ("timer",)
+
+    def reset(self, x, y, direction):
+        super().reset(x, y, direction)
+        self.timer = 0
+
+    def update(self, dt):
+        self.prev_pos.update(self.pos)
+        self.pos += self.direction * (self.speed * dt)
+        self.rect.topleft = (round(self.pos.x), round(self.pos.y))
+        self.timer += dt
+
+
+class ListLightning(LightningSpell):
+    """Baseline: a lightning effect that animates itself and raises `finished`"""
+    __slots__ = ("finished",)
+
+    def reset(self, x, y):
+        super().reset(x, y)
+        self.finished = False
+
+    def update(self, dt):
+        self.timer += dt
+        if self.timer >= self.animation_speed:
+            self.timer = 0
+            self.frame_index += 1
+            if self.frame_index >= len(self.frames):
+                self.finished = True
+
+    def draw(self, surface, camera_offset, alpha=1.0):
+        if not self.finished:
+            super().draw(surface, camera_offset, alpha)
+
+
+LIST_FIREBALL_POOL = Pool("list_fireball", lambda: ListFireball(0, 0, pygame.Vector2(1, 0)), prewarm=32)
+LIST_LIGHTNING_POOL = Pool("list_lightning", lambda: ListLightning(0, 0), prewarm=16)
+
+
+def spawn_rate(population, lifetime_ticks):
+    return max(1, population // lifetime_ticks)
+
+
+def run_lists(population, ticks, surface, camera):
+    FIREBALL_POOL, LIGHTNING_POOL = LIST_FIREBALL_POOL, LIST_LIGHTNING_POOL
+    right = pygame.Vector2(1, 0)
+    fireballs, lightnings = [], []
+    update_t, draw_t = [], []
+    gen0 = gc.get_stats()[0]["collections"]
+    for tick in range(ticks):
+        for _ in range(spawn_rate(population, 120)):
+            fireballs.append(FIREBALL_POOL.acquire(100, 300, right))
+        for _ in range(spawn_rate(population, 40)):
+            lightnings.append(LIGHTNING_POOL.acquire(300, 300))
+        start = time.perf_counter()
+        for fireball in fireballs:
+            fireball.update(DT)
+            if fireball.timer > fireball.lifetime:
+                FIREBALL_POOL.release(fireball)
+        fireballs = [f for f in fireballs if f.timer <= f.lifetime]
+        for lightning in lightnings[:]:
+            lightning.update(DT)
+            if lightning.finished:
+                lightnings.remove(lightning)
+                LIGHTNING_POOL.release(lightning)
+        mid = time.perf_counter()
+        for fireball in fireballs:
+            fireball.draw(surface, camera, 0.5)
+        for lightning in lightnings:
+            lightning.draw(surface, camera)
+        update_t.append(mid - start)
+        draw_t.append(time.perf_counter() - mid)
+    FIREBALL_POOL.release_all(fireballs)
+    LIGHTNING_POOL.release_all(lightnings)
+    return median_ms(update_t), median_ms(draw_t), gc.get_stats()[0]["collections"] - gen0
+
+
+def run_ecs(population, ticks, surface, camera):
+    from ecs import World
+    from systems import movement_system, animation_system, lifetime_system, render_system
+    from fireball import FIREBALL_POOL
+    from lightning_spell import LIGHTNING_POOL
+    world = World()
+    world.define("fireball", ("body", "velocity", "lifetime"), on_destroy=FIREBALL_POOL.release)
+    world.define("lightning", ("body", "anim"), on_destroy=LIGHTNING_POOL.release)
+    right = pygame.Vector2(1, 0)
+    update_t, draw_t = [], []
+    gen0 = gc.get_stats()[0]["collections"]
+    for tick in range(ticks):
+        for _ in range(spawn_rate(population, 120)):
+            fireball = FIREBALL_POOL.acquire(100, 300, right)
+            world.spawn("fireball", body=fireball, velocity=fireball.direction * Fireball.speed,
+                        lifetime=Fireball.lifetime)
+        for _ in range(spawn_rate(population, 40)):
+            world.spawn("lightning", body=LIGHTNING_POOL.acquire(300, 300), anim=False)
+        start = time.perf_counter()
+        movement_system(world, DT)
+        animation_system(world, DT)
+        lifetime_system(world, DT)
+        world.flush()
+        mid = time.perf_counter()
+        render_system(world, surface, camera, 0.5)
+        update_t.append(mid - start)
+        draw_t.append(time.perf_counter() - mid)
+    world.clear()
+    return median_ms(update_t), median_ms(draw_t), gc.get_stats()[0]["collections"] - gen0
+
+
+def main(populations=(50, 200, 1000), ticks=600):
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    from pool import prewarm_pools
+    prewarm_pools()
+    surface = pygame.Surface((1280, 720))
+    camera = pygame.Vector2(0, 0)
+    rows = []
+    for population in populations:
+        lists_update, lists_draw, lists_gc = run_lists(population, ticks, surface, camera)
+        ecs_update, ecs_draw, ecs_gc = run_ecs(population, ticks, surface, camera)
+        rows.append({"population": population,
+                     "lists_update_ms": lists_update, "ecs_update_ms": ecs_update,
+                     "lists_draw_ms": lists_draw, "ecs_draw_ms": ecs_draw,
+                     "lists_gen0": lists_gc, "ecs_gen0": ecs_gc})
+    print(json.dumps(rows, indent=2))
+    pygame.quit()
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# bench_entity_memory.py - bytes per live entity, __slots__ vs per-instance __dict__
+#
+#   python benchmarks/bench_entity_memory.py
+#
+# For each entity class, builds 1k and 10k live instances under tracemalloc and
+# reports the traced bytes per instance (the instance plus its own Rect/Vector2
+# members; shared frame tuples come from the sprite registry and are loaded
+# before tracing starts). The "dict" column is the same class rebuilt without
+# __slots__, i.e. the old layout with every attribute in a per-instance dict.
+import os
+import sys
+import io
+import gc
+import json
+import random
+import tracemalloc
+import contextlib
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+
+def unslotted(cls):
+    """Copy of cls that keeps its attributes in a per-instance __dict__"""
+    slots = getattr(cls, "__slots__", ())
+    if isinstance(slots, str):
+        slots = (slots,)
+    namespace = {
+        name: value for name, value in cls.__dict__.items()
+        if name not in slots and name not in ("__slots__", "__dict__", "__weakref__")
+    }
+    return type(cls.__name__, cls.__bases__, namespace)
+
+
+def bytes_per_entity(make, count):
+    rng = random.Random(count)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # Конструкторы боссов печатают в консоль - глушим на время замера
+    with contextlib.redirect_stdout(io.StringIO()):
+        entities = [make(rng.randint(0, 1200), rng.randint(0, 1200)) for _ in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - before - sys.getsizeof(entities)
+    tracemalloc.stop()
+    del entities
+    return round(used / count, 1)
+
+
+def entity_factories():
+    from ghost import Ghost
+    from tank_ghost import TankGhost
+    from shooter_ghost import ShooterGhost
+    from fireball import Fireball
+    from damage_number import DamageNumber
+    from lightning_spell import LightningSpell
+    from potion import Potion
+    from manamushroom import ManaMushroom
+    from boss_pepe import BossPepe
+    right = pygame.Vector2(1, 0)
+    return {
+        "Ghost": (Ghost, lambda cls, x, y: cls(x, y)),
+        "TankGhost": (TankGhost, lambda cls, x, y: cls(x, y)),
+        "ShooterGhost": (ShooterGhost, lambda cls, x, y: cls(x, y)),
+        "Fireball": (Fireball, lambda cls, x, y: cls(x, y, right)),
+        "DamageNumber": (DamageNumber, lambda cls, x, y: cls(x, y)),
+        "LightningSpell": (LightningSpell, lambda cls, x, y: cls(x, y)),
+        "Potion": (Potion, lambda cls, x, y: cls(x, y)),
+        "ManaMushroom": (ManaMushroom, lambda cls, x, y: cls(x, y)),
+        "BossPepe": (BossPepe, lambda cls, x, y: cls(x, y, 1)),
+    }
+
+
+def main(counts=(1000, 10000)):
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    rows = []
+    for name, (cls, build) in entity_factories().items():
+        dict_cls = unslotted(cls)
+        # Прогрев: кадры и изображения попадают в общий реестр до замера
+        with contextlib.redirect_stdout(io.StringIO()):
+            build(cls, 0, 0)
+            build(dict_cls, 0, 0)
+        row = {"entity": name, "slots": hasattr(cls, "__slots__")}
+        for count in counts:
+            row[f"dict_bytes_{count}"] = bytes_per_entity(lambda x, y: build(dict_cls, x, y), count)
+            row[f"slots_bytes_{count}"] = bytes_per_entity(lambda x, y: build(cls, x, y), count)
+        rows.append(row)
+    print(json.dumps(rows, indent=2))
+    pygame.quit()
+    return rows
+
+
+if __name__ == "__main__":
+    main()
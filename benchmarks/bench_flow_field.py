@@ -0,0 +1,133 @@
+# bench_flow_field.py - cost and effect of the shared wall-aware flow field
+#
+#   python benchmarks/bench_flow_field.py
+#
+# "rebuild": milliseconds for one field rebuild (BFS + next-cell pass) on the
+# real walls.json map and on larger random maps with ~10% wall cells.
+# "swarm": median GhostSwarm.update ms per tick with and without the field
+# (the player walks around, so the field keeps being re-pointed).
+# "paths": point ghosts dropped on free cells of walls.json walk towards the
+# player; reported is the share of ghost-ticks spent inside wall cells and how
+# many reached the player, straight seek vs flow field.
+import os
+import sys
+import json
+import time
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from bench_swarm import Dummy, make_horde, median_ms, DT, WORLD_SIZE
+
+CELL = 32
+
+
+def load_grid():
+    from wall_grid import WallGrid
+    with open("walls.json") as f:
+        return WallGrid.from_json_data(json.load(f), WORLD_SIZE, WORLD_SIZE)
+
+
+def random_grid(size, seed=1):
+    from wall_grid import WallGrid
+    rng = random.Random(seed)
+    cells = size // CELL
+    walls = [(rng.randrange(cells) * CELL, rng.randrange(cells) * CELL, CELL, CELL)
+             for _ in range(cells * cells // 10)]
+    return WallGrid.from_json_data(walls, size, size)
+
+
+def rebuild_ms(grid, goals=50, seed=2):
+    from flow_field import FlowField
+    rng = random.Random(seed)
+    field = FlowField(grid, cache_size=0)
+    samples = []
+    for _ in range(goals):
+        x, y = rng.randrange(grid.cols * CELL), rng.randrange(grid.rows * CELL)
+        field.goal = -1
+        start = time.perf_counter()
+        field.update(x, y)
+        samples.append(time.perf_counter() - start)
+    return median_ms(samples)
+
+
+def run_swarm(count, ticks, flow):
+    from ghost_swarm import GhostSwarm
+    player = Dummy()
+    ghosts = GhostSwarm()
+    for ghost in make_horde(count):
+        ghosts.append(ghost)
+    samples = []
+    for tick in range(ticks):
+        # Игрок ходит по кругу, чтобы поле перестраивалось
+        player.rect.x = WORLD_SIZE // 2 + int(200 * pygame.math.Vector2(1, 0).rotate(tick * 3).x)
+        start = time.perf_counter()
+        if flow is not None:
+            flow.update(*player.rect.center)
+        ghosts.update(DT, player, flow)
+        samples.append(time.perf_counter() - start)
+    return median_ms(samples)
+
+
+def walk(grid, flow, agents=300, ticks=900, speed=100, seed=3):
+    rng = random.Random(seed)
+    goal = (WORLD_SIZE // 2, WORLD_SIZE // 2)
+    if flow is not None:
+        flow.update(*goal)
+    points = []
+    while len(points) < agents:
+        cx, cy = rng.randrange(grid.cols), rng.randrange(grid.rows)
+        if not grid.blocked(cx, cy):
+            points.append([cx * CELL + CELL / 2, cy * CELL + CELL / 2])
+    in_wall = 0
+    reached = 0
+    for point in points:
+        for _ in range(ticks):
+            dx, dy = goal[0] - point[0], goal[1] - point[1]
+            if dx * dx + dy * dy < 32 * 32:
+                reached += 1
+                break
+            target = flow.steer(*point) if flow is not None else None
+            tx, ty = target if target is not None else goal
+            move = pygame.Vector2(tx - point[0], ty - point[1])
+            if move.length() > 0:
+                move.scale_to_length(speed * DT)
+            point[0] += move.x
+            point[1] += move.y
+            if grid.blocked(int(point[0] // CELL), int(point[1] // CELL)):
+                in_wall += 1
+    return {"wall_tick_share": round(in_wall / (agents * ticks), 4), "reached": reached, "agents": agents}
+
+
+def main(counts=(100, 500, 1000, 2000), ticks=120):
+    from flow_field import FlowField
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    grid = load_grid()
+    results = {
+        "rebuild": [{"map": "walls.json", "cells": grid.cols * grid.rows, "ms": rebuild_ms(grid)}],
+        "swarm": [],
+        "paths": {"straight": walk(grid, None), "flow_field": walk(grid, FlowField(grid))},
+    }
+    for size in (2400, 4800):
+        big = random_grid(size)
+        results["rebuild"].append({"map": f"random {size}px", "cells": big.cols * big.rows, "ms": rebuild_ms(big)})
+    for count in counts:
+        flow = FlowField(grid)
+        results["swarm"].append({
+            "ghosts": count,
+            "straight_ms": run_swarm(count, ticks, None),
+            "flow_ms": run_swarm(count, ticks, flow),
+            "rebuilds": flow.recomputes, "cache_hits": flow.cache_hits,
+        })
+    print(json.dumps(results, indent=2))
+    pygame.quit()
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# bench_gc_policy.py - what gc.freeze() and the gameplay thresholds buy
+#
+#   python benchmarks/bench_gc_policy.py
+#
+# Builds what start_game_loop has before the first frame (preloaded assets,
+# pools, a GameSession), then times gc.collect() of each generation with the
+# heap as it is and after GcPolicy.enter_game() froze it: a collection only
+# scans the unfrozen objects, so a full collection during play costs what the
+# game allocated since it started, not the whole loaded game. Then plays
+# `ticks` bot ticks per policy and reports the collections CPython started by
+# itself and their pauses. Reported as JSON.
+import os
+import gc
+import sys
+import json
+import time
+import contextlib
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+BOUNDS = 1200
+
+
+def build_game(seed):
+    from main import load_walls
+    from wall_grid import WallGrid
+    from game_session import GameSession
+    from asset_preloader import AssetPreloader
+    from pool import prewarm_pools, reset_pools
+    AssetPreloader().start().finish()
+    wall_grid = WallGrid(load_walls(BOUNDS, BOUNDS), BOUNDS, BOUNDS)
+    reset_pools()
+    prewarm_pools()
+    return GameSession(wall_grid, BOUNDS, BOUNDS, seed)
+
+
+def collect_ms(policy, generation, runs=5):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        policy.collect(generation)
+        times.append((time.perf_counter() - start) * 1000)
+    return round(min(times), 3)
+
+
+def play(session, ticks, policy, seed):
+    from headless import BotInput
+    bot = BotInput("kite", seed)
+    dt = 1 / 60
+    worst_tick = 0.0
+    while session.tick_count < ticks and not session.game_over:
+        started = time.perf_counter()
+        keys, events = bot.poll(dt, session.player, session.ghosts,
+                                session.player_level, session.inventory)
+        session.tick(keys, dt)
+        for event in events:
+            session.handle_key(event.key)
+        policy.end_frame()
+        worst_tick = max(worst_tick, time.perf_counter() - started)
+    return session.tick_count, round(worst_tick * 1000, 3)
+
+
+def main(ticks=20000, seed=0):
+    from gc_policy import GcPolicy
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    report = {}
+    with contextlib.redirect_stdout(sys.stderr):
+        for mode in ("default", "managed"):
+            session = build_game(seed)
+            gc.collect()
+            policy = GcPolicy(mode)
+            policy.enter_game()
+            row = {"scanned_objects": len(gc.get_objects()), "frozen": gc.get_freeze_count()}
+            for generation in (0, 1, 2):
+                row[f"collect_gen{generation}_ms"] = collect_ms(policy, generation)
+            played, row["worst_tick_ms"] = play(session, ticks, policy, seed)
+            row["ticks"] = played
+            summary = policy.summary()
+            row["automatic_collections"] = summary["automatic"]
+            row["automatic_pause_ms_max"] = summary["pause_ms_max"]
+            policy.close()
+            report[mode] = row
+            del session
+    print(json.dumps(report, indent=2))
+    pygame.quit()
+    return report
+
+
+if __name__ == "__main__":
+    main()
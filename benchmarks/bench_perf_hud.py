@@ -0,0 +1,73 @@
+# bench_perf_hud.py - per-frame cost of the F4 performance overlay
+#
+#   python benchmarks/bench_perf_hud.py
+#
+# Replays the overlay's per-frame work without the game around it: the frame
+# start, one mark per frame phase (two ticks per frame, as at 60 Hz sim on a
+# 30 FPS frame), end_frame with the entity counts and draw onto a 1280x720
+# surface. "hidden" is what the loop does when the overlay is off: the
+# visibility test and the falsy `mark` checks. Reported: median and max us.
+import os
+import sys
+import json
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from game_session import TICK_PHASES
+
+COUNTS = {"ghosts": 120, "fireballs": 30, "enemy_projectiles": 40, "damage_numbers": 6}
+
+
+def frame(hud, timer, surface):
+    mark = timer.mark if hud.visible else None
+    if mark:
+        timer.begin_frame()
+        mark("events")
+    for _ in range(2):
+        for phase in TICK_PHASES:
+            if mark:
+                mark(phase)
+    if mark:
+        mark("events")
+        mark("world_draw")
+        hud.draw(surface)
+        mark("hud_draw")
+        mark("flip")
+        hud.end_frame(timer.take(), dict(COUNTS))
+
+
+def measure(hud, timer, surface, frames=3000):
+    samples = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        frame(hud, timer, surface)
+        samples.append(time.perf_counter() - start)
+        hud.fps_meter.add(1 / 60)
+    samples.sort()
+    return {"median_us": round(samples[len(samples) // 2] * 1e6, 2),
+            "p99_us": round(samples[int(len(samples) * 0.99)] * 1e6, 2),
+            "max_us": round(samples[-1] * 1e6, 2)}
+
+
+def main():
+    pygame.init()
+    surface = pygame.display.set_mode((1280, 720))
+    from perf_hud import FpsMeter, PerfHud, PhaseTimer
+    hud = PerfHud(FpsMeter())
+    timer = PhaseTimer()
+    hidden = measure(hud, timer, surface)
+    hud.toggle()
+    visible = measure(hud, timer, surface)
+    report = {"hidden": hidden, "visible": visible}
+    print(json.dumps(report, indent=2))
+    pygame.quit()
+    return report
+
+
+if __name__ == "__main__":
+    main()
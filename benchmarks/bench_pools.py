@@ -0,0 +1,126 @@
+# bench_pools.py - allocations during combat with and without the entity pools
+#
+#   python benchmarks/bench_pools.py
+#
+# Simulates a boss-fight burst (fireballs, enemy projectiles, damage numbers,
+# lightning) for a number of 60 Hz ticks. The "new" side constructs objects
+# like the game used to; the "pooled" side acquires/releases them. Reports
+# objects constructed, tracemalloc peak, gen-0 GC collections, time (measured
+# in a separate run without tracemalloc) and the pool high-water marks.
+import os
+import sys
+import gc
+import json
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from pool import POOLS
+
+DT = 1 / 60
+# Пулы по виду: огнешар и молния - самообновляющиеся тела из bench_ecs.py
+POOL_NAMES = {"fireball": "list_fireball", "shooter_projectile": "shooter_projectile",
+              "damage_number": "damage_number", "lightning": "list_lightning"}
+
+
+def combat(ticks, make, drop):
+    """make(kind, *args) -> object, drop(kind, obj) when it expires or the fight ends"""
+    live = {"fireball": [], "shooter_projectile": [], "damage_number": [], "lightning": []}
+    right = pygame.Vector2(1, 0)
+    down = pygame.Vector2(0, 1)
+    for tick in range(ticks):
+        if tick % 6 == 0:
+            live["fireball"].append(make("fireball", 600, 600, right))
+        if tick % 3 == 0:
+            live["shooter_projectile"].append(make("shooter_projectile", 600, 100, down))
+        if tick % 10 == 0:
+            live["damage_number"].append(make("damage_number", 600, 600, "1HP.png"))
+        if tick % 30 == 0:
+            for _ in range(4):
+                live["lightning"].append(make("lightning", 500, 500))
+
+        for kind, objs in live.items():
+            kept = []
+            for obj in objs:
+                obj.update(DT)
+                if kind == "fireball":
+                    done = obj.timer > obj.lifetime
+                elif kind == "shooter_projectile":
+                    done = not (0 <= obj.rect.x <= 2000 and 0 <= obj.rect.y <= 2000)
+                else:
+                    done = obj.finished
+                if done:
+                    drop(kind, obj)
+                else:
+                    kept.append(obj)
+            live[kind] = kept
+
+    for kind, objs in live.items():
+        for obj in objs:
+            drop(kind, obj)
+
+
+def measure(ticks, make, drop, constructed):
+    """constructed() -> objects built so far (read before and after the traced run)"""
+    start = time.perf_counter()
+    combat(ticks, make, drop)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    gen0_before = gc.get_stats()[0]["collections"]
+    built_before = constructed()
+    tracemalloc.start()
+    combat(ticks, make, drop)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "ms": round(elapsed * 1000, 1),
+        "objects_constructed": constructed() - built_before,
+        "peak_kib": round(peak / 1024, 1),
+        "gen0_collections": gc.get_stats()[0]["collections"] - gen0_before,
+    }
+
+
+def main(ticks=30 * 60):
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    # Старые самообновляющиеся объекты теперь живут только в бенчмарках
+    from bench_ecs import ListFireball, ListLightning
+    from bench_swarm import ObjectProjectile
+    from damage_number import DamageNumber
+    from pool import prewarm_pools
+
+    classes = {
+        "fireball": ListFireball,
+        "shooter_projectile": ObjectProjectile,
+        "damage_number": DamageNumber,
+        "lightning": ListLightning,
+    }
+    pools = {kind: POOLS[name] for kind, name in POOL_NAMES.items()}
+    prewarm_pools()
+
+    built = [0]
+
+    def construct(kind, *args):
+        built[0] += 1
+        return classes[kind](*args)
+
+    results = {
+        "new_objects": measure(ticks, construct, lambda kind, obj: None, lambda: built[0]),
+        "pooled": measure(ticks, lambda kind, *args: pools[kind].acquire(*args),
+                          lambda kind, obj: pools[kind].release(obj),
+                          lambda: sum(pool.created for pool in pools.values())),
+        "pools": {kind: pool.stats() for kind, pool in pools.items()},
+    }
+    print(json.dumps(results, indent=2))
+    pygame.quit()
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# bench_projectiles.py - per-shooter projectile lists vs the shared ProjectileBuffer
+#
+#   python benchmarks/bench_projectiles.py
+#
+# A ring of shooters keeps firing at a stationary player so that a steady
+# number of bullets is in flight. "lists" is the old path: pooled
+# ObjectProjectile objects (bench_swarm.py) in each shooter's list, per-object update and
+# bounds check on a list copy, per-object rect test against the player.
+# "buffer" is ProjectileBuffer.update + hit_test. Both also draw to an
+# offscreen surface. Reported: median ms per tick (update+hits, draw).
+import os
+import sys
+import json
+import math
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from bench_swarm import Dummy, median_ms, DT, WORLD_SIZE, PROJECTILE_POOL
+
+SPEED = 300
+DAMAGE = 2
+
+
+class NoShield:
+    def hit_rect(self):
+        return None
+
+
+def ring(count, radius=550):
+    """Shooter positions on a circle around the player, and their aim"""
+    cx = cy = WORLD_SIZE // 2
+    points = []
+    for i in range(count):
+        angle = 2 * math.pi * i / count
+        x = cx + radius * math.cos(angle)
+        y = cy + radius * math.sin(angle)
+        points.append((x, y, cx - x, cy - y))
+    return points
+
+
+def run_lists(bullets, ticks, surface, camera):
+    player = Dummy()
+    shooters = ring(max(1, bullets // 110))
+    lists = [[] for _ in shooters]
+    per_tick = bullets / 110  # ~110 тиков полета от кольца до игрока
+    update_t, draw_t = [], []
+    owed = 0.0
+    for tick in range(ticks):
+        owed += per_tick
+        while owed >= 1:
+            owed -= 1
+            k = int(owed * 7919) % len(shooters)
+            x, y, dx, dy = shooters[k]
+            lists[k].append(PROJECTILE_POOL.acquire(int(x), int(y), pygame.Vector2(dx, dy)))
+        start = time.perf_counter()
+        for projectiles in lists:
+            for p in projectiles[:]:
+                p.update(DT)
+                if not (0 <= p.rect.x <= 2000 and 0 <= p.rect.y <= 2000):
+                    projectiles.remove(p)
+                    PROJECTILE_POOL.release(p)
+            for p in projectiles[:]:
+                if player.rect.colliderect(p.rect):
+                    player.take_damage(DAMAGE)
+                    projectiles.remove(p)
+                    PROJECTILE_POOL.release(p)
+        mid = time.perf_counter()
+        for projectiles in lists:
+            for p in projectiles:
+                p.draw(surface, camera, 0.5)
+        update_t.append(mid - start)
+        draw_t.append(time.perf_counter() - mid)
+    live = sum(len(p) for p in lists)
+    for projectiles in lists:
+        PROJECTILE_POOL.release_all(projectiles)
+    return median_ms(update_t), median_ms(draw_t), live, player.damage
+
+
+def run_buffer(bullets, ticks, surface, camera):
+    from enemy_projectiles import ProjectileBuffer
+    player = Dummy()
+    player.shield = NoShield()
+    buffer = ProjectileBuffer()
+    sprite = buffer.sprite_id("2HP.png")
+    shooters = ring(max(1, bullets // 110))
+    per_tick = bullets / 110
+    update_t, draw_t = [], []
+    owed = 0.0
+    for tick in range(ticks):
+        owed += per_tick
+        while owed >= 1:
+            owed -= 1
+            k = int(owed * 7919) % len(shooters)
+            x, y, dx, dy = shooters[k]
+            buffer.spawn(int(x), int(y), dx, dy, SPEED, DAMAGE, sprite)
+        start = time.perf_counter()
+        buffer.update(DT)
+        buffer.hit_test(player)
+        mid = time.perf_counter()
+        buffer.draw(surface, camera, 0.5)
+        update_t.append(mid - start)
+        draw_t.append(time.perf_counter() - mid)
+    return median_ms(update_t), median_ms(draw_t), len(buffer), player.damage
+
+
+def main(counts=(100, 500, 2000, 5000), ticks=300):
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    surface = pygame.Surface((1280, 720))
+    camera = pygame.Vector2(WORLD_SIZE // 2 - 640, WORLD_SIZE // 2 - 360)
+    rows = []
+    for count in counts:
+        lists_update, lists_draw, lists_live, lists_damage = run_lists(count, ticks, surface, camera)
+        buf_update, buf_draw, buf_live, buf_damage = run_buffer(count, ticks, surface, camera)
+        rows.append({
+            "bullets_in_flight": buf_live, "lists_in_flight": lists_live,
+            "lists_update_ms": lists_update, "buffer_update_ms": buf_update,
+            "lists_draw_ms": lists_draw, "buffer_draw_ms": buf_draw,
+            "lists_damage": lists_damage, "buffer_damage": buf_damage,
+        })
+    print(json.dumps(rows, indent=2))
+    pygame.quit()
+    return rows
+
+
+if __name__ == "__main__":
+    main()
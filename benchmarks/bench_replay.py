@@ -0,0 +1,101 @@
+# bench_replay.py - record a bot game, replay it, seek with keyframes
+#
+#   python benchmarks/bench_replay.py
+#
+# Plays `ticks` fixed ticks of a GameSession with the headless kite bot while
+# a ReplayRecorder writes input and state hashes, then re-simulates the file
+# with ReplayPlayer and checks every tick. Seeks are timed twice for the same
+# targets: from a keyframe (every 600 ticks) and from tick 0 (no keyframes),
+# and each sought session is played on to the end to check that a restored
+# keyframe still matches the recording. Reported as JSON.
+import os
+import sys
+import json
+import time
+import zlib
+import contextlib
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+BOUNDS = 1200
+
+
+def make_factory():
+    from main import load_walls
+    from wall_grid import WallGrid
+    from game_session import GameSession
+    wall_grid = WallGrid(load_walls(BOUNDS, BOUNDS), BOUNDS, BOUNDS)
+    return lambda seed: GameSession(wall_grid, BOUNDS, BOUNDS, seed)
+
+
+def record(make_session, ticks, seed):
+    from headless import BotInput
+    from replay import ReplayRecorder
+    session = make_session(seed)
+    recorder = ReplayRecorder(session)
+    bot = BotInput("kite", seed)
+    dt = 1 / 60
+    started = time.perf_counter()
+    while session.tick_count < ticks and not session.game_over:
+        keys, events = bot.poll(dt, session.player, session.ghosts,
+                                session.player_level, session.inventory)
+        recorder.tick(keys)
+        session.tick(keys, dt)
+        recorder.state(session)
+        for event in events:
+            recorder.key(session, event.key)
+            session.handle_key(event.key)
+    elapsed = time.perf_counter() - started
+    return recorder, session.tick_count, elapsed
+
+
+def timed_seek(data, make_session, target, interval):
+    from replay import ReplayPlayer
+    player = ReplayPlayer(data, make_session, interval)
+    player.run()  # ключевые кадры появляются при первом проигрывании
+    started = time.perf_counter()
+    player.seek(target)
+    ms = (time.perf_counter() - started) * 1000
+    player.run()  # досчитать до конца от восстановленного состояния
+    return ms, player.diverged_at is None
+
+
+def main(ticks=6000, seed=7):
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    from replay import ReplayPlayer
+    with contextlib.redirect_stdout(sys.stderr):
+        make_session = make_factory()
+        recorder, recorded, record_s = record(make_session, ticks, seed)
+        blob = recorder.to_bytes()
+        data = json.loads(zlib.decompress(blob))
+        player = ReplayPlayer(data, make_session)
+        result = player.run()
+        seeks = []
+        for target in (recorded // 4, recorded // 2, recorded - 1):
+            keyframe_ms, keyframe_ok = timed_seek(data, make_session, target, 600)
+            # Без ключевых кадров: интервал больше записи - только тик 0
+            cold_ms, cold_ok = timed_seek(data, make_session, target, recorded + 1)
+            seeks.append({"tick": target, "keyframe_ms": round(keyframe_ms, 2),
+                          "from_start_ms": round(cold_ms, 2), "verified": keyframe_ok and cold_ok})
+    report = {
+        "ticks": recorded,
+        "record_ticks_per_second": round(recorded / record_s, 1),
+        "file_bytes": len(blob),
+        "bytes_per_tick": round(len(blob) / recorded, 2),
+        "replay_verified": result["verified"],
+        "replay_ticks_per_second": round(recorded / result["seconds"], 1),
+        "seeks": seeks,
+    }
+    print(json.dumps(report, indent=2))
+    pygame.quit()
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+# bench_stress.py - scenario stress suite: p50/p95/p99 per phase, scaling curves
+#
+#   python benchmarks/bench_stress.py [--ticks 300] [--scenario horde] [--no-curves] [--out stress.json]
+#
+# Every scenario builds a GameSession directly (no menu, no window besides
+# the dummy display), fills it with a fixed population - ghosts of each type,
+# fireballs in flight, both bosses (Strong in rage), damage numbers, a
+# lightning storm - and runs `ticks` fixed 60 Hz ticks with the full HUD.
+# The population is topped up before every tick (untimed), so it stays put
+# while fireballs expire and ghosts die. Per tick the suite times:
+#
+#   update     every GameSession.TICK_PHASES phase except collisions
+#   collision  the "collisions" phase (spatial hash, damage, contact passes)
+#   draw       world + HUD to a 1280x720 surface
+#
+# and reports p50/p95/p99 in ms plus the p50 of each tick phase. The scaling
+# curves sweep the ghost count (10 -> 5000, mixed types) and the fireball
+# count, with the cost per entity, so it is visible where ghost AI, the
+# fireball/effects pass and the draw pass stop scaling linearly.
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import contextlib
+import numpy as np
+import pygame
+
+DT = 1 / 60
+WORLD = 1200
+SCREEN = (1280, 720)
+WARMUP = 30
+
+# Сценарии: население, которое держится весь прогон
+SCENARIOS = {
+    "idle": {},
+    "early_waves": {"ghosts": (12, 4, 0), "fireballs": 8},
+    "late_waves": {"ghosts": (40, 40, 40), "fireballs": 30},
+    "horde": {"ghosts": (500, 250, 250), "fireballs": 100},
+    "boss_rage": {"ghosts": (30, 15, 15), "fireballs": 40, "bosses": True},
+    "damage_numbers": {"ghosts": (20, 0, 0), "damage_numbers": 300},
+    "lightning_storm": {"ghosts": (60, 0, 0), "lightning": 300},
+    "everything": {"ghosts": (300, 150, 150), "fireballs": 300, "bosses": True,
+                   "damage_numbers": 200, "lightning": 200},
+}
+
+
+class Stress:
+    """A GameSession with a population that is refilled before every tick"""
+
+    def __init__(self, wall_grid, spec, seed=1):
+        from game_session import GameSession
+        from headless import BotKeys
+        self.spec = spec
+        self.rng = random.Random(seed)
+        self.session = session = GameSession(wall_grid, WORLD, WORLD, seed)
+        self.keys = BotKeys()
+        player = session.player
+        player.max_hp = player.hp = 10 ** 9  # бессмертный игрок: сценарий не заканчивается
+        # Только заданное население: без волн и боссов по очкам
+        session.wave_manager.ghosts_in_wave = 0
+        session.wave_manager.wave_duration = 10 ** 9
+        session.boss_manager.boss_spawn_score = 10 ** 9
+        if spec.get("bosses"):
+            self.add_bosses()
+
+    def add_bosses(self):
+        from boss_pepe import BossPepe
+        from boss_strong import BossStrong
+        manager = self.session.boss_manager
+        cx = cy = WORLD // 2
+        pepe = BossPepe(cx - 200, cy - 150, power_level=5)
+        pepe.max_hp = pepe.hp = 10 ** 6  # огнешары не должны прогнать босса
+        manager.boss_pepe = pepe
+        strong = BossStrong(cx + 200, cy + 150, power_level=3)
+        strong.take_damage(int(strong.max_hp * (1 - strong.rage_threshold)) + 1)
+        strong.max_hp = 10 ** 6  # ярость уже включена, теперь - бессмертие
+        strong.hp = int(strong.max_hp * strong.rage_threshold)
+        manager.boss_strong = strong
+
+    def point(self, near=250, far=550):
+        """Random point on a ring around the player, inside the world"""
+        px, py = self.session.player.rect.center
+        angle = self.rng.uniform(0, 2 * np.pi)
+        radius = self.rng.uniform(near, far)
+        x = min(WORLD - 40, max(40, px + radius * np.cos(angle)))
+        y = min(WORLD - 40, max(40, py + radius * np.sin(angle)))
+        return int(x), int(y)
+
+    def top_up(self):
+        from ghost import Ghost
+        from tank_ghost import TankGhost
+        from shooter_ghost import ShooterGhost
+        from fireball import Fireball, FIREBALL_POOL
+        from lightning_spell import LIGHTNING_POOL
+        from damage_number import DAMAGE_NUMBER_POOL
+        session, spec = self.session, self.spec
+        ghosts = session.ghosts
+        kinds = (Ghost, TankGhost, ShooterGhost)
+        wanted = spec.get("ghosts", (0, 0, 0))
+        have = {cls: 0 for cls in kinds}
+        for view in ghosts:
+            have[view.kind_class] += 1
+        for cls, count in zip(kinds, wanted):
+            for _ in range(count - have[cls]):
+                ghosts.append(cls(*self.point()))
+
+        world = session.world
+        for _ in range(spec.get("fireballs", 0) - world.count("fireball")):
+            x, y = self.point(0, 400)
+            direction = pygame.Vector2(self.rng.choice((-1, 1)), 0)
+            fireball = FIREBALL_POOL.acquire(x, y, direction)
+            world.spawn("fireball", body=fireball, velocity=fireball.direction * Fireball.speed,
+                        lifetime=Fireball.lifetime)
+        for _ in range(spec.get("lightning", 0) - world.count("lightning")):
+            world.spawn("lightning", body=LIGHTNING_POOL.acquire(*self.point(0, 500)), anim=False)
+        numbers = session.player.damage_numbers
+        for _ in range(spec.get("damage_numbers", 0) - len(numbers)):
+            x, y = self.point(0, 300)
+            numbers.append(DAMAGE_NUMBER_POOL.acquire(x, y, "1HP.png"))
+
+
+def camera_for(player):
+    camera = pygame.Vector2(player.rect.centerx - SCREEN[0] // 2, player.rect.centery - SCREEN[1] // 2)
+    camera.x = max(0, min(camera.x, WORLD - SCREEN[0]))
+    camera.y = max(0, min(camera.y, WORLD - SCREEN[1]))
+    return camera
+
+
+def percentiles(samples):
+    ms = np.asarray(samples) * 1000
+    return {"p50": round(float(np.percentile(ms, 50)), 3),
+            "p95": round(float(np.percentile(ms, 95)), 3),
+            "p99": round(float(np.percentile(ms, 99)), 3)}
+
+
+def run_scenario(wall_grid, spec, ticks, screen, background, interface, font):
+    from game_session import TICK_PHASES
+    stress = Stress(wall_grid, spec)
+    session = stress.session
+    phases = {name: [] for name in TICK_PHASES}
+    update_t, collision_t, draw_t, hud_t = [], [], [], []
+    clock = [0.0]
+    perf_counter = time.perf_counter
+
+    def mark(name):
+        now = perf_counter()
+        phase_time[name] = now - clock[0]
+        clock[0] = now
+
+    for tick in range(WARMUP + ticks):
+        stress.top_up()
+        phase_time = {}
+        clock[0] = perf_counter()
+        session.tick(stress.keys, DT, mark)
+        start = perf_counter()
+        camera = camera_for(session.player)
+        screen.blit(background, (-camera.x, -camera.y))
+        session.draw(screen, camera, 1.0, interface)
+        mid = perf_counter()
+        session.draw_hud(screen, interface, font, 60.0)
+        end = perf_counter()
+        if tick < WARMUP:
+            continue
+        for name, value in phase_time.items():
+            phases[name].append(value)
+        collision_t.append(phase_time["collisions"])
+        update_t.append(sum(v for k, v in phase_time.items() if k != "collisions"))
+        draw_t.append(end - start)
+        hud_t.append(end - mid)
+    return {
+        "population": session.counts(),
+        "update_ms": percentiles(update_t),
+        "collision_ms": percentiles(collision_t),
+        "draw_ms": percentiles(draw_t),
+        "hud_ms": percentiles(hud_t),
+        "phase_p50_ms": {name: percentiles(v)["p50"] for name, v in phases.items()},
+    }
+
+
+def scaling(wall_grid, ticks, screen, background, interface, font, key, counts, spec_for, phases):
+    """One row per population size: p50 and µs per entity of each phase"""
+    rows = []
+    budget_ms = 1000 * DT
+    for count in counts:
+        result = run_scenario(wall_grid, spec_for(count), ticks, screen, background, interface, font)
+        row = {key: count}
+        for phase in phases:
+            cost = result["draw_ms"]["p50"] if phase == "draw" else result["phase_p50_ms"][phase]
+            row[f"{phase}_p50_ms"] = cost
+            row[f"{phase}_us_each"] = round(cost * 1000 / count, 3)
+        p95 = result["update_ms"]["p95"] + result["collision_ms"]["p95"] + result["draw_ms"]["p95"]
+        row["frame_p95_ms"] = round(p95, 3)
+        row["over_frame_budget"] = p95 > budget_ms
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="scenario stress suite")
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                        help="run only these scenarios (repeatable)")
+    parser.add_argument("--no-curves", action="store_true", help="skip the scaling sweeps")
+    parser.add_argument("--out", help="also write the JSON report here")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN)
+    from main import load_walls
+    from wall_grid import WallGrid
+    from interface import Interface
+    from safe_loader import safe_load_image, safe_font
+    from pool import prewarm_pools
+    report = {"ticks": args.ticks, "scenarios": {}}
+    with contextlib.redirect_stdout(sys.stderr):
+        wall_grid = WallGrid(load_walls(WORLD, WORLD), WORLD, WORLD)
+        background = pygame.transform.scale(safe_load_image("assets/background.png", (WORLD, WORLD)),
+                                            (WORLD, WORLD)).convert()
+        interface = Interface(*SCREEN)
+        font = safe_font(12)
+        prewarm_pools()
+        for name in args.scenario or SCENARIOS:
+            report["scenarios"][name] = run_scenario(wall_grid, SCENARIOS[name], args.ticks,
+                                                     screen, background, interface, font)
+        if not args.no_curves:
+            ghost_counts = (10, 50, 100, 500, 1000, 2000, 5000)
+            mixed = lambda n: {"ghosts": (n // 2, n // 4, n - n // 2 - n // 4)}
+            report["ghost_scaling"] = scaling(
+                wall_grid, args.ticks, screen, background, interface, font, "ghosts",
+                ghost_counts, mixed, ("ghost_ai", "collisions", "draw"))
+            report["fireball_scaling"] = scaling(
+                wall_grid, args.ticks, screen, background, interface, font, "fireballs",
+                (10, 100, 500, 1000, 2000), lambda n: {"ghosts": (20, 0, 0), "fireballs": n},
+                ("effects", "collisions", "draw"))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    pygame.quit()
+    return report
+
+
+if __name__ == "__main__":
+    main()
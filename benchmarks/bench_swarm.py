@@ -0,0 +1,307 @@
+# bench_swarm.py - GhostSwarm (NumPy arrays) vs the per-object ghost loop
+#
+#   python benchmarks/bench_swarm.py
+#
+# Both sides get the same mixed horde (Ghost / TankGhost / ShooterGhost) around
+# a stationary player and run update + contact damage (+ drawing to an offscreen
+# 1280x720 surface). The game only has the swarm now; the per-object loop it
+# replaced lives on below as the baseline (ObjectGhost, ObjectTankGhost,
+# ObjectShooterGhost with its own pooled ObjectProjectile list - also the
+# "lists" side of bench_projectiles.py and the projectile pool of bench_pools.py).
+# Reported numbers are the median milliseconds per tick.
+import os
+import sys
+import json
+import time
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from timestep import interpolate
+from pool import Pool
+
+WORLD_SIZE = 1200
+DT = 1 / 60
+
+
+class Dummy:
+    """Player stand-in: a rect and a damage counter"""
+
+    def __init__(self):
+        self.rect = pygame.Rect(WORLD_SIZE // 2 - 32, WORLD_SIZE // 2 - 32, 64, 64)
+        self.damage = 0
+
+    def take_damage(self, amount, sprite=None):
+        self.damage += amount
+
+
+class ObjectGhost:
+    """Baseline: a mini ghost that updates and draws itself (pre-swarm)"""
+    __slots__ = ("spawn_frames", "idle_frames", "current_animation", "frame_index",
+                 "animation_timer", "rect", "pos", "prev_pos", "active", "attack_cooldown")
+
+    speed = 100
+    animation_speed = 0.12
+    contact_damage = 1
+    contact_cooldown = 1.0
+
+    def __init__(self, x, y):
+        from ghost import Ghost
+        source = Ghost(x, y)
+        self.spawn_frames = source.spawn_frames
+        self.idle_frames = source.idle_frames
+        self.current_animation = "spawn"
+        self.frame_index = 0
+        self.animation_timer = 0
+        self.rect = source.rect.copy()
+        self.pos = pygame.Vector2(self.rect.topleft)
+        self.prev_pos = pygame.Vector2(self.pos)
+        self.active = False
+        self.attack_cooldown = 0
+
+    def update(self, dt, player):
+        self.animation_timer += dt
+        if self.current_animation == "spawn":
+            if self.animation_timer >= self.animation_speed:
+                self.animation_timer = 0
+                self.frame_index += 1
+                if self.frame_index >= len(self.spawn_frames):
+                    self.current_animation = "idle"
+                    self.frame_index = 0
+                    self.active = True
+        elif self.animation_timer >= self.animation_speed:
+            self.animation_timer = 0
+            self.frame_index = (self.frame_index + 1) % len(self.idle_frames)
+
+        if self.attack_cooldown > 0:
+            self.attack_cooldown -= dt
+
+        self.prev_pos.update(self.pos)
+        if self.active:
+            self.seek(dt, player)
+
+    def seek(self, dt, player):
+        direction = pygame.Vector2(player.rect.centerx - self.rect.centerx,
+                                   player.rect.centery - self.rect.centery)
+        if direction.length() > 0:
+            direction.normalize_ip()
+            self.pos += direction * (self.speed * dt)
+            self.rect.topleft = (round(self.pos.x), round(self.pos.y))
+
+    def touch_player(self, player):
+        if self.active and self.attack_cooldown <= 0:
+            player.take_damage(self.contact_damage)
+            self.attack_cooldown = self.contact_cooldown
+
+    def draw(self, surface, camera_offset, alpha=1.0):
+        if self.current_animation == "spawn":
+            frame = self.spawn_frames[min(self.frame_index, len(self.spawn_frames) - 1)]
+        else:
+            frame = self.idle_frames[self.frame_index]
+        x, y = interpolate(self.prev_pos, self.pos, alpha)
+        surface.blit(frame, (x - camera_offset.x, y - camera_offset.y))
+
+
+class ObjectTankGhost(ObjectGhost):
+    """Baseline tank ghost: no spawn animation, slower, longer contact cooldown"""
+    __slots__ = ()
+
+    speed = 50
+    animation_speed = 0.15
+    contact_cooldown = 1.5
+
+    def __init__(self, x, y):
+        from tank_ghost import TankGhost
+        source = TankGhost(x, y)
+        self.spawn_frames = self.idle_frames = source.idle_frames
+        self.current_animation = "idle"
+        self.frame_index = 0
+        self.animation_timer = 0
+        self.rect = source.rect.copy()
+        self.pos = pygame.Vector2(self.rect.topleft)
+        self.prev_pos = pygame.Vector2(self.pos)
+        self.active = True
+        self.attack_cooldown = 0
+
+
+class ObjectProjectile:
+    """Baseline: a shooter's bullet as a pooled object with its own eye image"""
+    __slots__ = ("direction", "rect", "pos", "prev_pos", "image")
+
+    speed = 300
+
+    def __init__(self, x, y, direction):
+        self.direction = pygame.Vector2()
+        self.rect = pygame.Rect(x, y, 16, 16)
+        self.pos = pygame.Vector2()
+        self.prev_pos = pygame.Vector2()
+        self.reset(x, y, direction)
+
+    def reset(self, x, y, direction):
+        from safe_loader import load_image
+        self.direction.update(direction)
+        self.direction.normalize_ip()
+        self.rect.topleft = (x, y)
+        self.pos.update(x, y)
+        self.prev_pos.update(self.pos)
+        if abs(self.direction.x) > abs(self.direction.y):
+            path = "assets/eye_right.png" if self.direction.x > 0 else "assets/eye_left.png"
+        else:
+            path = "assets/eye_down.png" if self.direction.y > 0 else "assets/eye_up.png"
+        self.image = load_image(path, (32, 32))
+
+    def update(self, dt):
+        self.prev_pos.update(self.pos)
+        self.pos += self.direction * (self.speed * dt)
+        self.rect.topleft = (round(self.pos.x), round(self.pos.y))
+
+    def draw(self, surface, camera_offset, alpha=1.0):
+        x, y = interpolate(self.prev_pos, self.pos, alpha)
+        surface.blit(self.image, (x - camera_offset.x, y - camera_offset.y))
+
+
+PROJECTILE_POOL = Pool("shooter_projectile", lambda: ObjectProjectile(0, 0, pygame.Vector2(1, 0)), prewarm=64)
+
+
+class ObjectShooterGhost:
+    """Baseline shooter: walks up to attack_range and keeps its bullets in a list"""
+    __slots__ = ("idle_frames", "frame_index", "animation_timer", "rect", "pos", "prev_pos",
+                 "shoot_cooldown", "projectiles")
+
+    speed = 60
+    animation_speed = 0.15
+    attack_range = 200
+    shoot_interval = 2.0
+
+    def __init__(self, x, y):
+        from shooter_ghost import ShooterGhost
+        source = ShooterGhost(x, y)
+        self.idle_frames = source.idle_frames
+        self.frame_index = 0
+        self.animation_timer = 0
+        self.rect = source.rect.copy()
+        self.pos = pygame.Vector2(self.rect.topleft)
+        self.prev_pos = pygame.Vector2(self.pos)
+        self.shoot_cooldown = 0
+        self.projectiles = []
+
+    def update(self, dt, player):
+        self.animation_timer += dt
+        if self.animation_timer >= self.animation_speed:
+            self.animation_timer = 0
+            self.frame_index = (self.frame_index + 1) % len(self.idle_frames)
+
+        distance = pygame.Vector2(player.rect.centerx - self.rect.centerx,
+                                  player.rect.centery - self.rect.centery)
+        self.prev_pos.update(self.pos)
+        if distance.length() > self.attack_range:
+            self.pos += distance.normalize() * (self.speed * dt)
+            self.rect.topleft = (round(self.pos.x), round(self.pos.y))
+
+        if self.shoot_cooldown > 0:
+            self.shoot_cooldown -= dt
+        elif distance.length() <= self.attack_range:
+            self.projectiles.append(PROJECTILE_POOL.acquire(self.rect.centerx, self.rect.centery,
+                                                            distance.normalize()))
+            self.shoot_cooldown = self.shoot_interval
+
+        for p in self.projectiles[:]:
+            p.update(dt)
+            if not (0 <= p.rect.x <= 2000 and 0 <= p.rect.y <= 2000):
+                self.projectiles.remove(p)
+                PROJECTILE_POOL.release(p)
+
+    def touch_player(self, player):
+        pass
+
+    def draw(self, surface, camera_offset, alpha=1.0):
+        x, y = interpolate(self.prev_pos, self.pos, alpha)
+        surface.blit(self.idle_frames[self.frame_index], (x - camera_offset.x, y - camera_offset.y))
+        for p in self.projectiles:
+            p.draw(surface, camera_offset, alpha)
+
+
+def make_horde(count, seed=1, objects=False):
+    """Spawn descriptions for the swarm, or (objects=True) the baseline objects"""
+    from ghost import Ghost
+    from tank_ghost import TankGhost
+    from shooter_ghost import ShooterGhost
+    rng = random.Random(seed)
+    if objects:
+        kinds = [ObjectGhost, ObjectGhost, ObjectTankGhost, ObjectShooterGhost]
+    else:
+        kinds = [Ghost, Ghost, TankGhost, ShooterGhost]
+    return [rng.choice(kinds)(rng.randint(0, WORLD_SIZE), rng.randint(0, WORLD_SIZE)) for _ in range(count)]
+
+
+def median_ms(samples):
+    samples = sorted(samples)
+    return round(samples[len(samples) // 2] * 1000, 3)
+
+
+def run_objects(count, ticks, surface, camera):
+    player = Dummy()
+    ghosts = make_horde(count, objects=True)
+    update_t, draw_t = [], []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        for ghost in ghosts:
+            ghost.update(DT, player)
+        for ghost in ghosts:
+            if player.rect.colliderect(ghost.rect):
+                ghost.touch_player(player)
+        mid = time.perf_counter()
+        for ghost in ghosts:
+            ghost.draw(surface, camera)
+        end = time.perf_counter()
+        update_t.append(mid - start)
+        draw_t.append(end - mid)
+    return median_ms(update_t), median_ms(draw_t)
+
+
+def run_swarm(count, ticks, surface, camera):
+    from ghost_swarm import GhostSwarm
+    player = Dummy()
+    ghosts = GhostSwarm()
+    for ghost in make_horde(count):
+        ghosts.append(ghost)
+    update_t, draw_t = [], []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        ghosts.update(DT, player)
+        ghosts.projectiles.update(DT)
+        ghosts.contact_damage(player)
+        mid = time.perf_counter()
+        ghosts.draw(surface, camera)
+        ghosts.projectiles.draw(surface, camera)
+        end = time.perf_counter()
+        update_t.append(mid - start)
+        draw_t.append(end - mid)
+    return median_ms(update_t), median_ms(draw_t)
+
+
+def main(counts=(100, 500, 1000, 2000, 5000), ticks=120):
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    surface = pygame.Surface((1280, 720))
+    camera = pygame.Vector2(WORLD_SIZE // 2 - 640, WORLD_SIZE // 2 - 360)
+    rows = []
+    for count in counts:
+        obj_update, obj_draw = run_objects(count, ticks, surface, camera)
+        swarm_update, swarm_draw = run_swarm(count, ticks, surface, camera)
+        rows.append({
+            "ghosts": count,
+            "objects_update_ms": obj_update, "swarm_update_ms": swarm_update,
+            "objects_draw_ms": obj_draw, "swarm_draw_ms": swarm_draw,
+        })
+    print(json.dumps(rows, indent=2))
+    pygame.quit()
+    return rows
+
+
+if __name__ == "__main__":
+    main()
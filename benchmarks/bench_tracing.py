@@ -0,0 +1,77 @@
+# bench_tracing.py - cost of a tracing span, off and on
+#
+#   python benchmarks/bench_tracing.py
+#
+# Times a million `with tracing.span(...)` blocks and calls of a
+# @tracing.traced function against the bare loop / bare call, first with
+# tracing off (what the game pays permanently), then on (ring writes).
+# Reported: extra ns per span.
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tracing
+
+N = 1_000_000
+
+
+def plain():
+    return None
+
+
+@tracing.traced("bench")
+def decorated():
+    return None
+
+
+def loop_bare():
+    for _ in range(N):
+        pass
+
+
+def loop_span():
+    span = tracing.span
+    for _ in range(N):
+        with span("bench"):
+            pass
+
+
+def loop_plain_call():
+    for _ in range(N):
+        plain()
+
+
+def loop_traced_call():
+    for _ in range(N):
+        decorated()
+
+
+def best(func, runs=5):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def measure():
+    bare, call = best(loop_bare), best(loop_plain_call)
+    return {"span_ns": round((best(loop_span) - bare) / N * 1e9, 1),
+            "traced_call_ns": round((best(loop_traced_call) - call) / N * 1e9, 1)}
+
+
+def main():
+    report = {"off": measure()}
+    tracing.start(capacity=1 << 16)
+    report["on"] = measure()
+    tracing.stop()
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# bench_walls.py - WallGrid.collides vs looping over the wall list
+#
+#   python benchmarks/bench_walls.py
+#
+# Checks that the occupancy grid answers exactly like
+# any(rect.colliderect(w) for w in walls) on random queries (editor-aligned
+# tiles plus unaligned and off-map walls), then times both as the tile count grows.
+import os
+import sys
+import json
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from wall_grid import WallGrid, CELL_SIZE
+
+WORLD_SIZE = 1200
+
+
+def make_walls(rng, tile_count, odd_count=0):
+    cells = WORLD_SIZE // CELL_SIZE
+    walls = [
+        pygame.Rect(rng.randrange(cells) * CELL_SIZE, rng.randrange(cells) * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+        for _ in range(tile_count)
+    ]
+    for _ in range(odd_count):
+        walls.append(pygame.Rect(rng.randint(-40, WORLD_SIZE), rng.randint(-40, WORLD_SIZE),
+                                 rng.randint(1, 90), rng.randint(1, 90)))
+    return walls
+
+
+def random_query(rng):
+    return pygame.Rect(rng.randint(-80, WORLD_SIZE + 20), rng.randint(-80, WORLD_SIZE + 20),
+                       rng.choice((64, 64, 128, 1, 31, 33)), rng.choice((64, 64, 128, 1, 31, 33)))
+
+
+def check_equivalence(seeds=200, queries=500):
+    for seed in range(seeds):
+        rng = random.Random(seed)
+        walls = make_walls(rng, rng.randint(0, 400), rng.randint(0, 20))
+        grid = WallGrid(walls, WORLD_SIZE, WORLD_SIZE)
+        for _ in range(queries):
+            rect = random_query(rng)
+            expected = any(rect.colliderect(w) for w in walls)
+            if grid.collides(rect) != expected:
+                raise AssertionError(f"seed {seed}: mismatch for {rect}")
+    print(f"Equivalence OK on {seeds} random wall layouts")
+
+
+def time_call(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_scaling(tile_counts=(41, 500, 2000, 5000, 10000), queries=2000):
+    rows = []
+    for count in tile_counts:
+        rng = random.Random(count)
+        walls = make_walls(rng, count)
+        grid = WallGrid(walls, WORLD_SIZE, WORLD_SIZE)
+        rects = [random_query(rng) for _ in range(queries)]
+
+        def with_grid():
+            for rect in rects:
+                grid.collides(rect)
+
+        def with_list():
+            for rect in rects:
+                any(rect.colliderect(w) for w in walls)
+
+        rows.append({
+            "walls": count,
+            "grid_us_per_query": round(time_call(with_grid) / queries * 1e6, 3),
+            "list_us_per_query": round(time_call(with_list) / queries * 1e6, 3),
+        })
+    print(json.dumps(rows, indent=2))
+    return rows
+
+
+if __name__ == "__main__":
+    check_equivalence()
+    run_scaling()
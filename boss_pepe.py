@@ -1,28 +1,43 @@
 from safe_loader import safe_load_image, safe_font
+from animation import AnimationSet, get_animation_set
 import pygame
-import random
+from rng import stream, SUMMONS, BOSS_MELEE
 from ghost import Ghost
+from timestep import render_camera
+
+def build_pepe_animations():
+    # Левые листы Пепе нарисованы отдельно (не зеркало), поэтому грузятся как есть
+    return (
+        AnimationSet(scale=2)
+        .add("walk", "assets/boss_pepe_walk_right.png", 10,
+             left_path="assets/boss_pepe_walk_left.png")
+        .add("summon", "assets/boss_pepe_summon_right.png", 10,
+             left_path="assets/boss_pepe_summon_left.png")
+    )
 
 class BossPepe:
+    # Только состояние экземпляра: координаты хранят rect/pos, кадры - общий набор
+    __slots__ = ("rect", "pos", "prev_pos", "power_level", "animations", "speed", "facing",
+                 "frames", "anim_index", "anim_timer", "mode", "summon_cooldown", "summon_timer",
+                 "ghosts_per_summon", "max_ghosts_summoned", "active", "ghosts_killed",
+                 "summoning", "summon_time", "running_away", "has_hp", "max_hp", "hp", "damage")
+
+    anim_speed = 0.15
+    summon_duration = 1.5
+
     def __init__(self, x, y, power_level=1):
-        self.x = x
-        self.y = y
         self.rect = pygame.Rect(x, y, 32, 32)
+        self.pos = pygame.Vector2(x, y)
+        self.prev_pos = pygame.Vector2(self.pos)
         self.power_level = power_level  
 
-        self.sheet_right = safe_load_image("assets/boss_pepe_walk_right.png")
-        self.sheet_left = safe_load_image("assets/boss_pepe_walk_left.png")
-        self.summon_right = safe_load_image("assets/boss_pepe_summon_right.png")
-        self.summon_left = safe_load_image("assets/boss_pepe_summon_left.png")
+        self.animations = get_animation_set("boss_pepe", build_pepe_animations, "BossPepe")
 
-        self.scale = 2
         self.speed = 100 + (power_level - 1) * 15  
         self.facing = "right"
-        self.frames = self.load_frames(self.sheet_right)
-        self.summon_frames = self.load_frames(self.summon_right)
+        self.frames = self.animations.frames("walk")
         self.anim_index = 0
         self.anim_timer = 0
-        self.anim_speed = 0.15
 
         self.mode = "walk"
         
@@ -35,7 +50,6 @@ class BossPepe:
 
         self.active = True
         self.ghosts_killed = 0
-        self.summon_duration = 1.5
         self.summoning = False
         self.summon_time = 0
 
@@ -54,15 +68,6 @@ class BossPepe:
 
         print(f"BossPepe spawned! Level: {power_level}, Speed: {self.speed}, Ghosts per summon: {self.ghosts_per_summon}")
 
-    def load_frames(self, sheet):
-        frame_w = sheet.get_width() // 10
-        frame_h = sheet.get_height()
-        return [
-            pygame.transform.scale(sheet.subsurface(pygame.Rect(i * frame_w, 0, frame_w, frame_h)),
-                                   (frame_w * self.scale, frame_h * self.scale))
-            for i in range(10)
-        ]
-
     def take_damage(self, amount):
         """Урон боссу (только если у него есть HP)"""
         if self.has_hp and self.active:
@@ -72,9 +77,10 @@ class BossPepe:
                 self.running_away = True
                 self.mode = "run"
 
-    def update(self, dt, player, ghosts):
+    def update(self, dt, player, ghosts, flow=None):
         if not self.active:
             return
+        self.prev_pos.update(self.pos)
 
         
         if ((not self.has_hp and self.ghosts_killed >= self.max_ghosts_summoned) or 
@@ -91,7 +97,8 @@ class BossPepe:
         if self.running_away:
             
             escape_speed = self.speed * 1.5
-            self.rect.x += escape_speed * dt
+            self.pos.x += escape_speed * dt
+            self.sync_rect()
             if self.rect.x > 2000:
                 self.active = False
             return
@@ -106,15 +113,15 @@ class BossPepe:
                 
                 
                 for _ in range(self.ghosts_per_summon):
-                    ghost_x = self.rect.centerx + random.randint(-80, 80)
-                    ghost_y = self.rect.centery + random.randint(-80, 80)
+                    ghost_x = self.rect.centerx + stream(SUMMONS).randint(-80, 80)
+                    ghost_y = self.rect.centery + stream(SUMMONS).randint(-80, 80)
                     
                     
                     if self.power_level >= 3:
                         from tank_ghost import TankGhost
                         from shooter_ghost import ShooterGhost
                         ghost_types = [Ghost, Ghost, TankGhost] if self.power_level < 5 else [Ghost, TankGhost, ShooterGhost]
-                        ghost_class = random.choice(ghost_types)
+                        ghost_class = stream(SUMMONS).choice(ghost_types)
                         ghosts.append(ghost_class(ghost_x, ghost_y))
                     else:
                         ghosts.append(Ghost(ghost_x, ghost_y))
@@ -131,29 +138,39 @@ class BossPepe:
             target_distance = 120 + self.power_level * 10  
             
             if direction.length() > target_distance:
-                direction.normalize_ip()
-                self.rect.x += direction.x * self.speed * dt * 0.6
-                self.rect.y += direction.y * self.speed * dt * 0.6
+                # Подходит в обход стен по полю направлений (отходит по прямой)
+                target = flow.steer(*self.rect.center) if flow else None
+                if target is not None:
+                    direction = pygame.Vector2(target[0] - self.rect.centerx,
+                                               target[1] - self.rect.centery)
+                if direction.length() > 0:
+                    direction.normalize_ip()
+                self.pos += direction * (self.speed * dt * 0.6)
+                self.sync_rect()
                 self.facing = "right" if direction.x >= 0 else "left"
             elif direction.length() < target_distance - 20:
                 # Отходит если игрок слишком близко
                 direction.normalize_ip()
-                self.rect.x -= direction.x * self.speed * dt * 0.4
-                self.rect.y -= direction.y * self.speed * dt * 0.4
+                self.pos -= direction * (self.speed * dt * 0.4)
+                self.sync_rect()
                 self.facing = "right" if direction.x >= 0 else "left"
                 
             # Атака в ближнем бою (редко)
-            if direction.length() < 40 and random.random() < 0.01:  # 1% шанс каждый кадр
+            if direction.length() < 40 and stream(BOSS_MELEE).random() < 0.01:  # 1% шанс каждый кадр
                 player.take_damage(self.damage)
 
-    def draw(self, surface, camera_offset):
+    def sync_rect(self):
+        self.rect.topleft = (round(self.pos.x), round(self.pos.y))
+
+    def draw(self, surface, camera_offset, alpha=1.0):
         if not self.active:
             return
+        camera_offset = render_camera(self, camera_offset, alpha)
             
         if self.mode == "summon" or self.summoning:
-            frames = self.summon_frames if self.facing == "right" else self.load_frames(self.summon_left)
+            frames = self.animations.frames("summon", self.facing)
         else:
-            frames = self.frames if self.facing == "right" else self.load_frames(self.sheet_left)
+            frames = self.animations.frames("walk", self.facing)
             
         frame = frames[self.anim_index % len(frames)]
         surface.blit(frame, (self.rect.x - camera_offset.x, self.rect.y - camera_offset.y))
@@ -1,7 +1,19 @@
-from safe_loader import safe_load_image, safe_font
+from safe_loader import safe_load_image, safe_font, render_text, load_frames
+from animation import AnimationSet, get_animation_set
 import pygame
-import random
+from rng import stream, SUMMONS
 from ghost import Ghost
+from timestep import render_camera
+
+def build_strong_animations():
+    # Левые листы босса отличаются от зеркала правых, поэтому грузятся отдельно
+    return (
+        AnimationSet(scale=2)
+        .add("walk", "assets/strong_boss_walk_right.png", 8,
+             left_path="assets/strong_boss_walk_left.png")
+        .add("attack", "assets/strong_boss_attack_right.png", 11,
+             left_path="assets/strong_boss_attack_left.png")
+    )
 
 class BossStrong:
     def __init__(self, x, y, power_level=1):
@@ -9,25 +21,16 @@ class BossStrong:
         self.y = y
         self.power_level = power_level
         self.rect = pygame.Rect(x, y, 64, 64)
+        self.pos = pygame.Vector2(x, y)
+        self.prev_pos = pygame.Vector2(self.pos)
 
-        self.walk_right_sheet = safe_load_image("assets/strong_boss_walk_right.png")
-        self.walk_left_sheet = safe_load_image("assets/strong_boss_walk_left.png")
-        self.attack_right_sheet = safe_load_image("assets/strong_boss_attack_right.png")
-        self.attack_left_sheet = safe_load_image("assets/strong_boss_attack_left.png")
+        self.animations = get_animation_set("boss_strong", build_strong_animations, "BossStrong")
+        self.hp_bar_frames = load_frames("assets/bosshp.png", 11, scale=2)
 
-        self.hp_bar_sheet = safe_load_image("assets/bosshp.png")
-        self.hp_bar_frames = self.load_hp_bar_frames(self.hp_bar_sheet, 11, scale=2)
-
-        self.scale = 2
         # Скорость увеличивается с уровнем силы
         self.speed = 40 + power_level * 15
         self.facing = "right"
 
-        self.walk_right_frames = self.load_frames(self.walk_right_sheet, 8)
-        self.walk_left_frames = self.load_frames(self.walk_left_sheet, 8)
-        self.attack_right_frames = self.load_frames(self.attack_right_sheet, 11)
-        self.attack_left_frames = self.load_frames(self.attack_left_sheet, 11)
-
         self.walk_anim_index = 0
         self.attack_anim_index = 0
         self.anim_timer = 0
@@ -65,26 +68,6 @@ class BossStrong:
         
         print(f"BossStrong spawned! Level: {power_level}, HP: {self.max_hp}, Damage: {self.damage}, Speed: {self.speed}")
 
-    def load_frames(self, sheet, frame_count):
-        frame_w = sheet.get_width() // frame_count
-        frame_h = sheet.get_height()
-        return [
-            pygame.transform.scale(
-                sheet.subsurface(pygame.Rect(i * frame_w, 0, frame_w, frame_h)),
-                (frame_w * self.scale, frame_h * self.scale)
-            ) for i in range(frame_count)
-        ]
-
-    def load_hp_bar_frames(self, sheet, frame_count, scale=1):
-        frame_w = sheet.get_width() // frame_count
-        frame_h = sheet.get_height()
-        return [
-            pygame.transform.scale(
-                sheet.subsurface(pygame.Rect(i * frame_w, 0, frame_w, frame_h)),
-                (frame_w * scale, frame_h * scale)
-            ) for i in range(frame_count)
-        ]
-
     def take_damage(self, amount):
         if not self.active:
             return
@@ -112,16 +95,17 @@ class BossStrong:
             return int(base_damage * self.rage_damage_multiplier)
         return base_damage
 
-    def update(self, dt, player, ghosts):
+    def update(self, dt, player, ghosts, flow=None):
         if not self.active:
             return
+        self.prev_pos.update(self.pos)
 
         self.anim_timer += dt
         
         if self.attacking:
             if self.anim_timer >= self.anim_speed:
                 self.anim_timer = 0
-                if self.attack_anim_index < len(self.attack_right_frames) - 1:
+                if self.attack_anim_index < len(self.animations.frames("attack")) - 1:
                     self.attack_anim_index += 1
                 else:
                     self.attack_anim_index = 0
@@ -130,7 +114,7 @@ class BossStrong:
         else:
             if self.anim_timer >= self.anim_speed:
                 self.anim_timer = 0
-                self.walk_anim_index = (self.walk_anim_index + 1) % len(self.walk_right_frames)
+                self.walk_anim_index = (self.walk_anim_index + 1) % len(self.animations.frames("walk"))
 
         # Логика атаки
         if not self.attacking:
@@ -156,13 +140,16 @@ class BossStrong:
 
         # Движение к игроку
         if not self.attacking:
-            direction = pygame.Vector2(player.rect.centerx - self.rect.centerx,
-                                       player.rect.centery - self.rect.centery)
+            target = flow.steer(*self.rect.center) if flow else None
+            if target is None:
+                target = player.rect.center
+            direction = pygame.Vector2(target[0] - self.rect.centerx,
+                                       target[1] - self.rect.centery)
             if direction.length() > 0:
                 direction.normalize_ip()
                 current_speed = self.get_current_speed()
-                self.rect.x += direction.x * current_speed * dt
-                self.rect.y += direction.y * current_speed * dt
+                self.pos += direction * (current_speed * dt)
+                self.rect.topleft = (round(self.pos.x), round(self.pos.y))
                 self.facing = "right" if direction.x >= 0 else "left"
 
         # Призыв призраков
@@ -176,8 +163,8 @@ class BossStrong:
                 ghost_count += 1
                 
             for _ in range(ghost_count):
-                ghost_x = self.rect.centerx + random.randint(-100, 100)
-                ghost_y = self.rect.centery + random.randint(-100, 100)
+                ghost_x = self.rect.centerx + stream(SUMMONS).randint(-100, 100)
+                ghost_y = self.rect.centery + stream(SUMMONS).randint(-100, 100)
                 
                 # На высоких уровнях или в ярости призывает сильных призраков
                 if self.power_level >= 3 or self.rage_mode:
@@ -190,32 +177,28 @@ class BossStrong:
                     else:
                         ghost_types = [Ghost, TankGhost, ShooterGhost]
                     
-                    ghost_class = random.choice(ghost_types)
+                    ghost_class = stream(SUMMONS).choice(ghost_types)
                     ghosts.append(ghost_class(ghost_x, ghost_y))
                 else:
                     ghosts.append(Ghost(ghost_x, ghost_y))
 
-    def draw(self, surface, camera_offset):
+    def draw(self, surface, camera_offset, alpha=1.0):
         if not self.active:
             return
+        camera_offset = render_camera(self, camera_offset, alpha)
+
+        # В режиме ярости берем заранее запеченные красные кадры
+        animations = self.animations.variant("rage") if self.rage_mode else self.animations
 
         if self.attacking:
-            frames = self.attack_right_frames if self.facing == "right" else self.attack_left_frames
+            frames = animations.frames("attack", self.facing)
             frame_index = self.attack_anim_index
         else:
-            frames = self.walk_right_frames if self.facing == "right" else self.walk_left_frames
+            frames = animations.frames("walk", self.facing)
             frame_index = self.walk_anim_index % len(frames)
 
         frame = frames[frame_index]
         
-        # В режиме ярости добавляем красный оттенок
-        if self.rage_mode:
-            frame = frame.copy()
-            red_overlay = pygame.Surface(frame.get_size())
-            red_overlay.fill((255, 100, 100))
-            red_overlay.set_alpha(80)
-            frame.blit(red_overlay, (0, 0), special_flags=pygame.BLEND_ADD)
-        
         draw_x = self.rect.x - camera_offset.x
         draw_y = self.rect.y - camera_offset.y
         surface.blit(frame, (draw_x, draw_y))
@@ -237,7 +220,7 @@ class BossStrong:
                     level_text = f"STRONG BOSS LV.{self.power_level}"
                     if self.rage_mode:
                         level_text += " [RAGE]"
-                    level_surface = font.render(level_text, True, (255, 255, 255))
+                    level_surface = render_text(font, level_text, (255, 255, 255))
                     text_x = (surface.get_width() - level_surface.get_width()) // 2
                     text_y = bar_y + hp_bar_image.get_height() + 5
                     surface.blit(level_surface, (text_x, text_y))
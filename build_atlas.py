@@ -0,0 +1,125 @@
+# build_atlas.py - packs every PNG from assets/ into a few atlas pages
+#
+# Run before building the exe:  python build_atlas.py
+# Output: assets/atlas/atlas_<N>.png + assets/atlas/atlas.json (manifest).
+# safe_loader reads the manifest at runtime and slices sheets from the pages
+# as subsurfaces; without the atlas it falls back to the loose PNG files.
+import os
+import sys
+import json
+import glob
+import pygame
+
+ASSETS_DIR = "assets"
+ATLAS_DIR = os.path.join(ASSETS_DIR, "atlas")
+MANIFEST_NAME = "atlas.json"
+PAGE_SIZE = 2048
+PADDING = 1
+
+
+class AtlasPage:
+    """Shelf packer: images are placed left to right on rows of fixed height"""
+
+    def __init__(self, size):
+        self.size = size
+        self.shelves = []  # [y, height, used_width]
+        self.next_y = 0
+        self.placed = []  # (name, surface, x, y)
+
+    def insert(self, name, surface):
+        w = surface.get_width() + PADDING
+        h = surface.get_height() + PADDING
+        if w > self.size or h > self.size:
+            return None
+
+        for shelf in self.shelves:
+            shelf_y, shelf_h, used = shelf
+            if h <= shelf_h and used + w <= self.size:
+                shelf[2] += w
+                self.placed.append((name, surface, used, shelf_y))
+                return (used, shelf_y)
+
+        if self.next_y + h > self.size:
+            return None
+        self.shelves.append([self.next_y, h, w])
+        self.placed.append((name, surface, 0, self.next_y))
+        self.next_y += h
+        return (0, self.shelves[-1][0])
+
+    def used_height(self):
+        return self.next_y
+
+    def render(self):
+        # Страница обрезается по высоте, чтобы не хранить пустые строки
+        page = pygame.Surface((self.size, max(1, self.used_height())), pygame.SRCALPHA)
+        page.fill((0, 0, 0, 0))
+        for _, surface, x, y in self.placed:
+            page.blit(surface, (x, y))
+        return page
+
+
+def collect_images(assets_dir=ASSETS_DIR):
+    images = []
+    for path in sorted(glob.glob(os.path.join(assets_dir, "*.png"))):
+        name = path.replace("\\", "/")
+        try:
+            images.append((name, pygame.image.load(path)))
+        except Exception as e:
+            print(f"Skipping {name}: {e}")
+    return images
+
+
+def pack(images, page_size=PAGE_SIZE):
+    """Returns a list of AtlasPage with every image placed exactly once"""
+    pages = []
+    # Высокие листы первыми - полки заполняются плотнее
+    ordered = sorted(images, key=lambda item: (item[1].get_height(), item[1].get_width()), reverse=True)
+    for name, surface in ordered:
+        for page in pages:
+            if page.insert(name, surface) is not None:
+                break
+        else:
+            page = AtlasPage(page_size)
+            if page.insert(name, surface) is None:
+                print(f"Skipping {name}: larger than atlas page {page_size}x{page_size}")
+                continue
+            pages.append(page)
+    return pages
+
+
+def build_atlas(assets_dir=ASSETS_DIR, out_dir=ATLAS_DIR, page_size=PAGE_SIZE):
+    images = collect_images(assets_dir)
+    pages = pack(images, page_size)
+
+    os.makedirs(out_dir, exist_ok=True)
+    for old_page in glob.glob(os.path.join(out_dir, "atlas_*.png")):
+        os.remove(old_page)
+
+    manifest = {"page_size": page_size, "pages": [], "images": {}}
+    for index, page in enumerate(pages):
+        page_name = f"atlas_{index}.png"
+        pygame.image.save(page.render(), os.path.join(out_dir, page_name))
+        manifest["pages"].append(page_name)
+        for name, surface, x, y in page.placed:
+            manifest["images"][name] = {
+                "page": index,
+                "rect": [x, y, surface.get_width(), surface.get_height()],
+            }
+
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"Packed {len(manifest['images'])} images into {len(pages)} page(s) in {out_dir}")
+    return manifest
+
+
+def main():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    page_size = int(sys.argv[1]) if len(sys.argv) > 1 else PAGE_SIZE
+    build_atlas(page_size=page_size)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# build_pack.py - bundles assets/, walls.json and the font into one indexed file
+#
+#   python build_pack.py            -> writes assets.pak
+#   python build_pack.py --bench    -> compares startup loading: loose files vs pack
+#
+# safe_loader mmaps assets.pak once and serves every asset from it; without the
+# pack the game keeps reading loose files (development mode). Run build_atlas.py
+# first if the atlas pages should be packed too.
+import os
+import sys
+import json
+import struct
+import subprocess
+
+PACK_NAME = "assets.pak"
+PACK_MAGIC = b"ASHPAK01"
+EXTRA_FILES = ["walls.json"]
+ALIGNMENT = 16
+
+
+def collect_files(assets_dir="assets"):
+    files = []
+    for root, dirs, names in os.walk(assets_dir):
+        dirs.sort()
+        for name in sorted(names):
+            files.append(os.path.join(root, name).replace("\\", "/"))
+    files.extend(path for path in EXTRA_FILES if os.path.exists(path))
+    return files
+
+
+def build_pack(files=None, out_path=PACK_NAME):
+    """Writes MAGIC | uint32 index size | JSON index | aligned file data"""
+    files = collect_files() if files is None else files
+    blobs = []
+    for path in files:
+        with open(path, "rb") as f:
+            blobs.append((path, f.read()))
+
+    # Индекс зависит от смещений, а смещения - от размера индекса:
+    # резервируем место с запасом и пересчитываем, пока размер не сойдется.
+    index_size = 0
+    while True:
+        offset = len(PACK_MAGIC) + 4 + index_size
+        index = {}
+        for path, data in blobs:
+            offset += (-offset) % ALIGNMENT
+            index[path] = [offset, len(data)]
+            offset += len(data)
+        index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+        if len(index_bytes) <= index_size:
+            index_bytes = index_bytes.ljust(index_size)
+            break
+        index_size = len(index_bytes) + 64
+
+    with open(out_path, "wb") as f:
+        f.write(PACK_MAGIC)
+        f.write(struct.pack("<I", len(index_bytes)))
+        f.write(index_bytes)
+        for path, data in blobs:
+            f.write(b"\0" * ((-f.tell()) % ALIGNMENT))
+            assert f.tell() == index[path][0]
+            f.write(data)
+
+    total = os.path.getsize(out_path)
+    print(f"Packed {len(blobs)} files into {out_path} ({total} bytes)")
+    return index
+
+
+_BENCH_SNIPPET = r"""
+import os, sys, time, json
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+import pygame
+pygame.init()
+pygame.display.set_mode((1, 1))
+import safe_loader
+if os.environ.get("ASH_NO_PACK"):
+    safe_loader.ASSET_PACK = "__no_pack__"
+start = time.perf_counter()
+names = [n for n in sys.argv[1:]]
+for name in names:
+    if name.endswith(".png"):
+        safe_loader.safe_load_image(name)
+    elif name.endswith(".ttf"):
+        safe_loader.safe_font(12, name)
+    elif name.endswith(".json"):
+        safe_loader.read_asset_text(name)
+print(json.dumps({"seconds": time.perf_counter() - start}))
+"""
+
+
+def benchmark_startup(runs=15):
+    """Loads every asset in a fresh interpreter, with and without the pack.
+
+    Each run is a new process, so per-process caches are cold; the OS file
+    cache is not flushed (drop it by hand for a true cold-disk figure).
+    """
+    if not os.path.exists(PACK_NAME):
+        build_pack()
+    names = [n for n in collect_files() if not n.startswith("assets/atlas/")]
+
+    results = {}
+    for label, env_extra in (("loose", {"ASH_NO_PACK": "1"}), ("pack", {})):
+        env = dict(os.environ, **env_extra)
+        timings = []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-c", _BENCH_SNIPPET] + names,
+                capture_output=True, text=True, env=env, cwd=os.getcwd()
+            )
+            last_line = out.stdout.strip().splitlines()[-1]
+            timings.append(json.loads(last_line)["seconds"] * 1000)
+        timings.sort()
+        results[label] = {"median_ms": timings[len(timings) // 2], "min_ms": timings[0]}
+
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_startup()
+    else:
+        build_pack()
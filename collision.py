@@ -0,0 +1,165 @@
+# collision.py - uniform-grid broadphase and the per-tick collision phase
+
+# Слои для фильтрации пар (битовые маски)
+LAYER_PLAYER = 1
+LAYER_GHOST = 2
+LAYER_BOSS = 4
+LAYER_FIREBALL = 8
+LAYER_ENEMY_PROJECTILE = 16
+LAYER_ITEM = 32
+
+
+class SpatialHash:
+    """Uniform grid of cell_size pixels, rebuilt every tick.
+
+    Each item is stored once, in the cell of its top-left corner; queries widen
+    their cell range by the largest item size seen, so large items are still
+    found. Results come back in insertion order, which keeps hit priority stable.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.count = 0
+        self.max_w = 0
+        self.max_h = 0
+
+    def clear(self):
+        self.cells.clear()
+        self.count = 0
+        self.max_w = 0
+        self.max_h = 0
+
+    def insert(self, obj, rect, layer):
+        size = self.cell_size
+        key = (rect.x // size, rect.y // size)
+        entry = (self.count, obj, rect, layer)
+        self.count += 1
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [entry]
+        else:
+            bucket.append(entry)
+        if rect.w > self.max_w:
+            self.max_w = rect.w
+        if rect.h > self.max_h:
+            self.max_h = rect.h
+
+    def insert_many(self, objs, layer):
+        """Fast path for a list of entities with a .rect"""
+        size = self.cell_size
+        cells = self.cells
+        get = cells.get
+        index = self.count
+        max_w = self.max_w
+        max_h = self.max_h
+        for obj in objs:
+            rect = obj.rect
+            key = (rect.x // size, rect.y // size)
+            entry = (index, obj, rect, layer)
+            index += 1
+            bucket = get(key)
+            if bucket is None:
+                cells[key] = [entry]
+            else:
+                bucket.append(entry)
+            if rect.w > max_w:
+                max_w = rect.w
+            if rect.h > max_h:
+                max_h = rect.h
+        self.count = index
+        self.max_w = max_w
+        self.max_h = max_h
+
+    def query(self, rect, mask):
+        """(layer, obj) of items matching mask and overlapping rect, in insertion order"""
+        size = self.cell_size
+        x0 = (rect.left - self.max_w + 1) // size
+        y0 = (rect.top - self.max_h + 1) // size
+        x1 = (rect.right - 1) // size
+        y1 = (rect.bottom - 1) // size
+        cells = self.cells
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    for entry in bucket:
+                        if entry[3] & mask and rect.colliderect(entry[2]):
+                            found.append(entry)
+        if len(found) > 1:
+            found.sort(key=_entry_index)
+        return [(entry[3], entry[1]) for entry in found]
+
+
+def _entry_index(entry):
+    return entry[0]
+
+
+class CollisionPhase:
+    """Builds the spatial hash once per tick and returns contact events.
+
+    Enemy projectiles are not here: ProjectileBuffer.hit_test checks them in
+    one batch.
+
+    Events (kind, a, b):
+      ("fireball", fireball, [(layer, target), ...])  targets in hit priority:
+                                                      bosses first, then ghosts
+                                                      in list order
+      ("ghost_touch", ghost, player)
+      ("pickup", item, player)
+    """
+
+    def __init__(self, cell_size=128):
+        self.grid = SpatialHash(cell_size)
+
+    def run(self, player, ghosts, fireballs, bosses=(), items=(), ghost_contacts=True):
+        grid = self.grid
+        grid.clear()
+
+        grid.insert_many(bosses, LAYER_BOSS)
+        grid.insert_many(ghosts, LAYER_GHOST)
+        for item in items:
+            if item and item.active:
+                grid.insert(item, item.rect, LAYER_ITEM)
+
+        events = []
+        for fireball in fireballs:
+            targets = grid.query(fireball.rect, LAYER_BOSS | LAYER_GHOST)
+            if targets:
+                events.append(("fireball", fireball, targets))
+
+        # ghost_contacts=False: касания считает сам рой (GhostSwarm.contact_damage)
+        player_mask = LAYER_ITEM
+        if ghost_contacts:
+            player_mask |= LAYER_GHOST
+        for layer, obj in grid.query(player.rect, player_mask):
+            if layer == LAYER_GHOST:
+                events.append(("ghost_touch", obj, player))
+            else:
+                events.append(("pickup", obj, player))
+        return events
+
+
+def brute_force_contacts(player, ghosts, fireballs, bosses=(), items=()):
+    """Reference O(n*m) version of CollisionPhase.run (for equivalence checks)"""
+    events = []
+    for fireball in fireballs:
+        targets = []
+        for boss in bosses:
+            if fireball.rect.colliderect(boss.rect):
+                targets.append((LAYER_BOSS, boss))
+        for ghost in ghosts:
+            if fireball.rect.colliderect(ghost.rect):
+                targets.append((LAYER_GHOST, ghost))
+        if targets:
+            events.append(("fireball", fireball, targets))
+
+    # Порядок тот же, что у CollisionPhase: порядок вставки в сетку
+    for ghost in ghosts:
+        if player.rect.colliderect(ghost.rect):
+            events.append(("ghost_touch", ghost, player))
+    for item in items:
+        if item and item.active and player.rect.colliderect(item.rect):
+            events.append(("pickup", item, player))
+    return events
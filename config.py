@@ -10,6 +10,10 @@ class GameConfig:
         self.FULLSCREEN = False
         self.FPS = 60
         
+        # Фиксированный шаг симуляции (не зависит от частоты кадров экрана)
+        self.SIM_HZ = 60
+        self.MAX_SUBSTEPS = 5  # максимум шагов за один кадр при догоне
+        
         # Настройки геймплея
         self.SHOW_FPS = False
         self.SHOW_CONTROLS = True
@@ -58,6 +62,8 @@ class GameConfig:
             'screen_height': self.SCREEN_HEIGHT,
             'fullscreen': self.FULLSCREEN,
             'fps': self.FPS,
+            'sim_hz': self.SIM_HZ,
+            'max_substeps': self.MAX_SUBSTEPS,
             'show_fps': self.SHOW_FPS,
             'show_controls': self.SHOW_CONTROLS,
             'difficulty_multiplier': self.DIFFICULTY_MULTIPLIER,
@@ -87,6 +93,8 @@ class GameConfig:
             self.SCREEN_HEIGHT = settings.get('screen_height', self.SCREEN_HEIGHT)
             self.FULLSCREEN = settings.get('fullscreen', self.FULLSCREEN)
             self.FPS = settings.get('fps', self.FPS)
+            self.SIM_HZ = settings.get('sim_hz', self.SIM_HZ)
+            self.MAX_SUBSTEPS = settings.get('max_substeps', self.MAX_SUBSTEPS)
             self.SHOW_FPS = settings.get('show_fps', self.SHOW_FPS)
             self.SHOW_CONTROLS = settings.get('show_controls', self.SHOW_CONTROLS)
             self.DIFFICULTY_MULTIPLIER = settings.get('difficulty_multiplier', self.DIFFICULTY_MULTIPLIER)
@@ -104,6 +112,8 @@ class GameConfig:
         self.SCREEN_HEIGHT = 800
         self.FULLSCREEN = False
         self.FPS = 60
+        self.SIM_HZ = 60
+        self.MAX_SUBSTEPS = 5
         self.SHOW_FPS = False
         self.SHOW_CONTROLS = True
         self.DIFFICULTY_MULTIPLIER = 1.0
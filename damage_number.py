@@ -1,47 +1,28 @@
 import pygame
-from safe_loader import safe_load_image
+from safe_loader import safe_load_image, load_frames
+from memory_accountant import track
+from pool import Pool
 
 class DamageNumber:
+    __slots__ = ("frames", "frame_index", "timer", "pos", "offset", "finished")
+
+    animation_speed = 0.1
+
     def __init__(self, x, y, sprite_path="1HP.png"):
-        
+        self.pos = pygame.Vector2()
+        self.reset(x, y, sprite_path)
+
+    def reset(self, x, y, sprite_path="1HP.png"):
+        """Re-initialises a pooled damage number in place"""
         if not sprite_path.startswith("assets/"):
             sprite_path = f"assets/{sprite_path}"
             
         
-        self.sheet = safe_load_image(sprite_path, (320, 32))  
-        
-        
-        sheet_width = self.sheet.get_width()
-        frame_width = 32  
-        frame_count = max(1, sheet_width // frame_width)  # Минимум 1 кадр
-        
-        # Создаем кадры
-        self.frames = []
-        for i in range(frame_count):
-            if i * frame_width < sheet_width:
-                try:
-                    frame_rect = pygame.Rect(i * frame_width, 0, min(frame_width, sheet_width - i * frame_width), 32)
-                    frame = self.sheet.subsurface(frame_rect)
-                    self.frames.append(frame)
-                except:
-                    # Если не удается создать subsurface, создаем простой кадр
-                    fallback_frame = pygame.Surface((frame_width, 32), pygame.SRCALPHA)
-                    fallback_frame.fill((255, 100, 100))  # Красный цвет для урона
-                    
-                    # Рисуем простой текст "-1"
-                    try:
-                        font = pygame.font.Font(None, 24)
-                        text = font.render("-1", True, (255, 255, 255))
-                        text_rect = text.get_rect(center=(frame_width//2, 16))
-                        fallback_frame.blit(text, text_rect)
-                    except:
-                        pass
-                    
-                    self.frames.append(fallback_frame)
-        
-        # Если кадров нет, создаем один fallback кадр
-        if not self.frames:
-            fallback_frame = pygame.Surface((32, 32), pygame.SRCALPHA)
+        try:
+            self.frames = load_frames(sprite_path, None, 32, 32, fallback_size=(320, 32), owner="DamageNumber")
+        except Exception:
+            # Если лист не удалось нарезать, создаем один fallback кадр
+            fallback_frame = track(pygame.Surface((32, 32), pygame.SRCALPHA), "entities", "DamageNumber")
             fallback_frame.fill((255, 0, 0))
             try:
                 font = pygame.font.Font(None, 20)
@@ -50,12 +31,11 @@ class DamageNumber:
                 fallback_frame.blit(text, text_rect)
             except:
                 pass
-            self.frames.append(fallback_frame)
+            self.frames = [fallback_frame]
         
         self.frame_index = 0
-        self.animation_speed = 0.1
         self.timer = 0
-        self.pos = pygame.Vector2(x, y)
+        self.pos.update(x, y)
         self.offset = 0
         self.finished = False
 
@@ -75,4 +55,7 @@ class DamageNumber:
             frame = self.frames[frame_index]
             draw_x = self.pos.x - camera_offset.x
             draw_y = self.pos.y - camera_offset.y + self.offset
-            surface.blit(frame, (draw_x, draw_y))
\ No newline at end of file
+            surface.blit(frame, (draw_x, draw_y))
+
+
+DAMAGE_NUMBER_POOL = Pool("damage_number", lambda: DamageNumber(0, 0), prewarm=16)
@@ -0,0 +1,114 @@
+# ecs.py - small entity-component store for the game loop
+#
+# Entities are integer ids. Each archetype is a table with one dense list per
+# component: row i of every column belongs to the same entity, so a system
+# walks plain lists of the components it needs - no hasattr() probing and no
+# list copies. destroy() only queues the id; flush() removes the queued rows
+# (swap with the last row, pop) between systems, so a system can destroy
+# entities while it iterates.
+
+
+class Archetype:
+    def __init__(self, name, components, on_destroy=None):
+        self.name = name
+        self.components = tuple(components)
+        self.columns = {component: [] for component in self.components}
+        self.entities = []
+        self.on_destroy = on_destroy  # on_destroy(body) - например, вернуть объект в пул
+
+    def column(self, component):
+        return self.columns[component]
+
+    def __len__(self):
+        return len(self.entities)
+
+
+class World:
+    def __init__(self):
+        self.archetypes = {}
+        self.location = {}   # id сущности -> (archetype, row)
+        self.owner = {}      # id(body) -> id сущности (события столкновений несут body)
+        self.pending = []
+        self.next_id = 1
+        self._queries = {}
+
+    def define(self, name, components, on_destroy=None):
+        archetype = Archetype(name, components, on_destroy)
+        self.archetypes[name] = archetype
+        self._queries.clear()
+        return archetype
+
+    def spawn(self, name, **components):
+        archetype = self.archetypes[name]
+        if components.keys() != set(archetype.components):
+            raise ValueError(f"{name} needs components {archetype.components}, got {tuple(components)}")
+        entity = self.next_id
+        self.next_id += 1
+        row = len(archetype.entities)
+        archetype.entities.append(entity)
+        for component, column in archetype.columns.items():
+            column.append(components[component])
+        self.location[entity] = (archetype, row)
+        if "body" in components:
+            self.owner[id(components["body"])] = entity
+        return entity
+
+    def get(self, entity, component):
+        archetype, row = self.location[entity]
+        return archetype.columns[component][row]
+
+    def entity_of(self, body):
+        return self.owner.get(id(body))
+
+    def destroy(self, entity):
+        """Queues the entity for removal at the next flush()"""
+        if entity is not None:
+            self.pending.append(entity)
+
+    def flush(self):
+        for entity in self.pending:
+            location = self.location.pop(entity, None)
+            if location is None:
+                continue  # уже удалена (уничтожена дважды за тик)
+            archetype, row = location
+            columns = archetype.columns
+            body = columns["body"][row] if "body" in columns else None
+            if body is not None:
+                self.owner.pop(id(body), None)
+            last = len(archetype.entities) - 1
+            if row != last:
+                moved = archetype.entities[last]
+                archetype.entities[row] = moved
+                for column in columns.values():
+                    column[row] = column[last]
+                self.location[moved] = (archetype, row)
+            archetype.entities.pop()
+            for column in columns.values():
+                column.pop()
+            if archetype.on_destroy and body is not None:
+                archetype.on_destroy(body)
+        self.pending.clear()
+
+    def query(self, *components):
+        """Archetypes that have all the given components (cached per component set)"""
+        tables = self._queries.get(components)
+        if tables is None:
+            tables = [a for a in self.archetypes.values() if all(c in a.columns for c in components)]
+            self._queries[components] = tables
+        return tables
+
+    def reindex(self):
+        """Rebuilds the id(body) map, e.g. after the world was copied (snapshot.clone)"""
+        self.owner = {}
+        for archetype in self.archetypes.values():
+            if "body" in archetype.columns:
+                for entity, body in zip(archetype.entities, archetype.columns["body"]):
+                    self.owner[id(body)] = entity
+
+    def count(self, name):
+        return len(self.archetypes[name].entities)
+
+    def clear(self):
+        for archetype in self.archetypes.values():
+            self.pending.extend(archetype.entities)
+        self.flush()
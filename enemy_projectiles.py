@@ -0,0 +1,177 @@
+# enemy_projectiles.py - every enemy projectile in one set of NumPy arrays
+#
+# Shooters only spawn into the buffer: a bullet does not belong to the ghost
+# that fired it, so it keeps flying after the shooter dies. One vectorised
+# pass moves all bullets and culls those outside the world or past their
+# lifetime, and one batched AABB test against the player (or the raised
+# shield) applies the hits.
+import numpy as np
+import pygame
+from safe_loader import load_image
+
+# Массивы буфера: имя -> dtype
+FIELDS = {
+    "x": np.float64, "y": np.float64,            # левый верхний угол хитбокса
+    "prev_x": np.float64, "prev_y": np.float64,  # позиция на прошлом тике (интерполяция)
+    "vx": np.float64, "vy": np.float64,          # пикселей в секунду
+    "life": np.float64,                          # секунд до исчезновения
+    "damage": np.int64,
+    "sprite": np.int64,                          # спрайт цифры урона (индекс в self.sprites)
+    "image": np.int64,                           # индекс в EYE_IMAGES
+}
+
+# Картинка снаряда по направлению полета: вправо, влево, вниз, вверх
+EYE_IMAGES = ("assets/eye_right.png", "assets/eye_left.png", "assets/eye_down.png", "assets/eye_up.png")
+
+
+class ProjectileBuffer:
+    size = 16            # хитбокс, как у ShooterProjectile
+    image_size = 32
+    max_lifetime = 8.0   # секунд, даже если снаряд не покинул мир
+
+    def __init__(self, bounds=(0, 0, 2000, 2000), capacity=256):
+        self.bounds = pygame.Rect(bounds)
+        self.count = 0
+        self.capacity = 0
+        self.sprites = []
+        self._sprite_ids = {}
+        self.images = None   # загружаются при первой отрисовке (нужен дисплей)
+        self.spawned = 0
+        self.hits = 0
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        for name, dtype in FIELDS.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if self.capacity:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def sprite_id(self, sprite):
+        """Index of a damage-number sprite name (stored per projectile)"""
+        index = self._sprite_ids.get(sprite)
+        if index is None:
+            index = len(self.sprites)
+            self.sprites.append(sprite)
+            self._sprite_ids[sprite] = index
+        return index
+
+    def spawn_many(self, xs, ys, dxs, dys, speed, damage, sprite):
+        """Fires bullets with their top-left at (xs, ys) along (dxs, dys).
+
+        Directions need not be unit length; speed, damage and sprite (an id
+        from sprite_id) may be scalars or per-bullet arrays.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        k = len(xs)
+        if not k:
+            return
+        n = self.count
+        if n + k > self.capacity:
+            capacity = self.capacity
+            while capacity < n + k:
+                capacity *= 2
+            self._grow(capacity)
+        dxs = np.asarray(dxs, dtype=np.float64)
+        dys = np.asarray(dys, dtype=np.float64)
+        length = np.hypot(dxs, dys)
+        length[length == 0] = 1
+        ux = dxs / length
+        uy = dys / length
+
+        new = slice(n, n + k)
+        self.x[new] = self.prev_x[new] = xs
+        self.y[new] = self.prev_y[new] = ys
+        self.vx[new] = ux * speed
+        self.vy[new] = uy * speed
+        self.life[new] = self.max_lifetime
+        self.damage[new] = damage
+        self.sprite[new] = sprite
+        self.image[new] = np.where(np.abs(ux) > np.abs(uy),
+                                   np.where(ux > 0, 0, 1),
+                                   np.where(uy > 0, 2, 3))
+        self.count = n + k
+        self.spawned += k
+
+    def spawn(self, x, y, dx, dy, speed, damage, sprite):
+        self.spawn_many((x,), (y,), (dx,), (dy,), speed, damage, sprite)
+
+    def update(self, dt):
+        """Moves every bullet and drops those outside the bounds or out of time"""
+        n = self.count
+        if not n:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        x += self.vx[:n] * dt
+        y += self.vy[:n] * dt
+        life = self.life[:n]
+        life -= dt
+        rx = np.rint(x)
+        ry = np.rint(y)
+        b = self.bounds
+        keep = (life > 0) & (rx >= b.left) & (rx <= b.right) & (ry >= b.top) & (ry <= b.bottom)
+        self._keep(keep)
+
+    def _keep(self, keep):
+        n = self.count
+        kept = int(np.count_nonzero(keep))
+        if kept == n:
+            return
+        for name in FIELDS:
+            array = getattr(self, name)
+            array[:kept] = array[:n][keep]
+        self.count = kept
+
+    def hit_test(self, player):
+        """Applies every bullet overlapping the player or the raised shield; returns the hit count"""
+        n = self.count
+        if not n:
+            return 0
+        r = player.rect
+        shield = player.shield.hit_rect()
+        if shield is not None:
+            r = r.union(shield)
+        x = np.rint(self.x[:n])
+        y = np.rint(self.y[:n])
+        size = self.size
+        hit = (x < r.right) & (x + size > r.left) & (y < r.bottom) & (y + size > r.top)
+        hits = np.flatnonzero(hit).tolist()
+        if not hits:
+            return 0
+        sprites = self.sprites
+        for i in hits:
+            # Щит поглощает урон внутри take_damage
+            player.take_damage(int(self.damage[i]), sprite=sprites[self.sprite[i]])
+        self._keep(~hit)
+        self.hits += len(hits)
+        return len(hits)
+
+    def draw(self, surface, camera_offset, alpha=1.0):
+        """Blits every on-screen bullet in one Surface.blits call"""
+        n = self.count
+        if not n:
+            return
+        if self.images is None:
+            size = (self.image_size, self.image_size)
+            self.images = [load_image(path, size, owner="EnemyProjectile") for path in EYE_IMAGES]
+        prev_x = self.prev_x[:n]
+        prev_y = self.prev_y[:n]
+        sx = prev_x + (self.x[:n] - prev_x) * alpha - camera_offset.x
+        sy = prev_y + (self.y[:n] - prev_y) * alpha - camera_offset.y
+        width, height = surface.get_size()
+        size = self.image_size
+        index = np.flatnonzero((sx < width) & (sx + size > 0) & (sy < height) & (sy + size > 0))
+        images = self.images
+        surface.blits([(images[i], (x, y)) for i, x, y in
+                       zip(self.image[index].tolist(), sx[index].tolist(), sy[index].tolist())],
+                      doreturn=False)
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
@@ -1,26 +1,39 @@
-from safe_loader import safe_load_image, safe_font
+from safe_loader import load_image
 import pygame
+from timestep import interpolate
+from pool import Pool
 
 class Fireball:
+    """ECS body of a fireball: movement_system moves it by its velocity
+    component, lifetime_system destroys it (see GameSession.handle_key)"""
+    __slots__ = ("direction", "pos", "prev_pos", "rect", "image")
+
+    speed = 500
+    lifetime = 2
+
     def __init__(self, x, y, direction):
-        original = safe_load_image("assets/fireball.png")
-        self.image_original = pygame.transform.scale(original, (32, 32))
-        self.image = self.image_original
-        self.rect = self.image.get_rect(center=(x, y))
-        self.direction = direction.normalize()
-        self.speed = 500
-        self.lifetime = 2  
-        self.timer = 0
-
-        
-        angle = -self.direction.angle_to(pygame.Vector2(1, 0))
-        self.image = pygame.transform.rotate(self.image_original, angle)
-        self.rect = self.image.get_rect(center=self.rect.center)
-
-    def update(self, dt):
-        self.rect.x += self.direction.x * self.speed * dt
-        self.rect.y += self.direction.y * self.speed * dt
-        self.timer += dt
-
-    def draw(self, surface, camera_offset):
-        surface.blit(self.image, (self.rect.x - camera_offset.x, self.rect.y - camera_offset.y))
\ No newline at end of file
+        self.direction = pygame.Vector2()
+        self.pos = pygame.Vector2()
+        self.prev_pos = pygame.Vector2()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, direction)
+
+    def reset(self, x, y, direction):
+        """Re-initialises a pooled fireball in place"""
+        self.direction.update(direction)
+        self.direction.normalize_ip()
+
+        # Повёрнутые варианты кэшируются по углу (огнешары летят влево/вправо)
+        angle = round(-self.direction.angle_to(pygame.Vector2(1, 0)))
+        self.image = load_image("assets/fireball.png", (32, 32), angle, owner="Fireball")
+        self.rect.size = self.image.get_size()
+        self.rect.center = (x, y)
+        self.pos.update(self.rect.topleft)
+        self.prev_pos.update(self.pos)
+
+    def draw(self, surface, camera_offset, alpha=1.0):
+        x, y = interpolate(self.prev_pos, self.pos, alpha)
+        surface.blit(self.image, (x - camera_offset.x, y - camera_offset.y))
+
+
+FIREBALL_POOL = Pool("fireball", lambda: Fireball(0, 0, pygame.Vector2(1, 0)), prewarm=32)
@@ -0,0 +1,154 @@
+# flow_field.py - shared wall-aware steering field over the 32px wall grid
+#
+# One BFS from the player's cell gives every free cell its distance to the
+# player; each cell then stores the centre of its best 8-neighbour (diagonals
+# only where both side cells are free, so paths never cut wall corners).
+# Ghosts and bosses look up the cell they stand in and head for that point -
+# an O(1) read per entity, however many of them there are.
+#
+# The field is rebuilt only when the player enters another cell, and finished
+# fields are kept per goal cell, so walking back and forth in the same area
+# costs nothing after the first visit.
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from wall_grid import EMPTY
+
+# Смещения соседей: сначала прямые, затем диагонали
+OFFSETS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class FlowField:
+    def __init__(self, wall_grid, cache_size=32):
+        self.wall_grid = wall_grid
+        self.cell_size = wall_grid.cell_size
+        self.cols = wall_grid.cols
+        self.rows = wall_grid.rows
+        self.free = np.frombuffer(bytes(wall_grid.cells), dtype=np.uint8).reshape(self.rows, self.cols) == EMPTY
+        self.neighbours = self._build_neighbours()
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # клетка цели -> (next_x, next_y)
+        self.goal = -1
+        self.next_x = None
+        self.next_y = None
+        self.recomputes = 0
+        self.cache_hits = 0
+
+    def _build_neighbours(self):
+        """4-neighbour lists of free cells (flat indices) for the BFS"""
+        cols, rows = self.cols, self.rows
+        free = self.free.ravel().tolist()
+        neighbours = []
+        for index in range(cols * rows):
+            cx, cy = index % cols, index // cols
+            links = []
+            if cx > 0 and free[index - 1]:
+                links.append(index - 1)
+            if cx < cols - 1 and free[index + 1]:
+                links.append(index + 1)
+            if cy > 0 and free[index - cols]:
+                links.append(index - cols)
+            if cy < rows - 1 and free[index + cols]:
+                links.append(index + cols)
+            neighbours.append(links)
+        return neighbours
+
+    def cell_of(self, x, y):
+        """Flat index of the cell containing world point (x, y), -1 outside the grid"""
+        cx = int(x // self.cell_size)
+        cy = int(y // self.cell_size)
+        if 0 <= cx < self.cols and 0 <= cy < self.rows:
+            return cy * self.cols + cx
+        return -1
+
+    def update(self, x, y):
+        """Points the field at world position (x, y); rebuilds only on a new cell"""
+        goal = self.cell_of(x, y)
+        if goal == self.goal:
+            return
+        self.goal = goal
+        if goal < 0:
+            self.next_x = self.next_y = None
+            return
+        cached = self.cache.get(goal)
+        if cached is not None:
+            self.cache.move_to_end(goal)
+            self.cache_hits += 1
+        else:
+            cached = self._build(goal)
+            self.cache[goal] = cached
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            self.recomputes += 1
+        self.next_x, self.next_y = cached
+
+    def _build(self, goal):
+        cols, rows = self.cols, self.rows
+        dist = [-1] * (cols * rows)
+        dist[goal] = 0
+        neighbours = self.neighbours
+        queue = deque((goal,))
+        while queue:
+            index = queue.popleft()
+            step = dist[index] + 1
+            for other in neighbours[index]:
+                if dist[other] < 0:
+                    dist[other] = step
+                    queue.append(other)
+
+        d = np.array(dist, dtype=np.float64).reshape(rows, cols)
+        d[d < 0] = np.inf
+        padded = np.full((rows + 2, cols + 2), np.inf)
+        padded[1:-1, 1:-1] = d
+        free = np.zeros((rows + 2, cols + 2), dtype=bool)
+        free[1:-1, 1:-1] = self.free
+
+        candidates = np.empty((len(OFFSETS), rows, cols))
+        for k, (ox, oy) in enumerate(OFFSETS):
+            cand = padded[1 + oy:rows + 1 + oy, 1 + ox:cols + 1 + ox].copy()
+            if ox and oy:
+                # Диагональ только если обе боковые клетки свободны (не режем угол стены)
+                side_x = free[1:rows + 1, 1 + ox:cols + 1 + ox]
+                side_y = free[1 + oy:rows + 1 + oy, 1:cols + 1]
+                cand[~(side_x & side_y)] = np.inf
+            candidates[k] = cand
+        best = candidates.argmin(axis=0)
+        best_dist = np.take_along_axis(candidates, best[None], axis=0)[0]
+
+        offsets = np.array(OFFSETS)
+        col = np.arange(cols)[None, :] + offsets[best, 0]
+        row = np.arange(rows)[:, None] + offsets[best, 1]
+        half = self.cell_size / 2
+        next_x = col * self.cell_size + half
+        next_y = row * self.cell_size + half
+        # Рядом с целью, в стене и без пути - идем прямо к игроку (NaN)
+        direct = ~np.isfinite(d) | (d <= 1) | ~(best_dist < d)
+        next_x[direct] = np.nan
+        next_y[direct] = np.nan
+        return next_x.ravel(), next_y.ravel()
+
+    def steer(self, x, y):
+        """Point to head for from (x, y), or None to go straight at the goal"""
+        if self.next_x is None:
+            return None
+        index = self.cell_of(x, y)
+        if index < 0:
+            return None
+        tx = self.next_x[index]
+        if tx != tx:  # NaN
+            return None
+        return float(tx), float(self.next_y[index])
+
+    def steer_many(self, xs, ys, goal_x, goal_y):
+        """Vectorised steer(): target arrays, goal position where there is no path"""
+        if self.next_x is None:
+            return np.full(len(xs), float(goal_x)), np.full(len(ys), float(goal_y))
+        cx = np.floor_divide(xs, self.cell_size).astype(np.int64)
+        cy = np.floor_divide(ys, self.cell_size).astype(np.int64)
+        inside = (cx >= 0) & (cx < self.cols) & (cy >= 0) & (cy < self.rows)
+        index = np.where(inside, cy * self.cols + cx, 0)
+        tx = self.next_x[index]
+        ty = self.next_y[index]
+        use = inside & ~np.isnan(tx)
+        return np.where(use, tx, goal_x), np.where(use, ty, goal_y)
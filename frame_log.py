@@ -0,0 +1,229 @@
+# frame_log.py - opt-in per-frame timing log with hitch stacks (--frame-log PATH)
+#
+# Every frame goes into a preallocated NumPy ring: frame time, FRAME_PHASES
+# times, entity counts, asset loads and new surfaces during the frame, new
+# GC-tracked objects and garbage collector pauses (gc_policy). A writer
+# thread drains the ring to a JSONL file, so the game loop only fills a row
+# and advances `head`; `tail` and the drop count belong to the writer alone.
+# If the writer falls behind by more than the ring size, the oldest rows are
+# overwritten: the writer sees the gap between head and tail (or a copied
+# row whose frame number is already a newer one) and counts those frames as
+# dropped.
+#
+# Frames over budget also get the Python stack of their slowest phase. The
+# stack cannot be taken after the fact, so a watchdog thread samples the main
+# thread's frame (sys._current_frames) every few ms once a frame has run for
+# half its budget; at the end of a slow frame the samples that fall into the
+# slowest phase (by the PhaseTimer mark times) are kept with the frame.
+#
+#   python frame_report.py frames.jsonl    # percentiles and top hitch causes
+import json
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+from perf_hud import FRAME_PHASES
+from safe_loader import get_alloc_counts
+
+COUNT_NAMES = ("ghosts", "fireballs", "enemy_projectiles", "lightnings", "pickups",
+               "bosses", "damage_numbers")
+STACK_DEPTH = 24
+MAX_SAMPLES = 500    # стеков на кадр (долгий кадр не съест память)
+
+
+def _record_dtype():
+    return np.dtype([
+        ("frame", np.int64),
+        ("t", np.float64),                          # секунды от начала лога
+        ("ms", np.float32),                         # от begin_frame до end_frame
+        ("dt", np.float32),                         # clock.tick: прошлый кадр + ожидание
+        ("phases", np.float32, len(FRAME_PHASES)),  # мс по фазам
+        ("counts", np.int32, len(COUNT_NAMES)),
+        ("asset_loads", np.int32),
+        ("surfaces", np.int32),
+        ("gc_allocs", np.int32),                    # прирост объектов поколения 0
+        ("gc_collections", np.int16),
+        ("gc_ms", np.float32),                      # паузы сборщика за кадр
+    ])
+
+
+class FrameLog:
+    def __init__(self, path, budget_ms=1000 / 60, capacity=1024, sample_ms=2.0):
+        self.path = path
+        self.budget = budget_ms / 1000
+        self.ring = np.zeros(capacity, dtype=_record_dtype())
+        self.capacity = capacity
+        self.head = 0             # следующий номер кадра (пишет игра)
+        self.tail = 0             # первый неписаный кадр (только поток записи)
+        self.dropped = 0          # тоже только поток записи
+        self.hitches = deque()    # редкие записи о тормозах, забирает поток записи
+        self.started = time.perf_counter()
+        self.last_allocs = get_alloc_counts()
+
+        # Состояние для сторожевого потока
+        self.sample_interval = sample_ms / 1000
+        self.frame_start = None
+        self.samples = []
+        self.main_thread_id = threading.get_ident()
+
+        self.stop = threading.Event()
+        self.file = open(path, "w", encoding="utf-8")
+        self.file.write(json.dumps({
+            "type": "header", "budget_ms": budget_ms, "phases": FRAME_PHASES,
+            "counts": COUNT_NAMES, "started": time.time(),
+        }) + "\n")
+        self.writer = threading.Thread(target=self._write_loop, name="frame-log-writer", daemon=True)
+        self.watchdog = threading.Thread(target=self._watch_loop, name="frame-log-watchdog", daemon=True)
+        self.writer.start()
+        self.watchdog.start()
+        print(f"Frame log: {path}")
+
+    # --- игровой поток ---
+
+    def begin_frame(self, frame_start):
+        self.samples = []
+        self.frame_start = frame_start
+
+    def idle(self):
+        """Between games (menu, game over screen): nothing to sample"""
+        self.frame_start = None
+
+    def end_frame(self, frame_dt, phases, marks, counts, activity=(), gc_frame=None):
+        """Stores one frame (phases: PhaseTimer.take(), marks: PhaseTimer.marks,
+        gc_frame: GcPolicy.end_frame())"""
+        frame_start, self.frame_start = self.frame_start, None
+        elapsed = time.perf_counter() - frame_start
+        samples, self.samples = self.samples, []
+        n = self.head
+        # Если поток записи отстал на кольцо, строка перезаписывается - потерю он сочтет сам
+        row = self.ring[n % self.capacity]
+        loads, surfaces = get_alloc_counts()
+        row["frame"] = n   # первым: по номеру поток записи узнает перезаписанную строку
+        row["t"] = time.perf_counter() - self.started
+        row["ms"] = elapsed * 1000
+        row["dt"] = frame_dt * 1000
+        row["phases"] = [p * 1000 for p in phases]
+        row["counts"] = [counts.get(name, 0) for name in COUNT_NAMES]
+        row["asset_loads"] = loads - self.last_allocs[0]
+        row["surfaces"] = surfaces - self.last_allocs[1]
+        self.last_allocs = (loads, surfaces)
+        allocs, collections, gc_ms, generation = gc_frame or (0, 0, 0.0, -1)
+        row["gc_allocs"] = allocs
+        row["gc_collections"] = collections
+        row["gc_ms"] = gc_ms
+        self.head = n + 1
+        if gc_ms >= 1.0:
+            activity = list(activity) + [f"gc gen {generation}"]
+
+        # frame_dt меряет прошлый кадр, поэтому тормоз - по собственному времени кадра
+        if elapsed > self.budget:
+            self._hitch(n, elapsed, phases, marks, samples, frame_start, activity,
+                        row["asset_loads"], row["surfaces"])
+
+    def _hitch(self, n, elapsed, phases, marks, samples, frame_start, activity, loads, surfaces):
+        slowest = max(range(len(phases)), key=phases.__getitem__)
+        phase = FRAME_PHASES[slowest]
+        # Сэмплы стека, попавшие в самую долгую фазу (фаза заканчивается своей отметкой)
+        stacks = []
+        begin = frame_start
+        for name, end in marks:
+            if name == phase:
+                stacks.extend(stack for t, stack in samples if begin <= t <= end)
+            begin = end
+        if not stacks:
+            stacks = [stack for _, stack in samples]
+        stack = Counter(stacks).most_common(1)[0][0] if stacks else ()
+        self.hitches.append({
+            "type": "hitch", "frame": n, "ms": round(elapsed * 1000, 3),
+            "work_ms": round(sum(phases) * 1000, 3), "phase": phase,
+            "phase_ms": round(phases[slowest] * 1000, 3), "during": list(activity),
+            "asset_loads": int(loads), "surfaces": int(surfaces),
+            "samples": len(stacks), "stack": list(stack),
+        })
+
+    def close(self):
+        self.stop.set()
+        self.watchdog.join(timeout=1)
+        self.writer.join(timeout=2)
+        self._flush()
+        self.file.write(json.dumps({"type": "footer", "frames": self.head, "dropped": self.dropped}) + "\n")
+        self.file.close()
+        print(f"Frame log closed: {self.head} frames, {self.dropped} dropped")
+
+    # --- фоновые потоки ---
+
+    def _watch_loop(self):
+        half_budget = self.budget / 2
+        while not self.stop.wait(self.sample_interval):
+            start = self.frame_start
+            if start is None or len(self.samples) >= MAX_SAMPLES:
+                continue
+            now = time.perf_counter()
+            if now - start < half_budget:
+                continue
+            frame = sys._current_frames().get(self.main_thread_id)
+            if frame is None:
+                continue
+            self.samples.append((now, _stack(frame)))
+
+    def _write_loop(self):
+        while not self.stop.wait(0.25):
+            self._flush()
+
+    def _flush(self):
+        head = self.head
+        tail = self.tail
+        capacity = self.capacity
+        if head - tail > capacity:
+            # Игра обогнала запись на кольцо: старейшие строки уже перезаписаны
+            self.dropped += head - capacity - tail
+            tail = head - capacity
+        lines = []
+        while tail < head:
+            # Копия - под GIL целиком; номер кадра игра пишет первым
+            row = self.ring[tail % capacity].copy()
+            if row["frame"] != tail:
+                self.dropped += 1
+                tail += 1
+                continue
+            lines.append(json.dumps({
+                "type": "frame", "frame": int(row["frame"]), "t": round(float(row["t"]), 4),
+                "ms": round(float(row["ms"]), 3), "dt": round(float(row["dt"]), 3),
+                "phases": [round(float(p), 3) for p in row["phases"]],
+                "counts": row["counts"].tolist(),
+                "asset_loads": int(row["asset_loads"]), "surfaces": int(row["surfaces"]),
+                "gc_allocs": int(row["gc_allocs"]), "gc_collections": int(row["gc_collections"]),
+                "gc_ms": round(float(row["gc_ms"]), 3),
+            }))
+            tail += 1
+        self.tail = tail
+        hitches = self.hitches
+        while hitches:
+            lines.append(json.dumps(hitches.popleft()))
+        if lines:
+            try:
+                self.file.write("\n".join(lines) + "\n")
+                self.file.flush()
+            except Exception as e:
+                print(f"Frame log write error: {e}")
+
+
+def _stack(frame):
+    """'file.py:line Class.method' entries, outermost first, innermost STACK_DEPTH frames"""
+    stack = []
+    while frame is not None and len(stack) < STACK_DEPTH:
+        code = frame.f_code
+        name = getattr(code, "co_qualname", code.co_name)  # co_qualname - Python 3.11+
+        stack.append(f"{_short(code.co_filename)}:{frame.f_lineno} {name}")
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+def _short(filename):
+    """Path relative to the game directory (stdlib and site-packages keep their name)"""
+    parts = filename.replace("\\", "/").split("/")
+    return "/".join(parts[-2:]) if "site-packages" in parts or "lib" in parts else parts[-1]
@@ -0,0 +1,121 @@
+# frame_report.py - summary of a frame log written with `python main.py --frame-log frames.jsonl`
+#
+#   python frame_report.py frames.jsonl [--budget 33.3] [--top 10]
+#
+# Prints frame-time percentiles, per-phase percentiles, how many frames went
+# over budget (and how many were logged as hitches with a stack), then the top
+# hitch causes: hitches grouped by what the game was doing (boss spawn, summon,
+# wave start - GameSession.activity), the slowest phase and the innermost game
+# frame of its stack, e.g.
+#
+#   12 frames >33ms during BossPepe summon, all in ghost.py:Ghost.__init__ (ghost_ai, avg 41.2 ms)
+import sys
+import json
+import argparse
+from collections import Counter, defaultdict
+
+import numpy as np
+
+
+def load_log(path):
+    header, frames, hitches, footer = {}, [], [], {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # оборванная последняя строка (игра упала)
+            kind = record.get("type")
+            if kind == "frame":
+                frames.append(record)
+            elif kind == "hitch":
+                hitches.append(record)
+            elif kind == "header":
+                header = record
+            elif kind == "footer":
+                footer = record
+    return header, frames, hitches, footer
+
+
+def game_frame(stack):
+    """Innermost entry of the game's own code ('ghost.py:Ghost.__init__'), else the innermost"""
+    for entry in reversed(stack):
+        location, _, name = entry.partition(" ")
+        filename = location.rsplit(":", 1)[0]
+        if "/" not in filename and filename not in ("frame_log.py", "perf_hud.py"):
+            return f"{filename}:{name}"
+    return stack[-1] if stack else "no stack sample"
+
+
+def percentile_row(values):
+    values = np.asarray(values, dtype=float)
+    return "  ".join(f"p{p} {np.percentile(values, p):7.2f}" for p in (50, 90, 99)) + \
+           f"  max {values.max():7.2f}"
+
+
+def report(path, budget_ms=None, top=10, out=sys.stdout):
+    header, frames, hitches, footer = load_log(path)
+    if not frames:
+        print(f"{path}: no frames", file=out)
+        return
+    phases = header.get("phases", [])
+    budget = budget_ms or header.get("budget_ms", 1000 / 60)
+    frame_ms = np.array([f["ms"] for f in frames])
+    phase_ms = np.array([f["phases"] for f in frames])
+
+    print(f"{path}: {len(frames)} frames, {footer.get('dropped', 0)} dropped by the writer", file=out)
+    print(f"frame ms        {percentile_row(frame_ms)}", file=out)
+    print(f"clock dt ms     {percentile_row([f['dt'] for f in frames])}", file=out)
+    for i, name in enumerate(phases):
+        print(f"  {name:<14}{percentile_row(phase_ms[:, i])}", file=out)
+    over = int((frame_ms > budget).sum())
+    print(f"over {budget:.1f} ms: {over} frames ({over / len(frames):.1%}), "
+          f"{len(hitches)} hitches logged with a stack", file=out)
+    loads = sum(f["asset_loads"] for f in frames)
+    surfaces = sum(f["surfaces"] for f in frames)
+    print(f"asset loads during play: {loads}, new surfaces: {surfaces}", file=out)
+    if "gc_ms" in frames[0]:
+        gc_ms = np.array([f["gc_ms"] for f in frames])
+        collected = gc_ms[[f["gc_collections"] > 0 for f in frames]]
+        print(f"gc new objects  {percentile_row([f['gc_allocs'] for f in frames])}", file=out)
+        if len(collected):
+            print(f"gc pause ms     {percentile_row(collected)}  ({len(collected)} frames collected)",
+                  file=out)
+
+    hitches = [h for h in hitches if h["ms"] > budget]
+    if not hitches:
+        return
+    # Причина = (что происходило, самая долгая фаза), внутри - самые частые места в коде
+    groups = defaultdict(list)
+    for h in hitches:
+        during = ", ".join(h["during"]) or "normal play"
+        groups[(during, h["phase"])].append(h)
+    print(f"\ntop hitch causes (frames >{budget:.0f}ms):", file=out)
+    ranked = sorted(groups.items(), key=lambda item: -len(item[1]))
+    for (during, phase), group in ranked[:top]:
+        places = Counter(game_frame(h["stack"]) for h in group)
+        place, count = places.most_common(1)[0]
+        where = f"all in {place}" if count == len(group) else f"{count} in {place}"
+        avg = sum(h["ms"] for h in group) / len(group)
+        loads = sum(h["asset_loads"] for h in group)
+        extra = f", {loads} asset loads" if loads else ""
+        print(f"  {len(group)} frames >{budget:.0f}ms during {during}, {where} "
+              f"({phase}, avg {avg:.1f} ms{extra})", file=out)
+        for other, n in places.most_common(3)[1:]:
+            print(f"      {n} in {other}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="frame log summary")
+    parser.add_argument("log", help="JSONL file written by main.py --frame-log")
+    parser.add_argument("--budget", type=float, help="hitch threshold in ms (default: the log's frame budget)")
+    parser.add_argument("--top", type=int, default=10, help="hitch causes to list")
+    args = parser.parse_args(argv)
+    report(args.log, args.budget, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+import os
+
 block_cipher = None
 
+# Single-file asset pack (python build_pack.py); loose assets stay as a fallback
+pack_datas = [('assets.pak', '.')] if os.path.exists('assets.pak') else []
+
 
 a = Analysis(
     ['main.py'],  # Главный файл игры
@@ -13,7 +18,7 @@ a = Analysis(
         # Добавляем JSON файлы
         ('walls.json', '.'),
         ('game_settings.json', '.'),
-    ],
+    ] + pack_datas,
     hiddenimports=[
         # Основные модули
         'pygame',
@@ -0,0 +1,563 @@
+# game_session.py - everything one game simulates, in one object
+#
+# start_game_loop() owns the window, the clock, pause and drawing; GameSession
+# owns the simulated state and advances it by one fixed tick at a time from
+# (held keys, dt) plus discrete key presses. That split is what makes a game
+# replayable: the same seed and the same per-tick input give the same state,
+# which state_hash() condenses to one number per tick, and snapshot()/restore()
+# capture the whole state for replay keyframes.
+import zlib
+
+import numpy as np
+import pygame
+
+from player import Player
+from ghost import Ghost
+from fireball import Fireball, FIREBALL_POOL
+from potion import Potion
+from tank_ghost import TankGhost
+from shooter_ghost import ShooterGhost
+from lightning_spell import LIGHTNING_POOL
+from damage_number import DAMAGE_NUMBER_POOL
+from manamushroom import ManaMushroom
+from inventory import Inventory
+from shield_spell import PlayerLevel
+from boss_pepe import BossPepe
+from boss_strong import BossStrong
+from config import config
+from safe_loader import safe_font, render_text
+from collision import CollisionPhase
+from flow_field import FlowField
+from ghost_swarm import GhostSwarm, FIELDS as GHOST_FIELDS
+from enemy_projectiles import ProjectileBuffer, FIELDS as PROJECTILE_FIELDS
+from ecs import World
+from systems import (movement_system, animation_system, lifetime_system,
+                     collision_system, damage_system, render_system)
+from pool import Pool, reset_pools
+from animation import AnimationSet
+import rng
+from rng import stream, WAVES, BOSSES, ITEMS
+import snapshot
+import tracing
+
+# Реестры и кэши общие для всех снимков состояния
+snapshot.share_type(Pool, AnimationSet)
+
+# Клавиши, которые меняют состояние игры (остальные - окно, пауза, HUD)
+GAME_KEYS = (pygame.K_SPACE, pygame.K_q, pygame.K_e, pygame.K_1, pygame.K_2)
+# Клавиши движения: их состояние пишется в реплей каждый тик
+MOVE_KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
+# Фазы тика в порядке выполнения (GameSession.tick(..., mark))
+TICK_PHASES = ("waves_bosses", "player", "ghost_ai", "effects", "collisions", "items")
+
+
+# Boss system
+class BossManager:
+    def __init__(self, bg_width, bg_height):
+        self.bg_width = bg_width
+        self.bg_height = bg_height
+        self.boss_pepe = None
+        self.boss_strong = None
+        self.current_boss_type = "pepe"
+        self.boss_cycle = 0
+        self.boss_defeated = False
+        self.boss_spawn_score = config.BOSS_SPAWN_SCORE_START
+        self.boss_cooldown = 0
+        self.boss_cooldown_duration = 10
+        self.warning_time = 5
+        self.showing_warning = False
+        self.last_spawned = None      # имя последнего босса и время с его появления
+        self.since_spawn = 0.0
+
+    @tracing.traced("BossManager.update")
+    def update(self, dt, score, player, ghosts, flow=None):
+        self.since_spawn += dt
+        if self.boss_cooldown > 0:
+            self.boss_cooldown -= dt
+            if self.boss_cooldown <= self.warning_time and not self.showing_warning:
+                self.showing_warning = True
+
+        if self.boss_pepe and self.boss_pepe.active:
+            self.boss_pepe.update(dt, player, ghosts, flow)
+            if not self.boss_pepe.active:
+                self.boss_defeated = True
+                self.boss_cooldown = self.boss_cooldown_duration
+                self.showing_warning = False
+
+        if self.boss_strong and self.boss_strong.active:
+            self.boss_strong.update(dt, player, ghosts, flow)
+            if not self.boss_strong.active:
+                self.boss_defeated = True
+                self.boss_cooldown = self.boss_cooldown_duration
+                self.showing_warning = False
+
+        if (score >= self.boss_spawn_score and
+            self.boss_cooldown <= 0 and
+            not self.has_active_boss()):
+            self.spawn_next_boss()
+
+    def active_bosses(self):
+        bosses = []
+        if self.boss_strong and self.boss_strong.active:
+            bosses.append(self.boss_strong)
+        if self.boss_pepe and self.boss_pepe.active:
+            bosses.append(self.boss_pepe)
+        return bosses
+
+    def has_active_boss(self):
+        return ((self.boss_pepe and self.boss_pepe.active) or
+                (self.boss_strong and self.boss_strong.active))
+
+    def spawn_next_boss(self):
+        rnd = stream(BOSSES)
+        x = self.bg_width // 2 + rnd.randint(-100, 100)
+        y = self.bg_height // 2 + rnd.randint(-100, 100)
+
+        power_level = 1 + self.boss_cycle
+
+        if self.current_boss_type == "pepe":
+            self.boss_pepe = BossPepe(x, y, power_level)
+            self.current_boss_type = "strong"
+            self.last_spawned = "BossPepe"
+        else:
+            self.boss_strong = BossStrong(x, y, power_level)
+            self.current_boss_type = "pepe"
+            self.boss_cycle += 1
+            self.last_spawned = "BossStrong"
+        self.since_spawn = 0.0
+
+        self.boss_spawn_score += 150 + self.boss_cycle * 50
+        self.showing_warning = False
+
+    def get_next_boss_name(self):
+        if self.current_boss_type == "pepe":
+            return f"PEPE BOSS LV.{1 + self.boss_cycle}"
+        else:
+            return f"STRONG BOSS LV.{1 + self.boss_cycle}"
+
+    def draw(self, surface, camera_offset, alpha=1.0, interface=None):
+        if self.boss_pepe and self.boss_pepe.active:
+            self.boss_pepe.draw(surface, camera_offset, alpha)
+        if self.boss_strong and self.boss_strong.active:
+            self.boss_strong.draw(surface, camera_offset, alpha)
+
+        if interface and self.showing_warning and self.boss_cooldown > 0:
+            interface.draw_boss_warning(surface, self.get_next_boss_name(), self.boss_cooldown)
+
+    def notify_ghost_killed(self):
+        if self.boss_pepe and self.boss_pepe.active:
+            self.boss_pepe.notify_ghost_killed()
+
+
+# Ghost wave system
+class WaveManager:
+    def __init__(self):
+        self.wave_number = 1
+        self.ghosts_in_wave = 3
+        self.wave_timer = 0
+        self.wave_duration = 30
+        self.spawn_timer = 0
+        self.spawn_interval = 3
+        self.ghosts_spawned_this_wave = 0
+
+    @tracing.traced("WaveManager.update")
+    def update(self, dt, ghosts, bg_width, bg_height):
+        self.wave_timer += dt
+        self.spawn_timer += dt
+
+        if self.wave_timer >= self.wave_duration:
+            self.start_new_wave()
+
+        if (self.spawn_timer >= self.spawn_interval and
+            self.ghosts_spawned_this_wave < self.ghosts_in_wave):
+            self.spawn_ghost(ghosts, bg_width, bg_height)
+
+    def start_new_wave(self):
+        self.wave_number += 1
+        self.wave_timer = 0
+        self.ghosts_spawned_this_wave = 0
+
+        self.wave_duration = max(20, 30 - (self.wave_number - 1) * 1)
+
+        base_increase = int(2 * config.DIFFICULTY_MULTIPLIER)
+        self.ghosts_in_wave = 3 + (self.wave_number - 1) * base_increase
+        self.spawn_interval = max(0.8, 3 - (self.wave_number - 1) * 0.15)
+
+    def spawn_ghost(self, ghosts, bg_width, bg_height):
+        rnd = stream(WAVES)
+        margin = 100
+
+        side = rnd.choice(['top', 'bottom', 'left', 'right'])
+        if side == 'top':
+            x = rnd.randint(margin, bg_width - margin)
+            y = rnd.randint(0, margin)
+        elif side == 'bottom':
+            x = rnd.randint(margin, bg_width - margin)
+            y = rnd.randint(bg_height - margin, bg_height)
+        elif side == 'left':
+            x = rnd.randint(0, margin)
+            y = rnd.randint(margin, bg_height - margin)
+        else:
+            x = rnd.randint(bg_width - margin, bg_width)
+            y = rnd.randint(margin, bg_height - margin)
+
+        if self.wave_number <= 2:
+            ghost_types = [Ghost, Ghost, Ghost, TankGhost]
+        elif self.wave_number <= 5:
+            ghost_types = [Ghost, Ghost, TankGhost, ShooterGhost]
+        else:
+            ghost_types = [Ghost, TankGhost, TankGhost, ShooterGhost, ShooterGhost]
+
+        ghost_type = rnd.choice(ghost_types)
+        ghosts.append(ghost_type(x, y))
+
+        self.ghosts_spawned_this_wave += 1
+        self.spawn_timer = 0
+
+
+# Player progression system
+class PlayerProgression:
+    def __init__(self, player):
+        self.player = player
+        self.experience = 0
+        self.level = 1
+        self.exp_for_next_level = 100
+        self.stat_points = 0
+
+    def add_experience(self, amount):
+        self.experience += amount
+        while self.experience >= self.exp_for_next_level:
+            self.level_up()
+
+    def level_up(self):
+        self.experience -= self.exp_for_next_level
+        self.level += 1
+        self.exp_for_next_level = int(self.exp_for_next_level * 1.2)
+
+        self.player.max_hp += 5
+        self.player.hp = self.player.max_hp
+        self.player.max_mana += 5
+        self.player.mana = self.player.max_mana
+        self.player.speed += 5
+
+        return f"Level Up! Now level {self.level}"
+
+
+class GameSession:
+    """One game: seeded RNG streams, the player, the enemies and the ECS world"""
+
+    def __init__(self, wall_grid, bg_width, bg_height, seed=0):
+        self.seed = seed
+        rng.STREAMS.seed(seed)
+        self.wall_grid = wall_grid
+        self.flow_field = FlowField(wall_grid)
+        self.bg_width = bg_width
+        self.bg_height = bg_height
+
+        player = Player(bg_width // 2, bg_height // 2)
+        player.max_hp = config.PLAYER_START_HP
+        player.hp = config.PLAYER_START_HP
+        player.max_mana = config.PLAYER_START_MANA
+        player.mana = config.PLAYER_START_MANA
+        self.player = player
+        self.player_level = PlayerLevel()
+        self.inventory = Inventory(scale=2)
+
+        self.boss_manager = BossManager(bg_width, bg_height)
+        self.wave_manager = WaveManager()
+        self.player_progression = PlayerProgression(player)
+        self.collision_phase = CollisionPhase()
+
+        # Enemy bullets live in the world, not in their shooter
+        self.enemy_projectiles = ProjectileBuffer((0, 0, bg_width, bg_height))
+        self.ghosts = GhostSwarm(projectiles=self.enemy_projectiles)
+        # Everything else that lives on the map: the systems iterate these tables
+        world = World()
+        world.define("fireball", ("body", "velocity", "lifetime"), on_destroy=FIREBALL_POOL.release)
+        world.define("lightning", ("body", "anim"), on_destroy=LIGHTNING_POOL.release)
+        world.define("pickup", ("body", "anim", "lifetime", "item"))
+        self.world = world
+
+        self.score = 0
+        self.previous_potion_score = 0
+        self.previous_mana_score = 0
+        self.level_text = ""
+        self.level_text_timer = 0
+        self.tick_count = 0
+
+    def tick(self, keys, dt, mark=None):
+        """Advances the game by one fixed step with `keys` held
+
+        mark: optional mark(phase) called as each of TICK_PHASES ends (profiling)
+        """
+        player = self.player
+        ghosts = self.ghosts
+        world = self.world
+        wall_grid = self.wall_grid
+        flow_field = self.flow_field
+        boss_manager = self.boss_manager
+        bg_width, bg_height = self.bg_width, self.bg_height
+
+        self.tick_count += 1
+        player.taking_damage = False
+        player.recover_mana(dt)
+
+        # Spell unlock system
+        if self.score >= 100 and self.player_level.level == 1:
+            self.level_text = "Level 2 Unlocked: Lightning Spell!"
+            self.level_text_timer = 3
+            self.player_level.level_up()
+        elif self.score >= 200 and self.player_level.level == 2:
+            self.level_text = "Level 3 Unlocked: Shield Spell!"
+            self.level_text_timer = 3
+            self.player_level.level_up()
+
+        # Update systems
+        flow_field.update(*player.rect.center)
+        boss_manager.update(dt, self.score, player, ghosts, flow_field)
+        self.wave_manager.update(dt, ghosts, bg_width, bg_height)
+        if mark:
+            mark("waves_bosses")
+
+        # Update player with wall checking
+        player.update(keys, dt, wall_grid)
+
+        # Limit player to world boundaries
+        margin = 50
+        player.move_to(max(margin, min(player.pos.x, bg_width - player.rect.width - margin)),
+                       max(margin, min(player.pos.y, bg_height - player.rect.height - margin)))
+
+        if player.shield_cooldown > 0:
+            player.shield_cooldown -= dt
+        if mark:
+            mark("player")
+
+        flow_field.update(*player.rect.center)
+        ghosts.update(dt, player, flow_field)
+        self.enemy_projectiles.update(dt)
+        if mark:
+            mark("ghost_ai")
+
+        movement_system(world, dt)
+        animation_system(world, dt)
+        lifetime_system(world, dt)
+        world.flush()
+        if mark:
+            mark("effects")
+
+        # Collision phase: one spatial-hash pass, contact events resolved by the damage system
+        contacts = collision_system(world, self.collision_phase, player, ghosts,
+                                    boss_manager.active_bosses())
+        killed = damage_system(world, contacts, self.inventory)
+        world.flush()
+        if killed:
+            ghosts.remove_many(killed)
+            for _ in killed:
+                self.score += 10
+                self.player_progression.add_experience(10)
+                boss_manager.notify_ghost_killed()
+        # Contact damage for the whole horde and every enemy bullet, one vectorised pass each
+        ghosts.contact_damage(player)
+        self.enemy_projectiles.hit_test(player)
+        if mark:
+            mark("collisions")
+
+        pickup_items = world.archetypes["pickup"].columns["item"]
+        if self.score - self.previous_potion_score >= 100 and Potion.item_type not in pickup_items:
+            self.previous_potion_score = self.score
+            new_potion = wall_grid.find_free_spot(
+                Potion, (100, bg_width - 100), (100, bg_height - 100), stream(ITEMS))
+            if new_potion:
+                world.spawn("pickup", body=new_potion, anim=True,
+                            lifetime=Potion.lifetime, item=Potion.item_type)
+
+        if self.score - self.previous_mana_score >= 150 and ManaMushroom.item_type not in pickup_items:
+            self.previous_mana_score = self.score
+            new_mana = wall_grid.find_free_spot(
+                ManaMushroom, (100, bg_width - 100), (100, bg_height - 100), stream(ITEMS))
+            if new_mana:
+                world.spawn("pickup", body=new_mana, anim=True,
+                            lifetime=ManaMushroom.lifetime, item=ManaMushroom.item_type)
+
+        if self.level_text_timer > 0:
+            self.level_text_timer -= dt
+        if mark:
+            mark("items")
+
+    def handle_key(self, key):
+        """Applies one gameplay key press (GAME_KEYS); other keys are ignored"""
+        player = self.player
+        ghosts = self.ghosts
+        if key == pygame.K_SPACE:
+            direction = pygame.Vector2(1 if player.facing == "right" else -1, 0)
+            fireball = FIREBALL_POOL.acquire(player.rect.centerx, player.rect.centery, direction)
+            self.world.spawn("fireball", body=fireball, velocity=fireball.direction * Fireball.speed,
+                             lifetime=Fireball.lifetime)
+            player.start_shoot_animation(direction.x)
+        elif key == pygame.K_q and self.player_level.unlock_lightning and player.mana >= 20:
+            player.mana -= 20
+            struck = ghosts.within(player.rect.centerx, player.rect.centery, 150)
+            for ghost in struck:
+                self.world.spawn("lightning", body=LIGHTNING_POOL.acquire(ghost.rect.centerx, ghost.rect.centery),
+                                 anim=False)
+                self.score += 10
+                self.player_progression.add_experience(15)
+                self.boss_manager.notify_ghost_killed()
+            ghosts.remove_many(struck)
+            if struck:
+                player.start_shoot_animation(1 if player.facing == "right" else -1)
+        elif key == pygame.K_1:
+            if self.inventory.use_item("hilka"):
+                player.hp = min(player.max_hp, player.hp + 30)
+        elif key == pygame.K_2:
+            if self.inventory.use_item("mana"):
+                player.mana = min(player.max_mana, player.mana + 30)
+        elif key == pygame.K_e:
+            if self.player_level.unlock_shield and player.shield_cooldown <= 0:
+                player.shield.activate()
+                player.shield_cooldown = 15
+
+    @property
+    def game_over(self):
+        return self.player.hp <= 0
+
+    def counts(self):
+        """Live entity counts (headless peaks, HUD)"""
+        return {
+            "ghosts": len(self.ghosts),
+            "enemy_projectiles": len(self.enemy_projectiles),
+            "fireballs": self.world.count("fireball"),
+            "lightnings": self.world.count("lightning"),
+            "pickups": self.world.count("pickup"),
+            "bosses": len(self.boss_manager.active_bosses()),
+            "damage_numbers": len(self.player.damage_numbers),
+        }
+
+    def entity_census(self):
+        """Live entities per class name (memory overlay and leak report)"""
+        census = {"Player": 1}
+        census.update(self.ghosts.kind_counts())
+        for name in ("fireball", "lightning", "pickup"):
+            for body in self.world.archetypes[name].columns["body"]:
+                kind = type(body).__name__
+                census[kind] = census.get(kind, 0) + 1
+        for boss in self.boss_manager.active_bosses():
+            census[type(boss).__name__] = 1
+        census["DamageNumber"] = len(self.player.damage_numbers)
+        census["EnemyProjectile"] = len(self.enemy_projectiles)
+        return census
+
+    def activity(self):
+        """What is going on right now, as labels (frame log hitch attribution)"""
+        labels = []
+        manager = self.boss_manager
+        if manager.last_spawned and manager.since_spawn < 1.0:
+            labels.append(f"{manager.last_spawned} spawn")
+        pepe = manager.boss_pepe
+        if pepe and pepe.active and pepe.summoning:
+            labels.append("BossPepe summon")
+        strong = manager.boss_strong
+        if strong and strong.active and strong.rage_mode:
+            labels.append("BossStrong rage")
+        waves = self.wave_manager
+        if waves.wave_number > 1 and waves.wave_timer < 1.0:
+            labels.append(f"wave {waves.wave_number} start")
+        return labels
+
+    def state_hash(self):
+        """crc32 of the simulated state: player, score, bosses, ECS entities, ghost and bullet arrays"""
+        player = self.player
+        head = [self.tick_count, self.score, player.pos.x, player.pos.y, player.hp, player.mana,
+                self.wave_manager.wave_number, self.player_progression.experience]
+        for boss in self.boss_manager.active_bosses():
+            head.extend((boss.pos.x, boss.pos.y, getattr(boss, "hp", 0)))
+        for name in ("fireball", "lightning", "pickup"):
+            head.append(self.world.count(name))
+        crc = zlib.crc32(repr(head).encode())
+        # Позиции и время жизни сущностей ECS (огнешары, молнии, предметы)
+        for name in ("fireball", "lightning", "pickup"):
+            columns = self.world.archetypes[name].columns
+            bodies = columns["body"]
+            crc = zlib.crc32(np.array([body.rect.topleft for body in bodies], dtype=np.int64), crc)
+            if "velocity" in columns:
+                crc = zlib.crc32(np.array([tuple(body.pos) for body in bodies], dtype=np.float64), crc)
+            if "lifetime" in columns:
+                crc = zlib.crc32(np.array(columns["lifetime"], dtype=np.float64), crc)
+        ghosts = self.ghosts
+        for name in GHOST_FIELDS:
+            crc = zlib.crc32(np.ascontiguousarray(getattr(ghosts, name)[:ghosts.count]), crc)
+        bullets = self.enemy_projectiles
+        for name in PROJECTILE_FIELDS:
+            crc = zlib.crc32(np.ascontiguousarray(getattr(bullets, name)[:bullets.count]), crc)
+        return crc
+
+    def snapshot(self):
+        """Full copy of the game state, RNG streams included (see restore)"""
+        shared = (self.wall_grid, self.flow_field, self.collision_phase)
+        copy = snapshot.clone(self, shared)
+        copy.world.reindex()
+        return copy, rng.STREAMS.getstate()
+
+    @staticmethod
+    def restore(state):
+        """Session from a snapshot(); the snapshot stays usable for another restore
+
+        The restored session replaces the running one: the pools forget the
+        objects it had out and count the restored copies as handed out instead.
+        """
+        session, streams = state
+        rng.STREAMS.setstate(streams)
+        session = snapshot.clone(session, (session.wall_grid, session.flow_field, session.collision_phase))
+        session.world.reindex()
+        reset_pools()
+        FIREBALL_POOL.adopt(session.world.archetypes["fireball"].columns["body"])
+        LIGHTNING_POOL.adopt(session.world.archetypes["lightning"].columns["body"])
+        DAMAGE_NUMBER_POOL.adopt(session.player.damage_numbers)
+        return session
+
+    def draw(self, screen, camera_offset, alpha, interface=None):
+        """World layer of a frame (the HUD stays in the game loop)"""
+        self.player.draw(screen, camera_offset, alpha)
+        self.boss_manager.draw(screen, camera_offset, alpha, interface)
+        self.ghosts.draw(screen, camera_offset, alpha)
+        self.enemy_projectiles.draw(screen, camera_offset, alpha)
+        render_system(self.world, screen, camera_offset, alpha)
+
+    @tracing.traced("hud")
+    def draw_hud(self, screen, interface, font, fps=0, paused=False):
+        """HUD over the world: bars, inventory, score, wave, stats, FPS, help, unlock text"""
+        interface.draw(screen, self.player)
+        self.inventory.draw(screen)
+
+        # UI information
+        score_text = render_text(font, f"{self.score}", (250, 235, 255))
+        screen.blit(score_text, (140, 95))
+
+        # Wave information
+        if not paused:
+            wave_manager = self.wave_manager
+            time_until_next_wave = wave_manager.wave_duration - wave_manager.wave_timer
+            interface.draw_wave_info(screen, wave_manager.wave_number,
+                                     wave_manager.ghosts_spawned_this_wave,
+                                     wave_manager.ghosts_in_wave,
+                                     time_until_next_wave)
+
+        # Player statistics
+        player_progression = self.player_progression
+        interface.draw_player_stats(screen, player_progression.level,
+                                    player_progression.experience,
+                                    player_progression.exp_for_next_level)
+
+        # Show FPS if enabled
+        if config.SHOW_FPS:
+            interface.draw_fps_counter(screen, fps)
+
+        # Show controls if enabled
+        if config.SHOW_CONTROLS:
+            interface.draw_controls_help(screen)
+
+        if self.level_text_timer > 0:
+            level_font = safe_font(12)
+            level_surf = render_text(level_font, self.level_text, (255, 255, 0))
+            level_rect = level_surf.get_rect(center=(screen.get_width() // 2, 50))
+            screen.blit(level_surf, level_rect)
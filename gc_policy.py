@@ -0,0 +1,161 @@
+# gc_policy.py - keeps garbage collector pauses out of the fight (--gc-policy managed|default)
+#
+# "managed" (the default):
+#   * at game start, after assets, pools and the session are built: one full
+#     collect, then gc.freeze() - everything loaded so far moves to the
+#     permanent generation and is never scanned again;
+#   * during play the thresholds are raised (GAMEPLAY_THRESHOLDS): young
+#     collections get rarer and gen 2 only runs when we ask for it;
+#   * explicit collections at natural pauses - a new wave (gen 1), opening
+#     the pause menu and game over (full) - requested during the frame and run
+#     after the flip, so they never delay a frame that is being shown;
+#   * when the game ends the thresholds go back and the frozen objects are
+#     released (gc.unfreeze), so the finished session can be collected.
+# "default" keeps CPython's settings and only measures.
+#
+# Either way a gc.callbacks hook times every collection, and each frame gets
+# the net number of new GC-tracked objects (gen 0 count delta: what drives
+# collections), the collections that ran and their total pause. Pause
+# percentiles cover the collections CPython starts by itself during play
+# (enter_game..leave_game) - the ones that can land mid-frame; explicit ones
+# are counted apart, and the collect before freeze() runs while the game is
+# still loading (load_ms).
+import gc
+import time
+
+DEFAULT_THRESHOLDS = gc.get_threshold()
+GAMEPLAY_THRESHOLDS = (20000, 50, 1000)
+PAUSE_HISTORY = 1024   # последних пауз сборщика для перцентилей
+MODES = ("managed", "default")
+
+# Что собирать на естественной паузе: поколение
+NATURAL_PAUSES = {"wave": 1, "pause_menu": 2, "game_over": 2}
+
+
+class GcPolicy:
+    def __init__(self, mode="managed"):
+        if mode not in MODES:
+            raise ValueError(f"unknown gc policy: {mode}")
+        self.mode = mode
+        self.pending = None          # поколение запрошенной сборки
+        self.in_game = False
+
+        self.started = 0.0
+        self.pauses = [0.0] * PAUSE_HISTORY   # мс, кольцо
+        self.pause_index = 0
+        self.collections = [0, 0, 0]          # по поколениям, с момента создания
+        self.explicit = 0
+        self.max_pause = 0.0
+        self.total_pause = 0.0
+        self.load_pause = 0.0
+        self.explicit_max = 0.0
+        self.explicit_collect = False
+
+        # Текущий кадр
+        self.frame_pause = 0.0
+        self.frame_collections = 0
+        self.frame_generation = -1
+        self.count_start = gc.get_count()[0]
+        self.count_carry = 0
+        gc.callbacks.append(self._on_gc)
+
+    def close(self):
+        self.leave_game()
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+    # --- измерение ---
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self.started = time.perf_counter()
+            # Счетчик поколения 0 обнулится: запоминаем накопленное за кадр
+            self.count_carry += gc.get_count()[0] - self.count_start
+            self.count_start = 0
+            return
+        pause = (time.perf_counter() - self.started) * 1000
+        generation = info["generation"]
+        self.collections[generation] += 1
+        if not self.in_game:
+            self.load_pause = max(self.load_pause, pause)
+            return
+        if self.explicit_collect:
+            self.explicit += 1
+            self.explicit_max = max(self.explicit_max, pause)
+        else:
+            # Сборки, которые CPython запустил сам посреди кадра
+            self.pauses[self.pause_index % PAUSE_HISTORY] = pause
+            self.pause_index += 1
+            self.max_pause = max(self.max_pause, pause)
+        self.total_pause += pause
+        self.frame_pause += pause
+        self.frame_collections += 1
+        self.frame_generation = max(self.frame_generation, generation)
+
+    def end_frame(self):
+        """Runs a requested collection, then returns this frame's
+        (net new tracked objects, collections, pause ms, highest generation or -1)"""
+        if self.pending is not None:
+            self.collect(self.pending)
+        count = gc.get_count()[0]
+        stats = (self.count_carry + count - self.count_start, self.frame_collections,
+                 self.frame_pause, self.frame_generation)
+        self.count_start = count
+        self.count_carry = 0
+        self.frame_pause = 0.0
+        self.frame_collections = 0
+        self.frame_generation = -1
+        return stats
+
+    def pause_percentiles(self):
+        """(p50, p99, max) of the recent automatic in-game collection pauses in ms"""
+        n = min(self.pause_index, PAUSE_HISTORY)
+        if not n:
+            return 0.0, 0.0, 0.0
+        recent = sorted(self.pauses[:n])
+        return recent[n // 2], recent[min(n - 1, int(n * 0.99))], recent[-1]
+
+    def summary(self):
+        p50, p99, _ = self.pause_percentiles()
+        return {"mode": self.mode, "collections": list(self.collections),
+                "automatic": self.pause_index, "pause_ms_p50": round(p50, 3),
+                "pause_ms_p99": round(p99, 3), "pause_ms_max": round(self.max_pause, 3),
+                "explicit": self.explicit, "explicit_ms_max": round(self.explicit_max, 3),
+                "pause_ms_total": round(self.total_pause, 2), "load_ms": round(self.load_pause, 3)}
+
+    # --- политика ---
+
+    def collect(self, generation=2):
+        self.pending = None
+        self.explicit_collect = True
+        try:
+            gc.collect(generation)
+        finally:
+            self.explicit_collect = False
+
+    def enter_game(self):
+        """Game start: assets and the session are built"""
+        if self.mode == "managed":
+            self.collect(2)
+            gc.freeze()
+            gc.set_threshold(*GAMEPLAY_THRESHOLDS)
+            print(f"GC: {gc.get_freeze_count()} objects frozen, thresholds {GAMEPLAY_THRESHOLDS}")
+        self.in_game = True
+        self.end_frame()   # аллокации загрузки - не первый кадр
+
+    def leave_game(self):
+        """Game over / back to the menu: stock thresholds, the session may be collected"""
+        if not self.in_game:
+            return
+        self.in_game = False
+        if self.mode == "managed":
+            gc.set_threshold(*DEFAULT_THRESHOLDS)
+            gc.unfreeze()
+
+    def natural_pause(self, reason):
+        """Asks for a collection after this frame (reason: a NATURAL_PAUSES key)"""
+        if self.mode != "managed":
+            return
+        generation = NATURAL_PAUSES[reason]
+        if self.pending is None or generation > self.pending:
+            self.pending = generation
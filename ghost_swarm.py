@@ -0,0 +1,341 @@
+# ghost_swarm.py - the whole ghost horde as NumPy arrays (struct of arrays)
+#
+# Ghost / TankGhost / ShooterGhost objects are only spawn descriptions now:
+# GhostSwarm.append() copies their state into arrays and keeps a GhostView per
+# ghost. Seek movement, cooldowns, animation and contact damage run as a few
+# vectorised passes over the arrays; views carry the synced Rect for the
+# collision phase. Shooters fire into a shared ProjectileBuffer, so their
+# bullets outlive them.
+import numpy as np
+from enemy_projectiles import ProjectileBuffer
+
+SPAWN = 0
+IDLE = 1
+
+# Массивы роя: имя -> dtype
+FIELDS = {
+    "x": np.float64, "y": np.float64,          # левый верхний угол (дробный)
+    "prev_x": np.float64, "prev_y": np.float64,  # позиция на прошлом тике (интерполяция)
+    "w": np.int64, "h": np.int64,
+    "speed": np.float64,
+    "attack_range": np.float64,                # стрелки останавливаются на этой дистанции
+    "active": np.bool_,
+    "hp": np.int64,
+    "cooldown": np.float64,                    # перезарядка урона касанием
+    "touch_damage": np.int64,
+    "touch_cooldown": np.float64,
+    "shoots": np.bool_,
+    "shoot_cooldown": np.float64,
+    "shoot_interval": np.float64,
+    "shot_speed": np.float64,
+    "shot_damage": np.int64,
+    "shot_sprite": np.int64,                   # индекс спрайта урона в буфере снарядов
+    "kind": np.int64,
+    "anim": np.int64,
+    "frame": np.int64,
+    "anim_timer": np.float64,
+    "anim_speed": np.float64,
+    "spawn_count": np.int64,
+    "idle_count": np.int64,
+}
+
+
+class GhostView:
+    """One ghost of the swarm: a Rect plus accessors into the swarm arrays"""
+
+    __slots__ = ("swarm", "slot", "rect", "kind_class")
+
+    def __init__(self, swarm, slot, rect, source):
+        self.swarm = swarm
+        self.slot = slot
+        self.rect = rect
+        self.kind_class = type(source)
+
+    @property
+    def hp(self):
+        return int(self.swarm.hp[self.slot])
+
+    @hp.setter
+    def hp(self, value):
+        self.swarm.hp[self.slot] = value
+
+    @property
+    def active(self):
+        return bool(self.swarm.active[self.slot])
+
+    @property
+    def attack_cooldown(self):
+        return float(self.swarm.cooldown[self.slot])
+
+    def draw(self, surface, camera_offset, alpha=1.0):
+        swarm = self.swarm
+        slot = self.slot
+        x = swarm.prev_x[slot] + (swarm.x[slot] - swarm.prev_x[slot]) * alpha
+        y = swarm.prev_y[slot] + (swarm.y[slot] - swarm.prev_y[slot]) * alpha
+        surface.blit(swarm.frame_for(slot), (x - camera_offset.x, y - camera_offset.y))
+
+
+class GhostSwarm:
+    """List-like container of ghosts backed by NumPy arrays.
+
+    Supports what the game loop and the bosses do with the old ghost list:
+    append(Ghost(...)), iteration, len, `in`, slicing, remove().
+    """
+
+    def __init__(self, capacity=64, projectiles=None):
+        self.count = 0
+        self.projectiles = projectiles if projectiles is not None else ProjectileBuffer()
+        self.capacity = 0
+        self.views = []
+        self.kinds = []        # (spawn_frames, idle_frames) по номеру вида
+        self._kind_ids = {}    # класс призрака -> номер вида
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        for name, dtype in FIELDS.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if self.capacity:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def _kind_id(self, ghost):
+        cls = type(ghost)
+        kind = self._kind_ids.get(cls)
+        if kind is None:
+            idle = ghost.idle_frames
+            spawn = ghost.spawn_frames
+            kind = len(self.kinds)
+            self.kinds.append((idle if spawn is None else spawn, idle))
+            self._kind_ids[cls] = kind
+        return kind
+
+    # --- list interface ---
+
+    def append(self, ghost):
+        """Spawns a ghost from a Ghost / TankGhost / ShooterGhost description, returns its view"""
+        if self.count == self.capacity:
+            self._grow(self.capacity * 2)
+        i = self.count
+        kind = self._kind_id(ghost)
+        spawn_frames, idle_frames = self.kinds[kind]
+        rect = ghost.rect.copy()
+        # Призрак с анимацией призыва включается, когда она доиграет
+        spawning = ghost.spawn_frames is not None
+
+        self.x[i] = self.prev_x[i] = rect.x
+        self.y[i] = self.prev_y[i] = rect.y
+        self.w[i] = rect.w
+        self.h[i] = rect.h
+        self.speed[i] = ghost.speed
+        self.attack_range[i] = getattr(ghost, "attack_range", 0)
+        self.active[i] = not spawning
+        self.hp[i] = ghost.hp
+        self.cooldown[i] = 0
+        self.touch_damage[i] = ghost.contact_damage
+        self.touch_cooldown[i] = ghost.contact_cooldown
+        self.shoots[i] = ghost.shoot_interval > 0
+        self.shoot_cooldown[i] = 0
+        self.shoot_interval[i] = ghost.shoot_interval
+        self.shot_speed[i] = getattr(ghost, "projectile_speed", 0)
+        self.shot_damage[i] = getattr(ghost, "projectile_damage", 0)
+        self.shot_sprite[i] = self.projectiles.sprite_id(getattr(ghost, "projectile_sprite", "1HP.png"))
+        self.kind[i] = kind
+        self.anim[i] = SPAWN if spawning else IDLE
+        self.frame[i] = 0
+        self.anim_timer[i] = 0
+        self.anim_speed[i] = ghost.animation_speed
+        self.spawn_count[i] = len(spawn_frames)
+        self.idle_count[i] = len(idle_frames)
+
+        view = GhostView(self, i, rect, ghost)
+        self.views.append(view)
+        self.count += 1
+        return view
+
+    def remove(self, view):
+        if view not in self:
+            raise ValueError("ghost is not in the swarm")
+        self._swap_remove(view.slot)
+
+    def remove_many(self, views):
+        # С конца: переносимый последний элемент никогда не стоит в очереди на удаление
+        for slot in sorted((v.slot for v in views if v in self), reverse=True):
+            self._swap_remove(slot)
+
+    def _swap_remove(self, slot):
+        last = self.count - 1
+        removed = self.views[slot]
+        if slot != last:
+            for name in FIELDS:
+                array = getattr(self, name)
+                array[slot] = array[last]
+            moved = self.views[last]
+            moved.slot = slot
+            self.views[slot] = moved
+        self.views.pop()
+        self.count -= 1
+        removed.swarm = None
+        removed.slot = -1
+
+    def clear(self):
+        for view in self.views:
+            view.swarm = None
+            view.slot = -1
+        self.views = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def kind_counts(self):
+        """{ghost class name: live count}"""
+        counts = np.bincount(self.kind[:self.count], minlength=len(self.kinds))
+        return {cls.__name__: int(counts[kind]) for cls, kind in self._kind_ids.items()}
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def __getitem__(self, index):
+        return self.views[index]
+
+    def __contains__(self, view):
+        return getattr(view, "swarm", None) is self and 0 <= view.slot < self.count
+
+    # --- simulation ---
+
+    def update(self, dt, player, flow=None):
+        """One tick; with a FlowField ghosts path around walls instead of seeking straight"""
+        n = self.count
+        if not n:
+            return
+
+        # Анимация: появление -> бездействие (после появления призрак становится активным)
+        timer = self.anim_timer[:n]
+        timer += dt
+        tick = timer >= self.anim_speed[:n]
+        if tick.any():
+            timer[tick] = 0
+            frame = self.frame[:n]
+            frame[tick] += 1
+            spawning = self.anim[:n] == SPAWN
+            done = tick & spawning & (frame >= self.spawn_count[:n])
+            self.anim[:n][done] = IDLE
+            frame[done] = 0
+            self.active[:n][done] = True
+            idle = tick & ~spawning
+            frame[idle] %= self.idle_count[:n][idle]
+
+        cooldown = self.cooldown[:n]
+        np.subtract(cooldown, dt, out=cooldown, where=cooldown > 0)
+
+        # Движение к игроку (от центра прямоугольника, как раньше)
+        x = self.x[:n]
+        y = self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        w = self.w[:n]
+        h = self.h[:n]
+        cx = np.rint(x) + w // 2
+        cy = np.rint(y) + h // 2
+        px, py = player.rect.center
+        dx = px - cx
+        dy = py - cy
+        dist = np.hypot(dx, dy)
+        if flow is not None:
+            # Направление берем из клетки поля; дистанция для стрельбы - по прямой
+            tx, ty = flow.steer_many(cx, cy, px, py)
+            sx = tx - cx
+            sy = ty - cy
+            sdist = np.hypot(sx, sy)
+        else:
+            sx, sy, sdist = dx, dy, dist
+        move = self.active[:n] & (dist > self.attack_range[:n]) & (sdist > 0)
+        step = np.divide(self.speed[:n] * dt, sdist, out=np.zeros(n), where=move)
+        x += sx * step
+        y += sy * step
+
+        # Стрелки: перезарядка, затем выстрел, если игрок в радиусе
+        shoot_cooldown = self.shoot_cooldown[:n]
+        cooling = shoot_cooldown > 0
+        ready = self.shoots[:n] & ~cooling & (dist <= self.attack_range[:n]) & (dist > 0)
+        np.subtract(shoot_cooldown, dt, out=shoot_cooldown, where=cooling)
+        shoot_cooldown[ready] = self.shoot_interval[:n][ready]
+
+        self.sync_rects()
+
+        # Выстрел из центра (после движения) в сторону игрока - одной пачкой
+        if ready.any():
+            self.projectiles.spawn_many(np.rint(x[ready]) + w[ready] // 2, np.rint(y[ready]) + h[ready] // 2,
+                                        dx[ready], dy[ready], self.shot_speed[:n][ready],
+                                        self.shot_damage[:n][ready], self.shot_sprite[:n][ready])
+
+    def sync_rects(self):
+        """Writes the float positions back into each view's Rect"""
+        n = self.count
+        xs = np.rint(self.x[:n]).astype(np.int64).tolist()
+        ys = np.rint(self.y[:n]).astype(np.int64).tolist()
+        for view, x, y in zip(self.views, xs, ys):
+            view.rect.topleft = (x, y)
+
+    def contact_damage(self, player):
+        """Touch damage from every overlapping ghost whose cooldown is ready"""
+        n = self.count
+        if not n:
+            return 0
+        r = player.rect
+        x = np.rint(self.x[:n])
+        y = np.rint(self.y[:n])
+        hit = (
+            (x < r.right) & (x + self.w[:n] > r.left) &
+            (y < r.bottom) & (y + self.h[:n] > r.top) &
+            self.active[:n] & (self.cooldown[:n] <= 0) & (self.touch_damage[:n] > 0)
+        )
+        hits = np.flatnonzero(hit).tolist()
+        for i in hits:
+            player.take_damage(int(self.touch_damage[i]))
+        if hits:
+            self.cooldown[:n][hit] = self.touch_cooldown[:n][hit]
+        return len(hits)
+
+    def within(self, x, y, radius):
+        """Views of the ghosts whose rect centre is closer than radius to (x, y)"""
+        n = self.count
+        if not n:
+            return []
+        cx = np.rint(self.x[:n]) + self.w[:n] // 2
+        cy = np.rint(self.y[:n]) + self.h[:n] // 2
+        near = np.hypot(cx - x, cy - y) < radius
+        views = self.views
+        return [views[i] for i in np.flatnonzero(near).tolist()]
+
+    # --- drawing ---
+
+    def frame_for(self, slot):
+        spawn_frames, idle_frames = self.kinds[self.kind[slot]]
+        if self.anim[slot] == SPAWN:
+            return spawn_frames[min(int(self.frame[slot]), len(spawn_frames) - 1)]
+        return idle_frames[self.frame[slot]]
+
+    def draw(self, surface, camera_offset, alpha=1.0):
+        """Blits every on-screen ghost in one Surface.blits call"""
+        n = self.count
+        if not n:
+            return
+        prev_x = self.prev_x[:n]
+        prev_y = self.prev_y[:n]
+        sx = prev_x + (self.x[:n] - prev_x) * alpha - camera_offset.x
+        sy = prev_y + (self.y[:n] - prev_y) * alpha - camera_offset.y
+        width, height = surface.get_size()
+        visible = (sx < width) & (sx + self.w[:n] > 0) & (sy < height) & (sy + self.h[:n] > 0)
+
+        index = np.flatnonzero(visible)
+        kinds = self.kinds
+        blits = []
+        for kind, anim, frame, x, y in zip(self.kind[index].tolist(), self.anim[index].tolist(),
+                                           self.frame[index].tolist(), sx[index].tolist(), sy[index].tolist()):
+            frames = kinds[kind][anim]
+            if frame >= len(frames):
+                frame = len(frames) - 1
+            blits.append((frames[frame], (x, y)))
+        surface.blits(blits, doreturn=False)
@@ -0,0 +1,147 @@
+# headless.py - max-speed simulation runs without a window
+#
+#   python main.py --headless --ticks 100000 --seed 42 [--bot kite|random]
+#
+# start_game_loop(screen, clock, headless=run) then takes its input from a
+# bot instead of the keyboard, runs exactly one fixed tick per loop pass with
+# no frame cap and skips drawing. When the player dies the next game starts,
+# until the tick budget is spent; the run ends with a JSON summary.
+import random
+import time
+
+import pygame
+
+WORLD_CENTER = (600, 600)
+
+
+class BotKeys:
+    """Stand-in for pygame.key.get_pressed(): only the held keys are True"""
+
+    def __init__(self):
+        self.held = set()
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+class BotInput:
+    """Seeded scripted player.
+
+    "kite"   keeps away from the nearest ghost vertically, turns to face it
+             horizontally and keeps casting (balance runs);
+    "random" holds a random direction for a while and casts at random (soak).
+    """
+
+    def __init__(self, mode="kite", seed=0):
+        if mode not in ("kite", "random"):
+            raise ValueError(f"unknown bot mode: {mode}")
+        self.mode = mode
+        self.rng = random.Random(seed)
+        self.keys = BotKeys()
+        self.fire_timer = 0.0
+        self.move_timer = 0.0
+
+    def poll(self, dt, player, ghosts, player_level, inventory):
+        """Returns (keys, events) for the coming loop pass"""
+        rng = self.rng
+        held = self.keys.held
+        events = []
+        self.fire_timer -= dt
+        self.move_timer -= dt
+        px, py = player.rect.center
+
+        nearest = None
+        best = None
+        for ghost in ghosts:
+            gx, gy = ghost.rect.center
+            d = (gx - px) ** 2 + (gy - py) ** 2
+            if best is None or d < best:
+                nearest, best = ghost, d
+
+        if self.mode == "random":
+            if self.move_timer <= 0:
+                self.move_timer = rng.uniform(0.2, 1.0)
+                held.clear()
+                held.update(rng.sample((pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d), rng.randint(0, 2)))
+            fire = rng.random() < 0.1
+        else:
+            held.clear()
+            if nearest is not None:
+                gx, gy = nearest.rect.center
+                held.add(pygame.K_s if gy < py else pygame.K_w)
+                # По горизонтали: к цели, чтобы огнешар летел в нее; вплотную - отходим
+                toward = pygame.K_d if gx > px else pygame.K_a
+                away = pygame.K_a if gx > px else pygame.K_d
+                held.add(toward if best > 120 ** 2 else away)
+            else:
+                cx, cy = WORLD_CENTER
+                if abs(cx - px) > 40:
+                    held.add(pygame.K_d if cx > px else pygame.K_a)
+                if abs(cy - py) > 40:
+                    held.add(pygame.K_s if cy > py else pygame.K_w)
+            fire = nearest is not None and self.fire_timer <= 0
+        if fire:
+            self.fire_timer = 0.25
+            events.append(_key_event(pygame.K_SPACE))
+
+        if player_level.unlock_lightning and player.mana >= 20 and best is not None and best < 150 ** 2:
+            events.append(_key_event(pygame.K_q))
+        if player_level.unlock_shield and player.shield_cooldown <= 0 and player.hp < player.max_hp * 0.6:
+            events.append(_key_event(pygame.K_e))
+        if player.hp < player.max_hp * 0.4 and inventory.item_counts.get("hilka", 0):
+            events.append(_key_event(pygame.K_1))
+        if player.mana < 20 and inventory.item_counts.get("mana", 0):
+            events.append(_key_event(pygame.K_2))
+        return self.keys, events
+
+
+def _key_event(key):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0)
+
+
+class HeadlessRun:
+    """Tick budget, bot input and the numbers for the final summary"""
+
+    def __init__(self, ticks, seed=0, bot="kite"):
+        self.max_ticks = ticks
+        self.seed = seed
+        self.bot = BotInput(bot, seed)
+        self.ticks = 0
+        self.games = []
+        self.game_ticks = 0
+        self.peaks = {}
+        self.started = time.perf_counter()
+
+    def done(self):
+        return self.ticks >= self.max_ticks
+
+    def tick(self, counts):
+        """Called once per simulated tick with the live entity counts"""
+        self.ticks += 1
+        self.game_ticks += 1
+        peaks = self.peaks
+        for name, value in counts.items():
+            if value > peaks.get(name, 0):
+                peaks[name] = value
+
+    def end_game(self, score, level, wave, died):
+        self.games.append({"score": score, "level": level, "wave": wave,
+                           "ticks": self.game_ticks, "died": died})
+        self.game_ticks = 0
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        last = self.games[-1] if self.games else {"score": 0, "level": 1, "wave": 1}
+        return {
+            "seed": self.seed,
+            "bot": self.bot.mode,
+            "ticks": self.ticks,
+            "seconds": round(elapsed, 3),
+            "ticks_per_second": round(self.ticks / elapsed, 1) if elapsed else None,
+            "score": last["score"],
+            "wave": last["wave"],
+            "level": last["level"],
+            "best_score": max((g["score"] for g in self.games), default=0),
+            "games": self.games,
+            "peak_entities": self.peaks,
+        }
@@ -1,4 +1,5 @@
-from safe_loader import safe_load_image, safe_font
+from safe_loader import safe_load_image, safe_font, render_text
+from memory_accountant import track
 import pygame
 
 class Interface:
@@ -14,6 +15,7 @@ class Interface:
             (int(self.interface_img.get_width() * interface_scale), 
              int(self.interface_img.get_height() * interface_scale))
         )
+        track(self.interface_img, "hud", "interface")
 
         # Загрузка кадров полосы здоровья
         health_sheet = safe_load_image("assets/healthsheet.png")
@@ -23,6 +25,7 @@ class Interface:
             (int(health_sheet.get_width() * health_scale), 
              int(health_sheet.get_height() * health_scale))
         )
+        track(health_sheet, "hud", "interface")
         
         frame_width = health_sheet.get_width() // 9
         frame_height = health_sheet.get_height()
@@ -39,6 +42,7 @@ class Interface:
             (int(mana_sheet.get_width() * mana_scale), 
              int(mana_sheet.get_height() * mana_scale))
         )
+        track(mana_sheet, "hud", "interface")
         
         mana_frame_width = mana_sheet.get_width() // 9
         mana_frame_height = mana_sheet.get_height()
@@ -107,8 +111,8 @@ class Interface:
             wave_text = f"Wave {wave_number}: {ghosts_spawned}/{total_ghosts}"
             time_text = f"Next wave: {int(time_left)}s"
             
-            wave_surface = font.render(wave_text, True, (255, 255, 255))
-            time_surface = font.render(time_text, True, (200, 200, 255))
+            wave_surface = render_text(font, wave_text, (255, 255, 255))
+            time_surface = render_text(font, time_text, (200, 200, 255))
             
             # Позиция в левом нижнем углу
             wave_x = 10
@@ -129,8 +133,8 @@ class Interface:
             level_text = f"Level: {level}"
             exp_text = f"EXP: {experience}/{exp_needed}"
             
-            level_surface = font.render(level_text, True, (255, 255, 255))
-            exp_surface = font.render(exp_text, True, (100, 255, 100))
+            level_surface = render_text(font, level_text, (255, 255, 255))
+            exp_surface = render_text(font, exp_text, (100, 255, 100))
             
             # Позиция в правом верхнем углу
             level_x = surface.get_width() - level_surface.get_width() - 10
@@ -172,7 +176,7 @@ class Interface:
         try:
             font = safe_font(8)
             fps_text = f"FPS: {int(fps)}"
-            fps_surface = font.render(fps_text, True, (150, 150, 150))
+            fps_surface = render_text(font, fps_text, (150, 150, 150))
             
             surface.blit(fps_surface, (surface.get_width() - 80, surface.get_height() - 20))
             
@@ -195,7 +199,7 @@ class Interface:
             start_y = self.interface_y + self.interface_img.get_height() + 10
             
             for i, control in enumerate(controls):
-                control_surface = font.render(control, True, (200, 200, 200))
+                control_surface = render_text(font, control, (200, 200, 200))
                 surface.blit(control_surface, (self.interface_x, start_y + i * 15))
                 
         except Exception as e:
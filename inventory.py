@@ -1,15 +1,16 @@
 import pygame
-from safe_loader import safe_load_image, safe_font
+from safe_loader import safe_load_image, safe_font, render_text
+from animation import AnimationSet
+from memory_accountant import track, track_all
 
 class AnimatedIcon:
     def __init__(self, path, frame_count, frame_width, frame_height, scale=1):
-        self.sheet = safe_load_image(path, (frame_width * frame_count, frame_height))
-        self.frames = [
-            pygame.transform.scale(
-                self.sheet.subsurface(pygame.Rect(i * frame_width, 0, frame_width, frame_height)),
-                (frame_width * scale, frame_height * scale)
-            ) for i in range(frame_count)
-        ]
+        self.frames = (
+            AnimationSet(scale)
+            .add("idle", path, frame_count, frame_width, frame_height, directional=False)
+            .frames("idle")
+        )
+        track_all(self.frames, "hud", "inventory")
         self.index = 0
         self.timer = 0
         self.speed = 0.15
@@ -31,13 +32,13 @@ class Inventory:
         self.frame_height = 128
         self.frame_count = 5
 
-        sheet = safe_load_image("assets/invent.png", (self.frame_width * self.frame_count, self.frame_height))
-        self.frames = [
-            pygame.transform.scale(
-                sheet.subsurface(pygame.Rect(i * self.frame_width, 0, self.frame_width, self.frame_height)),
-                (self.frame_width * scale, self.frame_height * scale)
-            ) for i in range(self.frame_count)
-        ]
+        self.frames = (
+            AnimationSet(scale)
+            .add("idle", "assets/invent.png", self.frame_count, self.frame_width, self.frame_height,
+                 directional=False)
+            .frames("idle")
+        )
+        track_all(self.frames, "hud", "inventory")
 
         self.timer = 0
         self.index = 0
@@ -98,7 +99,8 @@ class Inventory:
         # Создаем простую иконку
         class FallbackIcon:
             def __init__(self, color, scale):
-                self.frame = pygame.Surface((int(128 * 0.9 * scale), int(128 * 0.9 * scale)), pygame.SRCALPHA)
+                self.frame = track(pygame.Surface((int(128 * 0.9 * scale), int(128 * 0.9 * scale)), pygame.SRCALPHA),
+                                   "hud", "inventory")
                 pygame.draw.circle(self.frame, color, 
                                  (int(64 * 0.9 * scale), int(64 * 0.9 * scale)), 
                                  int(32 * 0.9 * scale))
@@ -167,7 +169,7 @@ class Inventory:
                             text_y = iy + 175
 
                             for j, digit in enumerate(value):
-                                digit_surface = font.render(digit, True, (255, 255, 255))
+                                digit_surface = render_text(font, digit, (255, 255, 255))
                                 surface.blit(digit_surface, (start_x + j * spacing, text_y))
                         except Exception as e:
                             print(f"Error rendering item count: {e}")
\ No newline at end of file
@@ -1,30 +1,29 @@
-from safe_loader import safe_load_image, safe_font
-import pygame
+from safe_loader import load_frames
+from pool import Pool
 
 class LightningSpell:
+    """ECS body of a lightning strike: animation_system plays it once and
+    destroys the entity after the last frame"""
+    __slots__ = ("frames", "rect", "frame_index", "timer")
+
+    animation_speed = 0.1
+
     def __init__(self, x, y):
-        self.sheet = safe_load_image("assets/Sprite-sheet.png")
-        self.frames = [
-            self.sheet.subsurface(pygame.Rect(i * 256, 0, 256, 128))
-            for i in range(4)
-        ]
+        self.frames = load_frames("assets/Sprite-sheet.png", 4, 256, 128, owner="LightningSpell")
+        self.rect = self.frames[0].get_rect()
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Re-initialises a pooled effect in place"""
         self.frame_index = 0
-        self.animation_speed = 0.1
         self.timer = 0
-        self.finished = False
-        self.rect = self.frames[0].get_rect(center=(x, y))
+        self.rect.center = (x, y)
+
+    def draw(self, surface, camera_offset, alpha=1.0):
+        frame = self.frames[self.frame_index]
+        draw_x = self.rect.x - camera_offset.x
+        draw_y = self.rect.y - camera_offset.y
+        surface.blit(frame, (draw_x, draw_y))
 
-    def update(self, dt):
-        self.timer += dt
-        if self.timer >= self.animation_speed:
-            self.timer = 0
-            self.frame_index += 1
-            if self.frame_index >= len(self.frames):
-                self.finished = True
 
-    def draw(self, surface, camera_offset):
-        if not self.finished:
-            frame = self.frames[self.frame_index]
-            draw_x = self.rect.x - camera_offset.x
-            draw_y = self.rect.y - camera_offset.y
-            surface.blit(frame, (draw_x, draw_y))
+LIGHTNING_POOL = Pool("lightning", lambda: LightningSpell(0, 0), prewarm=16)
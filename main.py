@@ -1,27 +1,33 @@
 # main.py - Complete game with menu integration, high scores and FIXED pause system
 import pygame
 import json
-import random
 import sys
-from player import Player
-from ghost import Ghost
-from fireball import Fireball
-from potion import Potion
-from tank_ghost import TankGhost
-from shooter_ghost import ShooterGhost
-from lightning_spell import LightningSpell
 from interface import Interface
-from manamushroom import ManaMushroom
-from inventory import Inventory
-from shield_spell import PlayerLevel
-from boss_pepe import BossPepe
-from boss_strong import BossStrong
 from config import config
 from menu import MainMenu  # Menu integration
 from high_score import HighScoreManager  # High score system
 from pause_menu import PauseMenu  # Pause menu system
+from safe_loader import safe_load_image, safe_font, render_text  # Shared asset/font caches
+from safe_loader import asset_exists, read_asset_text  # Asset pack / loose file access
+from asset_preloader import AssetPreloader  # Background asset decoding
+from wall_grid import WallGrid  # 32px wall occupancy grid
+from timestep import FixedTimestep, interpolate  # Fixed-rate simulation ticks
+from pool import prewarm_pools, reset_pools, get_pool_stats  # Short-lived entity pools
+from game_session import GameSession, GAME_KEYS  # Simulated state of one game
+from rng import new_seed  # Per-game seed for the subsystem RNG streams
+from replay import ReplayRecorder, ReplayPlayer, load_replay  # --record / --replay
+from headless import HeadlessRun  # Bot-driven max-speed runs (--headless)
+from perf_hud import FpsMeter, PerfHud, PhaseTimer  # F3 rolling FPS, F4 per-phase overlay
+from frame_log import FrameLog  # Opt-in per-frame timings and hitch stacks (--frame-log)
+from profiler import Profiler, MODES as PROFILE_MODES  # F5 / --profile-seconds captures
+import tracing  # Timeline spans, Chrome/Perfetto JSON (--trace)
+from memory_accountant import MemoryHud, LeakReport, track  # F6 surface memory, Shift+F6 leak diff
+from gc_policy import GcPolicy, MODES as GC_MODES  # gc.freeze, gameplay thresholds, collections at pauses
 import os
 import atexit
+import argparse
+import contextlib
+import time
 
 def cleanup():
     """Cleanup on exit"""
@@ -43,47 +49,15 @@ def resource_path(relative_path):
 def safe_load_json(filename, default_value):
     """Safe JSON file loading"""
     try:
-        path = resource_path(filename)
-        if os.path.exists(path):
-            with open(path) as f:
-                return json.load(f)
+        if asset_exists(filename):
+            return json.loads(read_asset_text(filename))
         else:
-            print(f"JSON file not found: {path}, using default")
+            print(f"JSON file not found: {resource_path(filename)}, using default")
             return default_value
     except Exception as e:
         print(f"Error loading {filename}: {e}, using default")
         return default_value
 
-def safe_load_image(path, fallback_size=(64, 64)):
-    """Safe image loading"""
-    try:
-        full_path = resource_path(path)
-        if os.path.exists(full_path):
-            return pygame.image.load(full_path)
-        else:
-            print(f"Image not found: {full_path}, creating fallback")
-            surface = pygame.Surface(fallback_size)
-            surface.fill((100, 100, 100))  # Gray color
-            return surface
-    except Exception as e:
-        print(f"Error loading image {path}: {e}, creating fallback")
-        surface = pygame.Surface(fallback_size)
-        surface.fill((200, 100, 100))  # Reddish color for error
-        return surface
-
-def safe_font(size):
-    """Safe font loading"""
-    try:
-        font_path = resource_path("assets/PressStart2P-Regular.ttf")
-        if os.path.exists(font_path):
-            return pygame.font.Font(font_path, size)
-        else:
-            print(f"Font not found: {font_path}, using system font")
-            return pygame.font.Font(None, size)
-    except Exception as e:
-        print(f"Error loading font: {e}, using system font")
-        return pygame.font.Font(None, size)
-
 def show_game_over_screen_with_records(screen, font, final_score, final_level, final_wave, clock):
     """Show Game Over screen with high scores"""
     # Initialize score manager
@@ -94,7 +68,7 @@ def show_game_over_screen_with_records(screen, font, final_score, final_level, f
     is_new_record = score_manager.is_new_record(final_score)
     high_score = score_manager.get_high_score()
     
-    overlay = pygame.Surface(screen.get_size())
+    overlay = track(pygame.Surface(screen.get_size()), "menus", "game over")
     overlay.set_alpha(180)
     overlay.fill((0, 0, 0))
     
@@ -115,7 +89,7 @@ def show_game_over_screen_with_records(screen, font, final_score, final_level, f
                 title_text = "GAME OVER"
             
             game_over_font = safe_font(28)
-            game_over_surface = game_over_font.render(title_text, True, title_color)
+            game_over_surface = render_text(game_over_font, title_text, title_color)
             game_over_rect = game_over_surface.get_rect(center=(screen.get_width() // 2, 80))
             screen.blit(game_over_surface, game_over_rect)
             
@@ -123,12 +97,12 @@ def show_game_over_screen_with_records(screen, font, final_score, final_level, f
             score_font = safe_font(16)
             
             current_score_text = f"Your Score: {final_score}"
-            current_score_surface = score_font.render(current_score_text, True, (255, 255, 255))
+            current_score_surface = render_text(score_font, current_score_text, (255, 255, 255))
             current_score_rect = current_score_surface.get_rect(center=(screen.get_width() // 2, 130))
             screen.blit(current_score_surface, current_score_rect)
             
             level_text = f"Level: {final_level}  •  Wave: {final_wave}"
-            level_surface = score_font.render(level_text, True, (200, 200, 200))
+            level_surface = render_text(score_font, level_text, (200, 200, 200))
             level_rect = level_surface.get_rect(center=(screen.get_width() // 2, 155))
             screen.blit(level_surface, level_rect)
             
@@ -153,13 +127,13 @@ def show_game_over_screen_with_records(screen, font, final_score, final_level, f
                     rank_text = f"Rank: #{rank}"
                     rank_color = (200, 200, 200)
                 
-                rank_surface = score_font.render(rank_text, True, rank_color)
+                rank_surface = render_text(score_font, rank_text, rank_color)
                 rank_rect = rank_surface.get_rect(center=(screen.get_width() // 2, 185))
                 screen.blit(rank_surface, rank_rect)
             
             # High score
             record_text = f"High Score: {high_score}"
-            record_surface = score_font.render(record_text, True, (255, 255, 100))
+            record_surface = render_text(score_font, record_text, (255, 255, 100))
             record_rect = record_surface.get_rect(center=(screen.get_width() // 2, 215))
             screen.blit(record_surface, record_rect)
             
@@ -169,7 +143,7 @@ def show_game_over_screen_with_records(screen, font, final_score, final_level, f
                 top_font = safe_font(12)
                 
                 top_title = "🏆 TOP SCORES 🏆"
-                top_title_surface = top_font.render(top_title, True, (100, 255, 150))
+                top_title_surface = render_text(top_font, top_title, (100, 255, 150))
                 top_title_rect = top_title_surface.get_rect(center=(screen.get_width() // 2, 260))
                 screen.blit(top_title_surface, top_title_rect)
                 
@@ -196,7 +170,7 @@ def show_game_over_screen_with_records(screen, font, final_score, final_level, f
                         medal = "➤" + medal
                     
                     score_line = f"{medal} {record['score']} pts (Lv.{record['level']}, W.{record['wave']})"
-                    score_surface = top_font.render(score_line, True, color)
+                    score_surface = render_text(top_font, score_line, color)
                     score_rect = score_surface.get_rect(center=(screen.get_width() // 2, 290 + idx * 22))
                     screen.blit(score_surface, score_rect)
             
@@ -224,7 +198,7 @@ def show_game_over_screen_with_records(screen, font, final_score, final_level, f
             # Instruction
             instruction_font = safe_font(10)
             instruction_text = "Returning to menu... (press any key to skip)"
-            instruction_surface = instruction_font.render(instruction_text, True, (150, 150, 150))
+            instruction_surface = render_text(instruction_font, instruction_text, (150, 150, 150))
             instruction_rect = instruction_surface.get_rect(center=(screen.get_width() // 2, screen.get_height() - 50))
             screen.blit(instruction_surface, instruction_rect)
             
@@ -239,8 +213,42 @@ def show_game_over_screen_with_records(screen, font, final_score, final_level, f
             if event.type == pygame.KEYDOWN or event.type == pygame.QUIT:
                 return
 
-def start_game_loop(screen, clock):
-    """Main game loop - your original game code"""
+def load_walls(bg_width, bg_height):
+    """Wall rects from walls.json, or a plain border if there are none"""
+    wall_data = safe_load_json("walls.json", [])
+    walls = [pygame.Rect(*r) for r in wall_data]
+
+    # If no walls, create basic boundary walls
+    if not walls:
+        print("No walls loaded, creating basic boundary walls")
+        # Create world boundaries
+        wall_thickness = 32
+        walls = [
+            pygame.Rect(0, 0, bg_width, wall_thickness),  # Top
+            pygame.Rect(0, bg_height - wall_thickness, bg_width, wall_thickness),  # Bottom
+            pygame.Rect(0, 0, wall_thickness, bg_height),  # Left
+            pygame.Rect(bg_width - wall_thickness, 0, wall_thickness, bg_height),  # Right
+        ]
+    return walls
+
+def replay_path(path, game):
+    """run.replay, run-2.replay, ... for the games of one headless run"""
+    if game <= 1:
+        return path
+    stem, ext = os.path.splitext(path)
+    return f"{stem}-{game}{ext}"
+
+def start_game_loop(screen, clock, headless=None, record=None, frame_log=None, profiler=None,
+                    gc_policy=None):
+    """Main game loop - your original game code
+
+    headless: a headless.HeadlessRun - bot input, no frame cap, no drawing
+    record: path to save the game's replay (input, seed, per-tick state hashes)
+    frame_log: a frame_log.FrameLog - every frame's phase times, counts, hitch stacks
+    profiler: a profiler.Profiler - F5/Shift+F5 captures; one already running keeps going
+    gc_policy: a gc_policy.GcPolicy - freeze after loading, collections at natural pauses;
+        the caller calls leave_game() once the loop returns
+    """
     
     # Stop menu music and try to load game music
     pygame.mixer.music.stop()
@@ -272,9 +280,13 @@ def start_game_loop(screen, clock):
     # Get screen dimensions
     SCREEN_WIDTH, SCREEN_HEIGHT = screen.get_size()
     
-    # FPS tracking variable
-    fps_counter = 0
-    fps_timer = 0
+    # Rolling FPS (F3) and the per-phase performance overlay (F4)
+    fps_meter = FpsMeter()
+    perf_hud = PerfHud(fps_meter, 1000 / config.FPS)
+    phase_timer = PhaseTimer()
+    memory_hud = MemoryHud()
+    leak_report = LeakReport()
+    phase_timer.keep_marks = frame_log is not None
 
     # Load background and game resources with safe loading
     background = safe_load_image("assets/background.png", (1200, 1200))
@@ -291,376 +303,85 @@ def start_game_loop(screen, clock):
         print(f"Background scaled from {original_bg_width}x{original_bg_height} to {TARGET_WORLD_SIZE}x{TARGET_WORLD_SIZE}")
     else:
         print(f"Background already correct size: {TARGET_WORLD_SIZE}x{TARGET_WORLD_SIZE}")
+    # Opaque copy: blits faster and does not alias the atlas page
+    background = track(background.convert(), "assets", "background")
 
     game_over_image = safe_load_image("assets/game_over.png", (400, 300))
     font = safe_font(12)
 
-    # Safe wall loading
-    wall_data = safe_load_json("walls.json", [])
-    walls = [pygame.Rect(*r) for r in wall_data]
-
-    # If no walls, create basic boundary walls
-    if not walls:
-        print("No walls loaded, creating basic boundary walls")
-        # Create world boundaries
-        wall_thickness = 32
-        walls = [
-            pygame.Rect(0, 0, bg_width, wall_thickness),  # Top
-            pygame.Rect(0, bg_height - wall_thickness, bg_width, wall_thickness),  # Bottom
-            pygame.Rect(0, 0, wall_thickness, bg_height),  # Left
-            pygame.Rect(bg_width - wall_thickness, 0, wall_thickness, bg_height),  # Right
-        ]
-
-    player = Player(bg_width // 2, bg_height // 2)
-    player.max_hp = config.PLAYER_START_HP
-    player.hp = config.PLAYER_START_HP
-    player.max_mana = config.PLAYER_START_MANA
-    player.mana = config.PLAYER_START_MANA
-
-    player_level = PlayerLevel()
+    wall_grid = WallGrid(load_walls(bg_width, bg_height), bg_width, bg_height)
     interface = Interface(SCREEN_WIDTH, SCREEN_HEIGHT)
-    inventory = Inventory(scale=2)
-
-    # Boss system
-    class BossManager:
-        def __init__(self):
-            self.boss_pepe = None
-            self.boss_strong = None
-            self.current_boss_type = "pepe"
-            self.boss_cycle = 0
-            self.boss_defeated = False
-            self.boss_spawn_score = config.BOSS_SPAWN_SCORE_START
-            self.boss_cooldown = 0
-            self.boss_cooldown_duration = 10
-            self.warning_time = 5
-            self.showing_warning = False
-            
-        def update(self, dt, score, player, ghosts):
-            if self.boss_cooldown > 0:
-                self.boss_cooldown -= dt
-                if self.boss_cooldown <= self.warning_time and not self.showing_warning:
-                    self.showing_warning = True
-                    
-            if self.boss_pepe and self.boss_pepe.active:
-                self.boss_pepe.update(dt, player, ghosts)
-                if not self.boss_pepe.active:
-                    self.boss_defeated = True
-                    self.boss_cooldown = self.boss_cooldown_duration
-                    self.showing_warning = False
-                    
-            if self.boss_strong and self.boss_strong.active:
-                self.boss_strong.update(dt, player, ghosts)
-                if not self.boss_strong.active:
-                    self.boss_defeated = True
-                    self.boss_cooldown = self.boss_cooldown_duration
-                    self.showing_warning = False
-                    
-            if (score >= self.boss_spawn_score and 
-                self.boss_cooldown <= 0 and 
-                not self.has_active_boss()):
-                self.spawn_next_boss()
-                
-        def has_active_boss(self):
-            return ((self.boss_pepe and self.boss_pepe.active) or 
-                    (self.boss_strong and self.boss_strong.active))
-                    
-        def spawn_next_boss(self):
-            x = bg_width // 2 + random.randint(-100, 100)
-            y = bg_height // 2 + random.randint(-100, 100)
-            
-            power_level = 1 + self.boss_cycle
-            
-            if self.current_boss_type == "pepe":
-                self.boss_pepe = BossPepe(x, y, power_level)
-                self.current_boss_type = "strong"
-            else:
-                self.boss_strong = BossStrong(x, y, power_level)
-                self.current_boss_type = "pepe"
-                self.boss_cycle += 1
-                
-            self.boss_spawn_score += 150 + self.boss_cycle * 50
-            self.showing_warning = False
-            
-        def get_next_boss_name(self):
-            if self.current_boss_type == "pepe":
-                return f"PEPE BOSS LV.{1 + self.boss_cycle}"
-            else:
-                return f"STRONG BOSS LV.{1 + self.boss_cycle}"
-            
-        def draw(self, surface, camera_offset):
-            if self.boss_pepe and self.boss_pepe.active:
-                self.boss_pepe.draw(surface, camera_offset)
-            if self.boss_strong and self.boss_strong.active:
-                self.boss_strong.draw(surface, camera_offset)
-                
-            if self.showing_warning and self.boss_cooldown > 0:
-                interface.draw_boss_warning(surface, self.get_next_boss_name(), self.boss_cooldown)
-                
-        def notify_ghost_killed(self):
-            if self.boss_pepe and self.boss_pepe.active:
-                self.boss_pepe.notify_ghost_killed()
-
-    # Ghost wave system
-    class WaveManager:
-        def __init__(self):
-            self.wave_number = 1
-            self.ghosts_in_wave = 3
-            self.wave_timer = 0
-            self.wave_duration = 30
-            self.spawn_timer = 0
-            self.spawn_interval = 3
-            self.ghosts_spawned_this_wave = 0
-            
-        def update(self, dt, ghosts, bg_width, bg_height):
-            self.wave_timer += dt
-            self.spawn_timer += dt
-            
-            if self.wave_timer >= self.wave_duration:
-                self.start_new_wave()
-                
-            if (self.spawn_timer >= self.spawn_interval and 
-                self.ghosts_spawned_this_wave < self.ghosts_in_wave):
-                self.spawn_ghost(ghosts, bg_width, bg_height)
-                
-        def start_new_wave(self):
-            self.wave_number += 1
-            self.wave_timer = 0
-            self.ghosts_spawned_this_wave = 0
-            
-            self.wave_duration = max(20, 30 - (self.wave_number - 1) * 1)
-            
-            base_increase = int(2 * config.DIFFICULTY_MULTIPLIER)
-            self.ghosts_in_wave = 3 + (self.wave_number - 1) * base_increase
-            self.spawn_interval = max(0.8, 3 - (self.wave_number - 1) * 0.15)
-            
-        def spawn_ghost(self, ghosts, bg_width, bg_height):
-            margin = 100
-            
-            side = random.choice(['top', 'bottom', 'left', 'right'])
-            if side == 'top':
-                x = random.randint(margin, bg_width - margin)
-                y = random.randint(0, margin)
-            elif side == 'bottom':
-                x = random.randint(margin, bg_width - margin)
-                y = random.randint(bg_height - margin, bg_height)
-            elif side == 'left':
-                x = random.randint(0, margin)
-                y = random.randint(margin, bg_height - margin)
-            else:
-                x = random.randint(bg_width - margin, bg_width)
-                y = random.randint(margin, bg_height - margin)
-                
-            if self.wave_number <= 2:
-                ghost_types = [Ghost, Ghost, Ghost, TankGhost]
-            elif self.wave_number <= 5:
-                ghost_types = [Ghost, Ghost, TankGhost, ShooterGhost]
-            else:
-                ghost_types = [Ghost, TankGhost, TankGhost, ShooterGhost, ShooterGhost]
-                
-            ghost_type = random.choice(ghost_types)
-            ghosts.append(ghost_type(x, y))
-            
-            self.ghosts_spawned_this_wave += 1
-            self.spawn_timer = 0
-
-    # Player progression system
-    class PlayerProgression:
-        def __init__(self, player):
-            self.player = player
-            self.experience = 0
-            self.level = 1
-            self.exp_for_next_level = 100
-            self.stat_points = 0
-            
-        def add_experience(self, amount):
-            self.experience += amount
-            while self.experience >= self.exp_for_next_level:
-                self.level_up()
-                
-        def level_up(self):
-            self.experience -= self.exp_for_next_level
-            self.level += 1
-            self.exp_for_next_level = int(self.exp_for_next_level * 1.2)
-            
-            self.player.max_hp += 5
-            self.player.hp = self.player.max_hp
-            self.player.max_mana += 5
-            self.player.mana = self.player.max_mana
-            self.player.speed += 5
-            
-            return f"Level Up! Now level {self.level}"
-
-    # Initialize systems
-    boss_manager = BossManager()
-    wave_manager = WaveManager()
-    player_progression = PlayerProgression(player)
 
-    ghosts = []
-    fireballs = []
-    lightnings = []
+    # Pools outlive a session: forget the last game's objects, then pre-warm
+    reset_pools()
+    prewarm_pools()
 
-    previous_potion_score = 0
-    level_text = ""
-    level_text_timer = 0
-    previous_mana_score = 0
-    potion = None
-    mana_mushroom = None
-    score = 0
+    # Everything the game simulates; a fresh seed per game, kept in the replay
+    if headless:
+        seed = headless.seed + len(headless.games)
+    else:
+        seed = new_seed()
+    session = GameSession(wall_grid, bg_width, bg_height, seed)
+    player = session.player
+    recorder = ReplayRecorder(session) if record else None
+    # Все загружено и построено: полная сборка, freeze, игровые пороги
+    if gc_policy:
+        gc_policy.enter_game()
+    wave_number = session.wave_manager.wave_number
 
     running = True
     paused = False
     pause_menu = None  # NEW: Pause menu system
     camera_offset = pygame.Vector2(0, 0)
+    timestep = FixedTimestep(config.SIM_HZ, config.MAX_SUBSTEPS)
 
     print("Game started from menu!")
 
     while running:
-        dt = clock.tick(config.FPS) / 1000
+        if headless:
+            # Ровно один тик за проход и без ограничения FPS
+            frame_dt = timestep.step
+        else:
+            frame_dt = clock.tick(config.FPS) / 1000
         
-        # FPS counting
-        fps_timer += dt
-        fps_counter += 1
-        current_fps = 60
-        if fps_timer >= 1.0:
-            current_fps = fps_counter / fps_timer
-            fps_counter = 0
-            fps_timer = 0
+        fps_meter.add(frame_dt)
+        if profiler and profiler.active:
+            profiler.poll()
+        # Фазы кадра меряются только при открытом оверлее, с логом кадров или трассировкой
+        # (трассировка - и в headless: спаны фаз тиков)
+        frame_started = tracing.now()
+        timed = frame_started or ((perf_hud.visible or frame_log) and not headless)
+        mark = phase_timer.mark if timed else None
+        if mark:
+            phase_timer.begin_frame()
+            if frame_log:
+                frame_log.begin_frame(phase_timer.frame_start)
 
         # Get key states at the beginning of each frame
-        keys = pygame.key.get_pressed()
+        if headless:
+            keys, bot_events = headless.bot.poll(frame_dt, player, session.ghosts,
+                                                     session.player_level, session.inventory)
+        else:
+            keys = pygame.key.get_pressed()
 
-        if not paused:
-            player.taking_damage = False
-            player.recover_mana(dt)
-
-            # Spell unlock system
-            if score >= 100 and player_level.level == 1:
-                level_text = "Level 2 Unlocked: Lightning Spell!"
-                level_text_timer = 3
-                player_level.level_up()
-            elif score >= 200 and player_level.level == 2:
-                level_text = "Level 3 Unlocked: Shield Spell!"
-                level_text_timer = 3
-                player_level.level_up()
-
-            # Update systems
-            boss_manager.update(dt, score, player, ghosts)
-            wave_manager.update(dt, ghosts, bg_width, bg_height)
-            
-            # Update player with wall checking
-            player.update(keys, dt, walls)
-            
-            # Limit player to world boundaries
-            margin = 50
-            player.rect.x = max(margin, min(player.rect.x, bg_width - player.rect.width - margin))
-            player.rect.y = max(margin, min(player.rect.y, bg_height - player.rect.height - margin))
-            
-            # Set camera AFTER player update
-            camera_offset = pygame.math.Vector2(
-                player.rect.centerx - SCREEN_WIDTH // 2,
-                player.rect.centery - SCREEN_HEIGHT // 2
-            )
-            camera_offset.x = max(0, min(camera_offset.x, bg_width - SCREEN_WIDTH))
-            camera_offset.y = max(0, min(camera_offset.y, bg_height - SCREEN_HEIGHT))
-
-            if player.shield_cooldown > 0:
-                player.shield_cooldown -= dt
-
-            if potion and potion.active:
-                potion.update(dt)
-            if mana_mushroom and mana_mushroom.active:
-                mana_mushroom.update(dt)
-
-            for ghost in ghosts:
-                ghost.update(dt, player)
-
-            for fireball in fireballs[:]:
-                fireball.update(dt)
-                if fireball.timer > fireball.lifetime:
-                    fireballs.remove(fireball)
-
-            # Fireball collisions
-            for fireball in fireballs[:]:
-                # Damage to bosses
-                if boss_manager.boss_strong and boss_manager.boss_strong.active and fireball.rect.colliderect(boss_manager.boss_strong.rect):
-                    boss_manager.boss_strong.take_damage(5)
-                    if fireball in fireballs:
-                        fireballs.remove(fireball)
-                    continue
-                
-                if boss_manager.boss_pepe and boss_manager.boss_pepe.active and fireball.rect.colliderect(boss_manager.boss_pepe.rect):
-                    boss_manager.boss_pepe.take_damage(5)
-                    if fireball in fireballs:
-                        fireballs.remove(fireball)
-                    continue
-                    
-                # Damage to ghosts
-                for ghost in ghosts[:]:
-                    if fireball.rect.colliderect(ghost.rect):
-                        if hasattr(ghost, 'hp'):
-                            ghost.hp -= 1
-                            if ghost.hp <= 0:
-                                ghosts.remove(ghost)
-                                score += 10
-                                player_progression.add_experience(10)
-                                boss_manager.notify_ghost_killed()
-                        else:
-                            ghosts.remove(ghost)
-                            score += 10
-                            player_progression.add_experience(10)
-                            boss_manager.notify_ghost_killed()
-                        if fireball in fireballs:
-                            fireballs.remove(fireball)
-                        break
+        if mark:
+            mark("events")
 
-            
-            if score - previous_potion_score >= 100 and (not potion or not potion.active):
-                previous_potion_score = score
-                attempts = 0
-                while True:
-                    x = random.randint(100, bg_width - 100)
-                    y = random.randint(100, bg_height - 100)
-                    new_potion = Potion(x, y)
-                    if not any(new_potion.rect.colliderect(w) for w in walls):
-                        potion = new_potion
-                        break
-                    attempts += 1
-                    if attempts > 100:
-                        break
-
-            if score - previous_mana_score >= 150 and (not mana_mushroom or not mana_mushroom.active):
-                previous_mana_score = score
-                attempts = 0
-                while True:
-                    x = random.randint(100, bg_width - 100)
-                    y = random.randint(100, bg_height - 100)
-                    new_mana = ManaMushroom(x, y)
-                    if not any(new_mana.rect.colliderect(w) for w in walls):
-                        mana_mushroom = new_mana
-                        break
-                    attempts += 1
-                    if attempts > 100:
-                        break
-
-            # Item pickup
-            if potion and potion.active and player.rect.colliderect(potion.rect):
-                inventory.add_item("hilka")
-                potion.active = False
-
-            if mana_mushroom and mana_mushroom.active and player.rect.colliderect(mana_mushroom.rect):
-                inventory.add_item("mana")
-                mana_mushroom.active = False
-
-            for lightning in lightnings[:]:
-                lightning.update(dt)
-                if lightning.finished:
-                    lightnings.remove(lightning)
-
-            if level_text_timer > 0:
-                level_text_timer -= dt
+        if not paused:
+            # Fixed-rate ticks: the same dt every step, bounded catch-up after slow frames
+            for _ in range(timestep.advance(frame_dt)):
+                if recorder:
+                    recorder.tick(keys)
+                session.tick(keys, timestep.step, mark)
+                if recorder:
+                    recorder.state(session)
+            if gc_policy and session.wave_manager.wave_number != wave_number:
+                # Новая волна - естественная пауза для молодых поколений
+                wave_number = session.wave_manager.wave_number
+                gc_policy.natural_pause("wave")
 
         # FIXED: Events handling - get events once and handle properly
-        events = pygame.event.get()
+        events = bot_events if headless else pygame.event.get()
         
         # Handle pause menu FIRST if paused
         if paused and pause_menu:
@@ -672,6 +393,8 @@ def start_game_loop(screen, clock):
             elif pause_result == "main_menu":
                 # Return to main menu
                 pygame.mixer.music.stop()
+                if recorder:
+                    recorder.save(record)
                 return "menu"
             elif pause_result == "update_screen":
                 # Update screen after fullscreen toggle
@@ -685,12 +408,16 @@ def start_game_loop(screen, clock):
             for event in events:
                 if event.type == pygame.QUIT:
                     config.save_settings()
+                    if recorder:
+                        recorder.save(record)
                     return "quit"
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         # Open pause menu
                         paused = True
                         pause_menu = PauseMenu(SCREEN_WIDTH, SCREEN_HEIGHT)
+                        if gc_policy:
+                            gc_policy.natural_pause("pause_menu")
                     elif event.key == pygame.K_F11:
                         config.toggle_fullscreen()
                         SCREEN_WIDTH, SCREEN_HEIGHT = config.get_resolution()
@@ -700,128 +427,128 @@ def start_game_loop(screen, clock):
                         # Open pause menu
                         paused = True
                         pause_menu = PauseMenu(SCREEN_WIDTH, SCREEN_HEIGHT)
+                        if gc_policy:
+                            gc_policy.natural_pause("pause_menu")
                     elif event.key == pygame.K_F3:
                         config.SHOW_FPS = not config.SHOW_FPS
+                    elif event.key == pygame.K_F4:
+                        perf_hud.toggle()
+                    elif event.key == pygame.K_F5 and profiler:
+                        # F5 - выборочный профиль, Shift+F5 - cProfile
+                        profiler.start("cprofile" if event.mod & pygame.KMOD_SHIFT else "sample")
+                    elif event.key == pygame.K_F6:
+                        # F6 - память поверхностей, Shift+F6 - снимок/дифф tracemalloc
+                        if event.mod & pygame.KMOD_SHIFT:
+                            leak_report.dump(session.entity_census())
+                        else:
+                            memory_hud.toggle()
                     elif event.key == pygame.K_F1:
                         config.SHOW_CONTROLS = not config.SHOW_CONTROLS
-                    elif event.key == pygame.K_SPACE:
-                        direction = pygame.Vector2(1 if player.facing == "right" else -1, 0)
-                        fireballs.append(Fireball(player.rect.centerx, player.rect.centery, direction))
-                        player.start_shoot_animation(direction.x)
-                    elif event.key == pygame.K_q and player_level.unlock_lightning and player.mana >= 20:
-                        player.mana -= 20
-                        ghosts_hit = 0
-                        for ghost in ghosts[:]:
-                            dist = pygame.Vector2(ghost.rect.center) - pygame.Vector2(player.rect.center)
-                            if dist.length() < 150:
-                                lightnings.append(LightningSpell(ghost.rect.centerx, ghost.rect.centery))
-                                ghost.hp = 0 if hasattr(ghost, 'hp') else None
-                                if ghost in ghosts:
-                                    ghosts.remove(ghost)
-                                    score += 10
-                                    player_progression.add_experience(15)
-                                    boss_manager.notify_ghost_killed()
-                                    ghosts_hit += 1
-                        if ghosts_hit > 0:
-                            player.start_shoot_animation(1 if player.facing == "right" else -1)
-                    elif event.key == pygame.K_1:
-                        if inventory.use_item("hilka"):
-                            player.hp = min(player.max_hp, player.hp + 30)
-                    elif event.key == pygame.K_2:
-                        if inventory.use_item("mana"):
-                            player.mana = min(player.max_mana, player.mana + 30)
-                    elif event.key == pygame.K_e:
-                        if player_level.unlock_shield and player.shield_cooldown <= 0:
-                            player.shield.activate()
-                            player.shield_cooldown = 15
+                    elif event.key in GAME_KEYS:
+                        if recorder:
+                            recorder.key(session, event.key)
+                        session.handle_key(event.key)
         else:
             # If paused, still handle QUIT events
             for event in events:
                 if event.type == pygame.QUIT:
                     config.save_settings()
+                    if recorder:
+                        recorder.save(record)
                     return "quit"
 
+        if mark:
+            mark("events")
+
+        if headless:
+            headless.tick(session.counts())
+            if gc_policy:
+                gc_policy.end_frame()
+            if mark:
+                mark("gc")
+                phase_timer.take()
+            died = player.hp <= 0
+            if died or headless.done():
+                headless.end_game(session.score, session.player_progression.level,
+                                  session.wave_manager.wave_number, died)
+                if recorder:
+                    recorder.save(replay_path(record, len(headless.games)))
+                return "menu" if died else "quit"
+            if frame_started:
+                tracing.record("frame", frame_started, tracing.now())
+            continue
+
         # Check player death
         if player.hp <= 0:
-            show_game_over_screen_with_records(screen, font, score, player_progression.level, wave_manager.wave_number, clock)
+            print(f"Pool stats: {get_pool_stats()}")
+            if recorder:
+                recorder.save(record)
+            if gc_policy:
+                gc_policy.natural_pause("game_over")
+                gc_policy.end_frame()
+            show_game_over_screen_with_records(screen, font, session.score, session.player_progression.level,
+                                               session.wave_manager.wave_number, clock)
             pygame.mixer.music.stop()
             return "menu"
 
-        # Rendering
+        # Rendering: entities are drawn between their last two ticks
+        alpha = timestep.alpha
+        view_x, view_y = interpolate(player.prev_pos, player.pos, alpha)
+        camera_offset = pygame.math.Vector2(
+            view_x + player.rect.width // 2 - SCREEN_WIDTH // 2,
+            view_y + player.rect.height // 2 - SCREEN_HEIGHT // 2
+        )
+        camera_offset.x = max(0, min(camera_offset.x, bg_width - SCREEN_WIDTH))
+        camera_offset.y = max(0, min(camera_offset.y, bg_height - SCREEN_HEIGHT))
         screen.blit(background, (-camera_offset.x, -camera_offset.y))
         
-        if not paused:
-            player.draw(screen, camera_offset)
-            boss_manager.draw(screen, camera_offset)
-            
-            for ghost in ghosts:
-                ghost.draw(screen, camera_offset)
-            for fireball in fireballs:
-                fireball.draw(screen, camera_offset)
-            for lightning in lightnings:
-                lightning.draw(screen, camera_offset)
-            if potion and potion.active:
-                potion.draw(screen, camera_offset)
-            if mana_mushroom and mana_mushroom.active:
-                mana_mushroom.draw(screen, camera_offset)
-        else:
-            # Draw everything with darkening on pause
-            player.draw(screen, camera_offset)
-            boss_manager.draw(screen, camera_offset)
-            
-            for ghost in ghosts:
-                ghost.draw(screen, camera_offset)
-            for fireball in fireballs:
-                fireball.draw(screen, camera_offset)
-            for lightning in lightnings:
-                lightning.draw(screen, camera_offset)
-            if potion and potion.active:
-                potion.draw(screen, camera_offset)
-            if mana_mushroom and mana_mushroom.active:
-                mana_mushroom.draw(screen, camera_offset)
-
-        interface.draw(screen, player)
-        inventory.draw(screen)
-
-        # UI information
-        score_text = font.render(f"{score}", True, (250, 235, 255))
-        screen.blit(score_text, (140, 95))
-        
-        # Wave information
-        if not paused:
-            time_until_next_wave = wave_manager.wave_duration - wave_manager.wave_timer
-            interface.draw_wave_info(screen, wave_manager.wave_number, 
-                                   wave_manager.ghosts_spawned_this_wave, 
-                                   wave_manager.ghosts_in_wave, 
-                                   time_until_next_wave)
-        
-        # Player statistics
-        interface.draw_player_stats(screen, player_progression.level, 
-                                  player_progression.experience, 
-                                  player_progression.exp_for_next_level)
-        
-        # Show FPS if enabled
-        if config.SHOW_FPS:
-            interface.draw_fps_counter(screen, current_fps)
-        
-        # Show controls if enabled
-        if config.SHOW_CONTROLS:
-            interface.draw_controls_help(screen)
-
-        if level_text_timer > 0:
-            level_font = safe_font(12)
-            level_surf = level_font.render(level_text, True, (255, 255, 0))
-            level_rect = level_surf.get_rect(center=(SCREEN_WIDTH // 2, 50))
-            screen.blit(level_surf, level_rect)
+        # Same scene while paused (the pause menu darkens it below)
+        session.draw(screen, camera_offset, alpha, interface)
+        if mark:
+            mark("world_draw")
+
+        session.draw_hud(screen, interface, font, fps_meter.fps, paused)
         
         # FIXED: Draw pause menu if paused (replaces old pause text)
         if paused and pause_menu:
             pause_menu.draw(screen)
 
-        pygame.display.flip()
+        if perf_hud.visible:
+            perf_hud.draw(screen)
+        if memory_hud.visible:
+            memory_hud.draw(screen, session.entity_census)
+        if mark:
+            mark("hud_draw")
 
-def main():
-    """Main function with menu"""
+        pygame.display.flip()
+        if mark:
+            mark("flip")
+        # Запрошенная сборка - после flip: кадр уже показан
+        gc_frame = gc_policy.end_frame() if gc_policy else None
+        if mark:
+            mark("gc")
+            phases = phase_timer.take()
+            counts = session.counts()
+            if perf_hud.visible:
+                perf_hud.end_frame(phases, counts, gc_frame)
+            if frame_log:
+                frame_log.end_frame(frame_dt, phases, phase_timer.marks, counts, session.activity(),
+                                    gc_frame)
+        if frame_started:
+            tracing.record("frame", frame_started, tracing.now())
+
+def main(record=None, frame_log_path=None, profile_seconds=None, profile_mode="sample", trace_path=None,
+         gc_mode="managed"):
+    """Main function with menu
+
+    record: save each game's replay there (run.replay, run-2.replay, ...)
+    frame_log_path: write per-frame timings of all games there (JSONL, see frame_log.py)
+    profile_seconds: profile the first game's loop for that long (F5 captures use it too)
+    trace_path: record spans from startup to exit, saved there as Chrome trace JSON
+    gc_mode: gc_policy mode ("managed" or "default" - stock CPython, measured only)
+    """
+    if trace_path:
+        tracing.start()
     pygame.init()
     
     # Screen setup
@@ -833,7 +560,15 @@ def main():
     # Initialize menu
     menu = MainMenu(SCREEN_WIDTH, SCREEN_HEIGHT)
     
+    # Decode game assets in background threads while the menu animates
+    preloader = AssetPreloader().start()
+    menu.preloader = preloader
+    frame_log = FrameLog(frame_log_path, 1000 / config.FPS) if frame_log_path else None
+    profiler = Profiler(profile_seconds or 10.0, profile_mode)
+    gc_policy = GcPolicy(gc_mode)
+    
     # Main loop
+    games = 0
     running = True
     while running:
         dt = clock.tick(config.FPS) / 1000.0
@@ -844,6 +579,9 @@ def main():
             if event.type == pygame.QUIT:
                 running = False
         
+        # Convert a few decoded assets per frame on the main thread
+        preloader.poll()
+        
         # Update menu
         menu.update(dt)
         
@@ -852,7 +590,18 @@ def main():
         
         if menu_result == "start_game":
             print("Starting game...")
-            game_result = start_game_loop(screen, clock)
+            preloader.finish()
+            games += 1
+            if profile_seconds and games == 1:
+                profiler.start()
+            game_result = start_game_loop(screen, clock,
+                                          record=replay_path(record, games) if record else None,
+                                          frame_log=frame_log, profiler=profiler, gc_policy=gc_policy)
+            # Профиль - только игровой цикл: меню и экран рекордов не пишутся
+            profiler.stop()
+            gc_policy.leave_game()
+            if frame_log:
+                frame_log.idle()
             
             if game_result == "quit":
                 running = False
@@ -870,9 +619,111 @@ def main():
     
     # Cleanup
     menu.cleanup()
+    gc_policy.close()
+    if frame_log:
+        frame_log.close()
+    tracing.stop(trace_path)
     config.save_settings()
     pygame.quit()
     sys.exit()
 
+def run_headless(ticks, seed, bot, out=None, record=None, profile_seconds=None, profile_mode="sample",
+                 trace_path=None, gc_mode="managed"):
+    """Plays games back to back with a bot until `ticks` ticks; prints a JSON summary"""
+    if trace_path:
+        tracing.start()
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    pygame.init()
+    screen = pygame.display.set_mode(config.get_resolution())
+    clock = pygame.time.Clock()
+    run = HeadlessRun(ticks, seed, bot)
+    profiler = Profiler(profile_seconds, profile_mode) if profile_seconds else None
+    gc_policy = GcPolicy(gc_mode)
+    # Сообщения игры - в stderr, чтобы stdout содержал только итоговый JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        if profiler:
+            profiler.start()
+        while not run.done():
+            start_game_loop(screen, clock, headless=run, record=record, profiler=profiler,
+                            gc_policy=gc_policy)
+            gc_policy.leave_game()
+        gc_policy.close()
+        if profiler:
+            profiler.stop()
+        tracing.stop(trace_path)
+    summary = run.summary()
+    summary["gc"] = gc_policy.summary()
+    print(json.dumps(summary, indent=2))
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    pygame.quit()
+    return summary
+
+def run_replay(path, seek=None, keyframe_interval=600):
+    """Re-simulates a recorded game, checks every tick's state hash; prints a JSON report"""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    pygame.init()
+    pygame.display.set_mode(config.get_resolution())
+    data = load_replay(path)
+    bg_width, bg_height = data["world"]
+    with contextlib.redirect_stdout(sys.stderr):
+        wall_grid = WallGrid(load_walls(bg_width, bg_height), bg_width, bg_height)
+        reset_pools()
+        prewarm_pools()
+        player = ReplayPlayer(data, lambda seed: GameSession(wall_grid, bg_width, bg_height, seed),
+                              keyframe_interval)
+        session = player.start()
+        for problem in player.mismatches(session):
+            print(f"Replay warning: {problem}")
+        report = player.run()
+        if seek is not None:
+            # Прыжок назад: ближайший ключевой кадр и досчет до нужного тика
+            started = time.perf_counter()
+            session = player.seek(seek)
+            report["seek"] = {
+                "tick": session.tick_count,
+                "ms": round((time.perf_counter() - started) * 1000, 2),
+                "hash_ok": session.tick_count == 0 or
+                           int(session.state_hash()) == int(player.hashes[session.tick_count - 1]),
+            }
+    print(json.dumps(report, indent=2))
+    pygame.quit()
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mage vs Ghosts")
+    parser.add_argument("--headless", action="store_true",
+                        help="no window, no frame cap, bot input; prints a JSON summary")
+    parser.add_argument("--ticks", type=int, default=100000, help="headless: simulation ticks to run")
+    parser.add_argument("--seed", type=int, default=0, help="headless: random seed")
+    parser.add_argument("--bot", choices=("kite", "random"), default="kite", help="headless: input script")
+    parser.add_argument("--out", help="headless: also write the JSON summary to this file")
+    parser.add_argument("--record", help="save each game's input and state hashes to this replay file")
+    parser.add_argument("--replay", help="re-simulate a replay file and verify it tick by tick")
+    parser.add_argument("--seek", type=int, help="replay: then jump back to this tick (keyframe + catch-up)")
+    parser.add_argument("--frame-log", help="write per-frame timings and hitch stacks to this JSONL file")
+    parser.add_argument("--profile-seconds", type=float,
+                        help="profile the game loop for N seconds into profiles/ (also the F5 capture length)")
+    parser.add_argument("--profile-mode", choices=PROFILE_MODES, default="sample",
+                        help="sample: SIGPROF stack sampling (low overhead); cprofile: deterministic")
+    parser.add_argument("--trace", help="record timeline spans and save them as Chrome/Perfetto trace JSON")
+    parser.add_argument("--gc-policy", choices=GC_MODES, default="managed",
+                        help="managed: freeze after loading, raised thresholds, collect at pauses; "
+                             "default: stock CPython GC (both report pauses)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.replay:
+        run_replay(args.replay, args.seek)
+    elif args.headless:
+        run_headless(args.ticks, args.seed, args.bot, args.out, args.record,
+                     args.profile_seconds, args.profile_mode, args.trace, args.gc_policy)
+    else:
+        main(args.record, args.frame_log, args.profile_seconds, args.profile_mode, args.trace,
+             args.gc_policy)
\ No newline at end of file
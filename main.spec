@@ -1,11 +1,15 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+
+# Single-file asset pack (python build_pack.py) - assets, walls.json and font
+pack_datas = [('assets.pak', '.')] if os.path.exists('assets.pak') else []
 
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=pack_datas,
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
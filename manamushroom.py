@@ -1,31 +1,20 @@
-from safe_loader import safe_load_image, safe_font
-import pygame
+from safe_loader import load_frames
 
 class ManaMushroom:
+    __slots__ = ("frames", "frame_index", "timer", "rect", "active")
+
+    animation_speed = 0.15
+    item_type = "mana"
+    lifetime = 25  # секунд на карте
+
     def __init__(self, x, y):
-        self.sheet = safe_load_image("assets/managrib.png")
-        self.frames = [
-            self.sheet.subsurface(pygame.Rect(i * 128, 0, 128, 128))
-            for i in range(5)
-        ]
+        self.frames = load_frames("assets/managrib.png", 5, 128, 128, owner="ManaMushroom")
         self.frame_index = 0
-        self.animation_speed = 0.15
         self.timer = 0
-        self.lifetime = 25  
         self.rect = self.frames[0].get_rect(topleft=(x, y))
         self.active = True
 
-    def update(self, dt):
-        self.timer += dt
-        if self.timer >= self.animation_speed:
-            self.timer = 0
-            self.frame_index = (self.frame_index + 1) % len(self.frames)
-
-        self.lifetime -= dt
-        if self.lifetime <= 0:
-            self.active = False
-
-    def draw(self, surface, camera_offset):
+    def draw(self, surface, camera_offset, alpha=1.0):
         if not self.active:
             return
         frame = self.frames[self.frame_index]
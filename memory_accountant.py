@@ -0,0 +1,209 @@
+# memory_accountant.py - who holds how many Surface bytes (F6 overlay, Shift+F6 leak report)
+#
+# Code that makes a surface tags it: track(surface, owner, detail), owner one
+# of OWNERS, detail the entity type for "entities" (the class name, so it
+# lines up with GameSession.entity_census) or the subsystem otherwise. Tags
+# live in a WeakKeyDictionary, so the accountant never keeps a surface alive:
+# live counts and bytes are simply what is still in it. A subsurface (atlas
+# image, sheet frame) shares its parent's pixels and counts as 0 bytes.
+# Loaders tag on a cache miss only, so tracking costs nothing on the hot path.
+#
+# Shift+F6 starts tracemalloc and takes a baseline (surface table, entity
+# census, Python allocations); every later Shift+F6 writes what grew since then
+# to profiles/<date>-<time>-memory.txt - two presses a few minutes apart show a
+# leak as a steady climb.
+import os
+import time
+import weakref
+import tracemalloc
+from collections import Counter
+
+import pygame
+
+OWNERS = ("assets", "entities", "hud", "menus")
+TRACE_FRAMES = 16     # глубина стека tracemalloc
+REFRESH_FRAMES = 30   # оверлей пересчитывает таблицу раз в полсекунды
+ENTITY_ROWS = 10
+
+_tags = weakref.WeakKeyDictionary()   # Surface -> (owner, detail)
+_created = Counter()                  # (owner, detail) -> поверхностей создано всего
+_created_total = 0
+
+
+def track(surface, owner, detail=""):
+    """Tags a surface; a re-tag moves it (and its creation) to the new owner. Returns it"""
+    global _created_total
+    tag = (owner, detail)
+    old = _tags.get(surface)
+    if old is None:
+        _created_total += 1
+    elif old != tag:
+        _created[old] -= 1   # перетег (общий кадр отдан сущности): создание переезжает
+    if old != tag:
+        _created[tag] += 1
+        _tags[surface] = tag
+    return surface
+
+
+def track_all(surfaces, owner, detail=""):
+    for surface in surfaces:
+        track(surface, owner, detail)
+
+
+def created_total():
+    """Surfaces tagged so far (the frame log takes per-frame differences)"""
+    return _created_total
+
+
+def surface_bytes(surface):
+    if surface.get_parent() is not None:
+        return 0  # subsurface: пиксели родителя
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+
+def surface_table():
+    """{(owner, detail): [live, bytes, created]} for every tag seen so far"""
+    table = {tag: [0, 0, created] for tag, created in _created.items()}
+    for surface, tag in list(_tags.items()):
+        row = table.setdefault(tag, [0, 0, 0])
+        row[0] += 1
+        row[1] += surface_bytes(surface)
+    return table
+
+
+def owner_totals(table):
+    totals = {owner: [0, 0, 0] for owner in OWNERS}
+    for (owner, _), row in table.items():
+        total = totals.setdefault(owner, [0, 0, 0])
+        for i, value in enumerate(row):
+            total[i] += value
+    return totals
+
+
+def _mb(size):
+    return size / (1024 * 1024)
+
+
+class LeakReport:
+    """Baseline on the first call of dump(), a diff file on every later one"""
+
+    def __init__(self, out_dir="profiles"):
+        self.out_dir = out_dir
+        self.baseline = None
+
+    def dump(self, census=None):
+        census = dict(census or {})
+        if self.baseline is None:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACE_FRAMES)
+            self.baseline = (time.perf_counter(), surface_table(), census,
+                             tracemalloc.take_snapshot())
+            print("Memory: baseline taken (Shift+F6 again for the diff)")
+            return None
+        started, old_table, old_census, old_snapshot = self.baseline
+        minutes = max((time.perf_counter() - started) / 60, 1e-6)
+        lines = [f"memory diff after {minutes:.1f} min", ""]
+
+        lines.append("surfaces by owner        live      MB   created   (change since baseline)")
+        table = surface_table()
+        for tag in sorted(table, key=lambda t: -table[t][1]):
+            live, size, created = table[tag]
+            old = old_table.get(tag, [0, 0, 0])
+            lines.append(f"  {tag[0] + ':' + tag[1]:<22}{live:6d} {_mb(size):7.2f} {created:9d}   "
+                         f"{live - old[0]:+d} surfaces, {_mb(size - old[1]):+.2f} MB, "
+                         f"{created - old[2]:+d} created")
+
+        lines += ["", "entities                 live   (change)"]
+        for name in sorted(set(census) | set(old_census)):
+            count = census.get(name, 0)
+            lines.append(f"  {name:<22}{count:6d}   {count - old_census.get(name, 0):+d}")
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        stats = snapshot.compare_to(old_snapshot, "lineno")
+        lines += ["", "python allocations, top growth by line (KB, KB/min)"]
+        for stat in stats[:25]:
+            lines.append(f"  {stat.size_diff / 1024:+9.1f} {stat.size_diff / 1024 / minutes:+9.1f}/min "
+                         f"{stat.count_diff:+7d} blocks  {stat.traceback[0]}")
+        lines += ["", "tracebacks of the top 5"]
+        for stat in snapshot.compare_to(old_snapshot, "traceback")[:5]:
+            lines.append(f"  {stat.size_diff / 1024:+.1f} KB in {stat.count_diff:+d} blocks")
+            lines.extend("    " + line for line in stat.traceback.format()[-8:])
+
+        path = os.path.join(self.out_dir, time.strftime("%Y%m%d-%H%M%S-memory.txt"))
+        try:
+            os.makedirs(self.out_dir, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except Exception as e:
+            print(f"Memory report write error: {e}")
+            return None
+        print(f"Memory: diff saved to {path}")
+        return path
+
+
+class MemoryHud:
+    """Debug overlay: Surface bytes per owner and per entity type, live entity counts"""
+
+    def __init__(self):
+        self.visible = False
+        self.font = None
+        self.panel = None
+        self.rows = []
+        self.next_row = 0
+        self.frame = 0
+        self.start_totals = None
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible and self.panel is None:
+            from safe_loader import safe_font  # safe_loader сам импортирует этот модуль
+            self.font = safe_font(8)
+            self.line_height = self.font.get_linesize() + 2
+            height = 16 + (2 + len(OWNERS) + ENTITY_ROWS) * self.line_height
+            self.panel = track(pygame.Surface((340, height)).convert(), "hud", "memory overlay")
+            self.panel.fill((12, 12, 20))
+        return self.visible
+
+    def _refresh(self, census):
+        table = surface_table()
+        totals = owner_totals(table)
+        live = sum(t[0] for t in totals.values())
+        size = sum(t[1] for t in totals.values())
+        if self.start_totals is None:
+            self.start_totals = (live, size)
+        rows = [(f"surfaces {live} {_mb(size):6.2f} MB ({_mb(size - self.start_totals[1]):+.2f})",
+                 (255, 255, 255))]
+        for owner in OWNERS:
+            n, b, created = totals[owner]
+            rows.append((f"  {owner:<9}{n:5d} {_mb(b):6.2f} MB {created:6d} made", (200, 200, 200)))
+        rows.append(("entity          live  surf     MB", (160, 200, 255)))
+        per_type = {}
+        for (owner, detail), (n, b, _) in table.items():
+            if owner == "entities":
+                per_type[detail] = (n, b)
+        names = sorted(set(per_type) | set(census),
+                       key=lambda name: (-per_type.get(name, (0, 0))[1], -census.get(name, 0)))
+        for name in names[:ENTITY_ROWS]:
+            n, b = per_type.get(name, (0, 0))
+            rows.append((f"  {name:<14}{census.get(name, 0):5d} {n:5d} {_mb(b):6.2f}", (190, 190, 190)))
+        rows += [("", (0, 0, 0))] * (2 + len(OWNERS) + ENTITY_ROWS - len(rows))
+        self.rows = rows
+
+    def draw(self, surface, census):
+        """Blits the panel; census() and the table every REFRESH_FRAMES, one row re-rendered per frame"""
+        if self.frame % REFRESH_FRAMES == 0:
+            self._refresh(census())
+        self.frame += 1
+        panel = self.panel
+        k = self.next_row
+        self.next_row = (k + 1) % len(self.rows)
+        text, color = self.rows[k]
+        y = 8 + k * self.line_height
+        panel.fill((12, 12, 20), (0, y, panel.get_width(), self.line_height))
+        if text:
+            panel.blit(self.font.render(text, False, color), (8, y))
+        surface.blit(panel, (8, surface.get_height() - panel.get_height() - 8))
@@ -3,6 +3,7 @@ import pygame
 import sys
 import os
 from safe_loader import safe_load_image, safe_font
+from memory_accountant import track
 from config import config
 
 class MainMenu:
@@ -43,16 +44,20 @@ class MainMenu:
         # Menu state
         self.state = "main"  # main, high_scores
         
+        # Background asset warm-up (AssetPreloader), set by main()
+        self.preloader = None
+        
     def create_background(self):
         """Create nature/forest background"""
         # Try to load custom background first
         if os.path.exists("assets/menu_background.png"):
             self.background = safe_load_image("assets/menu_background.png")
             self.background = pygame.transform.scale(self.background, (self.screen_width, self.screen_height))
+            track(self.background, "menus", "main menu")
             return
         
         # Create forest gradient background
-        self.background = pygame.Surface((self.screen_width, self.screen_height))
+        self.background = track(pygame.Surface((self.screen_width, self.screen_height)), "menus", "main menu")
         
         # Forest gradient from dark green to lighter green
         for y in range(self.screen_height):
@@ -264,6 +269,10 @@ class MainMenu:
         controls_surface = self.font_small.render(controls_text, True, self.gray)
         controls_rect = controls_surface.get_rect(center=(self.screen_width // 2, self.screen_height - 50))
         surface.blit(controls_surface, controls_rect)
+        
+        # Asset warm-up progress
+        if self.preloader:
+            self.preloader.draw_progress(surface, self.font_small)
     
     def draw_high_scores(self, surface):
         """Draw high scores screen"""
@@ -280,7 +289,7 @@ class MainMenu:
                              firefly['size'])
         
         # Dark overlay
-        overlay = pygame.Surface((self.screen_width, self.screen_height))
+        overlay = track(pygame.Surface((self.screen_width, self.screen_height)), "menus", "main menu")
         overlay.set_alpha(120)
         overlay.fill((0, 0, 0))
         surface.blit(overlay, (0, 0))
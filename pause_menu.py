@@ -1,6 +1,7 @@
 # pause_menu.py - Pause menu system
 import pygame
 from safe_loader import safe_font
+from memory_accountant import track
 
 class PauseMenu:
     def __init__(self, screen_width, screen_height):
@@ -74,7 +75,7 @@ class PauseMenu:
     def draw_pause_menu(self, surface):
         """Draw pause menu"""
         # Semi-transparent overlay
-        overlay = pygame.Surface((self.screen_width, self.screen_height))
+        overlay = track(pygame.Surface((self.screen_width, self.screen_height)), "menus", "pause")
         overlay.set_alpha(150)
         overlay.fill((0, 0, 0))
         surface.blit(overlay, (0, 0))
@@ -86,7 +87,7 @@ class PauseMenu:
         menu_y = (self.screen_height - menu_height) // 2
         
         # Menu background with gradient effect
-        menu_bg = pygame.Surface((menu_width, menu_height))
+        menu_bg = track(pygame.Surface((menu_width, menu_height)), "menus", "pause")
         for y in range(menu_height):
             ratio = y / menu_height
             r = int(20 + ratio * 30)
@@ -124,7 +125,7 @@ class PauseMenu:
                 
                 # Highlight background
                 highlight_rect = pygame.Rect(menu_x + 20, start_y + i * option_spacing - 20, menu_width - 40, 40)
-                highlight_surface = pygame.Surface((menu_width - 40, 40))
+                highlight_surface = track(pygame.Surface((menu_width - 40, 40)), "menus", "pause")
                 highlight_surface.set_alpha(50)
                 highlight_surface.fill(self.green)
                 surface.blit(highlight_surface, highlight_rect)
@@ -144,7 +145,7 @@ class PauseMenu:
         from config import config
         
         # Semi-transparent overlay
-        overlay = pygame.Surface((self.screen_width, self.screen_height))
+        overlay = track(pygame.Surface((self.screen_width, self.screen_height)), "menus", "pause")
         overlay.set_alpha(150)
         overlay.fill((0, 0, 0))
         surface.blit(overlay, (0, 0))
@@ -156,7 +157,7 @@ class PauseMenu:
         menu_y = (self.screen_height - menu_height) // 2
         
         # Background with gradient
-        menu_bg = pygame.Surface((menu_width, menu_height))
+        menu_bg = track(pygame.Surface((menu_width, menu_height)), "menus", "pause")
         for y in range(menu_height):
             ratio = y / menu_height
             r = int(20 + ratio * 30)
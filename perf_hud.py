@@ -0,0 +1,201 @@
+# perf_hud.py - F4 performance overlay: rolling FPS, frame-time graph, phase timings
+#
+# start_game_loop() calls timer.mark(phase) of a PhaseTimer when a phase of
+# the frame ends and passes timer.mark to GameSession.tick() for the tick
+# phases, so every frame is split into FRAME_PHASES. Only while someone
+# reads the times (this overlay, the frame log): otherwise the loop skips all
+# marks and the overlay costs one attribute test. The "gc" phase is the
+# collection gc_policy runs after the flip; collections CPython starts on its
+# own land in whatever phase allocated, and the gc row shows their pauses.
+#
+# Drawing is kept cheap on purpose: the panel text is re-rendered one row
+# per frame (round robin, plain font.render - numbers change every frame and
+# would only churn the shared text cache), the graph is scrolled by a pixel
+# and gets one new column, and the panel is one opaque surface in the display
+# format (a surface-alpha panel blits ~6x slower).
+import time
+
+import numpy as np
+import pygame
+
+from game_session import TICK_PHASES
+from safe_loader import safe_font
+import tracing
+from memory_accountant import track
+
+# Фазы кадра в порядке выполнения
+FRAME_PHASES = ("events",) + TICK_PHASES + ("world_draw", "hud_draw", "flip", "gc")
+PHASE_LABELS = {
+    "events": "events", "waves_bosses": "waves/bosses", "player": "player",
+    "ghost_ai": "ghost AI", "effects": "fireballs/fx", "collisions": "collisions",
+    "items": "item logic", "world_draw": "world draw", "hud_draw": "HUD draw", "flip": "flip",
+    "gc": "gc (explicit)",
+}
+HISTORY = 120     # кадров в скользящем окне
+GRAPH_SIZE = (240, 48)
+GRAPH_MAX_MS = 50.0
+
+
+class FpsMeter:
+    """Rolling FPS over the last HISTORY frame times (what F3 shows)"""
+
+    def __init__(self, size=HISTORY):
+        self.times = [0.0] * size
+        self.index = 0
+        self.filled = 0
+        self.total = 0.0
+
+    def add(self, frame_dt):
+        times = self.times
+        self.total += frame_dt - times[self.index]
+        times[self.index] = frame_dt
+        self.index = (self.index + 1) % len(times)
+        if self.filled < len(times):
+            self.filled += 1
+
+    @property
+    def fps(self):
+        return self.filled / self.total if self.total > 0 else 0.0
+
+    def max_ms(self):
+        return max(self.times) * 1000
+
+
+class PhaseTimer:
+    """Splits one frame into FRAME_PHASES: mark(phase) ends the running phase"""
+
+    def __init__(self):
+        self.phase_index = {name: i for i, name in enumerate(FRAME_PHASES)}
+        self.current = [0.0] * len(FRAME_PHASES)
+        self.frame_start = 0.0
+        self.started = 0.0
+        self.keep_marks = False   # frame log: (phase, time) of every mark
+        self.marks = []
+
+    def begin_frame(self):
+        """Frame starts after the frame-cap wait (that sleep is not a phase)"""
+        self.frame_start = self.started = time.perf_counter()
+        if self.keep_marks:
+            self.marks = []
+
+    def mark(self, phase):
+        """Ends `phase`: the time since the previous mark is added to it"""
+        now = time.perf_counter()
+        self.current[self.phase_index[phase]] += now - self.started
+        tracing.record(phase, self.started, now)
+        self.started = now
+        if self.keep_marks:
+            self.marks.append((phase, now))
+
+    def take(self):
+        """Phase times of the finished frame (seconds); the timer starts from zero"""
+        times = self.current
+        self.current = [0.0] * len(times)
+        return times
+
+
+class PerfHud:
+    def __init__(self, fps_meter, budget_ms=1000 / 60):
+        self.visible = False
+        self.fps_meter = fps_meter
+        self.budget_ms = budget_ms
+        self.phase_index = {name: i for i, name in enumerate(FRAME_PHASES)}
+        self.history = np.zeros((HISTORY, len(FRAME_PHASES)))
+        self.frame = 0
+        self.font = None
+        self.rows = []
+        self.next_row = 0
+        self.panel = None
+        self.graph = None
+        self.counts = {}
+        self.gc_history = np.zeros((HISTORY, 2))   # новые объекты, пауза сборщика (мс)
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible and self.panel is None:
+            self._build()
+        return self.visible
+
+    def _build(self):
+        self.font = safe_font(8)
+        line = self.font.get_linesize() + 2
+        self.rows = ["fps", "frame"] + list(FRAME_PHASES) + ["gc_stats", "counts", "counts2"]
+        self.line_height = line
+        self.panel = pygame.Surface((GRAPH_SIZE[0] + 16, 16 + GRAPH_SIZE[1] + len(self.rows) * line)).convert()
+        track(self.panel, "hud", "perf overlay")
+        self.panel.fill((12, 12, 20))
+        self.graph = track(pygame.Surface(GRAPH_SIZE).convert(), "hud", "perf overlay")
+        self.graph.fill((0, 0, 0))
+
+    # --- сбор (только когда видим) ---
+
+    def end_frame(self, phases, counts, gc_frame=None):
+        """Stores a frame's phase times (PhaseTimer.take), counts and
+        GcPolicy.end_frame() stats, adds one graph column"""
+        self.history[self.frame % HISTORY] = phases
+        if gc_frame:
+            self.gc_history[self.frame % HISTORY] = (gc_frame[0], gc_frame[2])
+        self.frame += 1
+        frame_ms = sum(phases) * 1000
+        self.counts = counts
+        self._graph_column(frame_ms)
+
+    def _graph_column(self, frame_ms):
+        graph = self.graph
+        w, h = GRAPH_SIZE
+        graph.scroll(-1, 0)
+        graph.fill((0, 0, 0), (w - 1, 0, 1, h))
+        bar = min(h, int(frame_ms / GRAPH_MAX_MS * h))
+        if frame_ms <= self.budget_ms * 0.75:
+            color = (90, 220, 120)
+        elif frame_ms <= self.budget_ms:
+            color = (230, 210, 90)
+        else:
+            color = (240, 90, 80)
+        if bar:
+            graph.fill(color, (w - 1, h - bar, 1, bar))
+        budget_y = h - int(self.budget_ms / GRAPH_MAX_MS * h)
+        graph.set_at((w - 1, budget_y), (120, 120, 160))
+
+    # --- отрисовка ---
+
+    def _row_text(self, row):
+        frames = min(self.frame, HISTORY)
+        if row == "fps":
+            meter = self.fps_meter
+            return f"FPS {meter.fps:5.1f}   worst {meter.max_ms():5.1f} ms", (255, 255, 255)
+        if row == "frame":
+            if not frames:
+                return "work  -", (200, 200, 200)
+            work = self.history[:frames].sum(axis=1) * 1000
+            return f"work  avg {work.mean():5.2f}  max {work.max():5.2f} ms", (200, 200, 200)
+        if row == "gc_stats":
+            if not frames:
+                return "gc  -", (200, 200, 200)
+            allocs, pauses = self.gc_history[:frames].T
+            color = (240, 90, 80) if pauses.max() > self.budget_ms * 0.25 else (190, 190, 190)
+            return f"gc  {allocs.mean():5.0f} new/frame  pause max {pauses.max():5.2f}", color
+        if row == "counts":
+            c = self.counts
+            return (f"ghosts {c.get('ghosts', 0)}  fireballs {c.get('fireballs', 0)}",
+                    (160, 200, 255))
+        if row == "counts2":
+            c = self.counts
+            return (f"bullets {c.get('enemy_projectiles', 0)}  dmg numbers {c.get('damage_numbers', 0)}",
+                    (160, 200, 255))
+        column = self.history[:frames, self.phase_index[row]] * 1000 if frames else np.zeros(1)
+        mean = column.mean()
+        color = (240, 90, 80) if mean > self.budget_ms * 0.25 else (190, 190, 190)
+        return f"{PHASE_LABELS[row]:<13}{mean:6.2f} {column.max():6.2f}", color
+
+    def draw(self, surface):
+        """Blits the panel; re-renders one text row per frame"""
+        panel = self.panel
+        k = self.next_row
+        self.next_row = (k + 1) % len(self.rows)
+        text, color = self._row_text(self.rows[k])
+        y = 16 + GRAPH_SIZE[1] + k * self.line_height
+        panel.fill((12, 12, 20), (0, y, panel.get_width(), self.line_height))
+        panel.blit(self.font.render(text, False, color), (8, y))
+        panel.blit(self.graph, (8, 8))
+        surface.blit(panel, (surface.get_width() - panel.get_width() - 8, 8))
@@ -1,62 +1,26 @@
-from safe_loader import safe_load_image, safe_font
+from safe_loader import safe_load_image, safe_font, load_frames
+from animation import AnimationSet, get_animation_set
 import pygame
-import sys
-import os
-from damage_number import DamageNumber
+from damage_number import DAMAGE_NUMBER_POOL
 from shield_spell import ShieldSpell
-
-def resource_path(relative_path):
-    """ Получает путь к ресурсу для PyInstaller """
-    try:
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
-
-def safe_load_image(path, fallback_size=(64, 64)):
-    """Безопасная загрузка изображения"""
-    try:
-        full_path = resource_path(path)
-        if os.path.exists(full_path):
-            return pygame.image.load(full_path).convert_alpha()
-        else:
-            print(f"Image not found: {full_path}, creating fallback")
-            surface = pygame.Surface(fallback_size)
-            surface.fill((100, 100, 200))  # Синий цвет для игрока
-            return surface.convert_alpha()
-    except Exception as e:
-        print(f"Error loading image {path}: {e}, creating fallback")
-        surface = pygame.Surface(fallback_size)
-        surface.fill((100, 100, 200))
-        return surface.convert_alpha()
-
-def scale_frames(sheet, frame_count, frame_w, frame_h, scale):
-    return [
-        pygame.transform.scale(
-            sheet.subsurface(pygame.Rect(i * frame_w, 0, frame_w, frame_h)),
-            (int(frame_w * scale), int(frame_h * scale))
-        )
-        for i in range(frame_count)
-    ]
+from timestep import render_camera
+
+def build_player_animations():
+    # Левые листы мага нарисованы отдельно (кадры в обратном порядке, не зеркало правых),
+    # поэтому грузятся как есть. Нарезка как раньше: 7/10/10 кадров по 32px
+    return (
+        AnimationSet(scale=2)
+        .add("idle", "assets/mag stay sprite.png", 7, 32, 32,
+             left_path="assets/image_2025-05-09_17-50-33.png")
+        .add("shoot", "assets/mag shoot.png", 10, 32, 32,
+             left_path="assets/image_2025-05-09_19-26-15.png")
+        .add("run", "assets/mag run right.png", 10, 32, 32,
+             left_path="assets/image_2025-05-09_17-28-58.png")
+    )
 
 class Player:
     def __init__(self, x, y):
-        scale = 2
-
-        
-        self.idle_right_sheet = safe_load_image("assets/mag stay sprite.png", (320, 32))
-        self.idle_left_sheet = safe_load_image("assets/image_2025-05-09_17-50-33.png", (320, 32))
-        self.shoot_right_sheet = safe_load_image("assets/mag shoot.png", (320, 32))
-        self.shoot_left_sheet = safe_load_image("assets/image_2025-05-09_19-26-15.png", (320, 32))
-        self.run_right_sheet = safe_load_image("assets/mag run right.png", (320, 32))
-        self.run_left_sheet = safe_load_image("assets/image_2025-05-09_17-28-58.png", (320, 32))
-
-        self.idle_right_frames = scale_frames(self.idle_right_sheet, 7, 32, 32, scale)
-        self.idle_left_frames = scale_frames(self.idle_left_sheet, 7, 32, 32, scale)
-        self.shoot_right_frames = scale_frames(self.shoot_right_sheet, 10, 32, 32, scale)
-        self.shoot_left_frames = scale_frames(self.shoot_left_sheet, 10, 32, 32, scale)
-        self.run_right_frames = scale_frames(self.run_right_sheet, 10, 32, 32, scale)
-        self.run_left_frames = scale_frames(self.run_left_sheet, 10, 32, 32, scale)
+        self.animations = get_animation_set("player", build_player_animations, "Player")
 
         self.frame_index = 0
         self.animation_speed = 0.1
@@ -68,7 +32,10 @@ class Player:
         self.shooting = False
         self.shoot_animation_complete = False
 
-        self.rect = self.idle_right_frames[0].get_rect(center=(x, y))
+        self.rect = self.animations.frames("idle")[0].get_rect(center=(x, y))
+        # Дробная позиция отдельно от прямоугольника столкновений
+        self.pos = pygame.Vector2(self.rect.topleft)
+        self.prev_pos = pygame.Vector2(self.pos)
         self.speed = 200
 
         self.max_hp = 45
@@ -82,11 +49,7 @@ class Player:
         self.taking_damage = False
 
         # Безопасная загрузка полосы здоровья
-        hp_bar_sheet = safe_load_image("assets/Sprite-0001-Sheet.png", (288, 32))
-        self.hp_bar_frames = [
-            hp_bar_sheet.subsurface(pygame.Rect(i * 32, 0, 32, 32))
-            for i in range(9)
-        ]
+        self.hp_bar_frames = load_frames("assets/Sprite-0001-Sheet.png", 9, 32, 32)
 
         self.damage_numbers = []
 
@@ -112,7 +75,7 @@ class Player:
             self.show_hp_timer = 2
             self.taking_damage = True
             self.damage_cooldown = 0.3
-            self.damage_numbers.append(DamageNumber(self.rect.centerx, self.rect.top, sprite))
+            self.damage_numbers.append(DAMAGE_NUMBER_POOL.acquire(self.rect.centerx, self.rect.top, sprite))
 
     def recover_mana(self, dt):
         if self.mana < self.max_mana:
@@ -132,13 +95,20 @@ class Player:
         is_moving = direction.length() > 0
 
         # Физика движения
+        self.prev_pos.update(self.pos)
         if is_moving:
             direction.normalize_ip()
-            new_rect = self.rect.move(direction.x * self.speed * dt, 0)
-            if not any(new_rect.colliderect(w) for w in walls):
+            new_x = self.pos.x + direction.x * self.speed * dt
+            new_rect = self.rect.copy()
+            new_rect.x = round(new_x)
+            if not walls.collides(new_rect):
+                self.pos.x = new_x
                 self.rect.x = new_rect.x
-            new_rect = self.rect.move(0, direction.y * self.speed * dt)
-            if not any(new_rect.colliderect(w) for w in walls):
+            new_y = self.pos.y + direction.y * self.speed * dt
+            new_rect = self.rect.copy()
+            new_rect.y = round(new_y)
+            if not walls.collides(new_rect):
+                self.pos.y = new_y
                 self.rect.y = new_rect.y
 
         # Логика анимаций - ИСПРАВЛЕНО
@@ -151,8 +121,7 @@ class Player:
                 self.frame_index += 1
                 
                 # Получаем правильные кадры для текущего направления
-                current_frames = (self.shoot_right_frames if self.facing == "right" 
-                                else self.shoot_left_frames)
+                current_frames = self.animations.frames("shoot", self.facing)
                 
                 if self.frame_index >= len(current_frames):
                     # Анимация стрельбы завершена
@@ -206,20 +175,22 @@ class Player:
             dn.update(dt)
             if dn.finished:
                 self.damage_numbers.remove(dn)
+                DAMAGE_NUMBER_POOL.release(dn)
+
+    def move_to(self, x, y):
+        """Sets the float position (top-left) and syncs the collision rect"""
+        self.pos.update(x, y)
+        self.rect.topleft = (round(x), round(y))
 
     def get_current_frames(self):
         """Возвращает текущие кадры анимации"""
-        frames_map = {
-            "idle_right": self.idle_right_frames,
-            "idle_left": self.idle_left_frames,
-            "run_right": self.run_right_frames,
-            "run_left": self.run_left_frames,
-            "shoot_right": self.shoot_right_frames,
-            "shoot_left": self.shoot_left_frames,
-        }
-        return frames_map.get(self.current_animation, self.idle_right_frames)
-
-    def draw(self, surface, camera_offset):
+        frames = self.animations.get(self.current_animation)
+        if frames is None:
+            frames = self.animations.frames("idle")
+        return frames
+
+    def draw(self, surface, camera_offset, alpha=1.0):
+        camera_offset = render_camera(self, camera_offset, alpha)
         # Получаем правильные кадры для текущей анимации
         current_frames = self.get_current_frames()
         
@@ -227,10 +198,9 @@ class Player:
         self.frame_index = min(self.frame_index, len(current_frames) - 1)
         frame = current_frames[self.frame_index]
 
-        # Эффект мигания при получении урона
+        # Эффект мигания при получении урона (запеченные полупрозрачные кадры)
         if self.damage_cooldown > 0:
-            frame = frame.copy()
-            frame.set_alpha(128)
+            frame = self.animations.variant("hurt").get(self.current_animation, current_frames)[self.frame_index]
 
         surface.blit(frame, (self.rect.x - camera_offset.x, self.rect.y - camera_offset.y))
 
@@ -0,0 +1,92 @@
+# pool.py - free lists for short-lived entities (fireballs, projectiles, effects)
+#
+# Pooled classes build their per-instance objects (Rect, Vector2) once in
+# __init__ and put everything that depends on the spawn arguments into
+# reset(*args). Pool.acquire(*args) takes a free instance and resets it, and
+# release(obj) returns it. Nothing new is allocated while the pool has free objects.
+
+# Все пулы по имени (для статистики и прогрева)
+POOLS = {}
+
+
+class Pool:
+    def __init__(self, name, factory, prewarm=0):
+        self.name = name
+        self.factory = factory    # factory() -> новый объект (аргументы задает reset)
+        self.prewarm_count = prewarm
+        self.free = []
+        self.created = 0
+        self.acquired = 0
+        self.released = 0
+        self.in_use = 0
+        self.high_water = 0
+        POOLS[name] = self
+
+    def prewarm(self, count=None):
+        """Creates objects up front so combat does not allocate.
+
+        Call after the display is set up: constructors load (cached) images.
+        """
+        count = self.prewarm_count if count is None else count
+        while self.created < count:
+            self.free.append(self.factory())
+            self.created += 1
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+        else:
+            obj = self.factory()
+            self.created += 1
+        obj.reset(*args)
+        self.acquired += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        self.released += 1
+        self.in_use -= 1
+        self.free.append(obj)
+
+    def release_all(self, objs):
+        for obj in objs:
+            self.release(obj)
+
+    def reset(self):
+        """Forgets objects still out (e.g. lists of an abandoned game session)"""
+        self.in_use = 0
+
+    def adopt(self, objs):
+        """Counts objs as handed out: copies in a session restored from a snapshot,
+        which acquire() never returned but which will be released here"""
+        count = len(objs)
+        self.created += count
+        self.in_use += count
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+
+    def stats(self):
+        return {
+            "created": self.created,
+            "free": len(self.free),
+            "in_use": self.in_use,
+            "high_water": self.high_water,
+            "acquired": self.acquired,
+            "released": self.released,
+        }
+
+
+def prewarm_pools():
+    for pool in POOLS.values():
+        pool.prewarm()
+
+
+def reset_pools():
+    for pool in POOLS.values():
+        pool.reset()
+
+
+def get_pool_stats():
+    return {name: pool.stats() for name, pool in POOLS.items()}
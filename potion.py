@@ -1,31 +1,21 @@
-from safe_loader import safe_load_image, safe_font
+from safe_loader import load_frames
 import pygame
 
 class Potion:
+    __slots__ = ("frames", "frame_index", "timer", "rect", "active")
+
+    animation_speed = 0.15
+    item_type = "hilka"
+    lifetime = 25  # секунд на карте
+
     def __init__(self, x, y):
-        self.sheet = safe_load_image("assets/health_potion.png")
-        self.frames = [
-            self.sheet.subsurface(pygame.Rect(i * 128, 0, 128, 128))
-            for i in range(8)
-        ]
+        self.frames = load_frames("assets/health_potion.png", 8, 128, 128, owner="Potion")
         self.frame_index = 0
-        self.animation_speed = 0.15
         self.timer = 0
-        self.lifetime = 25  # секунд
         self.rect = pygame.Rect(x, y, 64, 64)  
         self.active = True
 
-    def update(self, dt):
-        self.timer += dt
-        if self.timer >= self.animation_speed:
-            self.timer = 0
-            self.frame_index = (self.frame_index + 1) % len(self.frames)
-
-        self.lifetime -= dt
-        if self.lifetime <= 0:
-            self.active = False
-
-    def draw(self, surface, camera_offset):
+    def draw(self, surface, camera_offset, alpha=1.0):
         if not self.active:
             return
         frame = self.frames[self.frame_index]
@@ -0,0 +1,212 @@
+# profiler.py - on-demand profiling of the running game loop (F5 / --profile-seconds N)
+#
+#   python main.py --profile-seconds 10 [--profile-mode sample|cprofile]
+#   in game: F5 - sampling capture, Shift+F5 - cProfile capture
+#
+# Two modes:
+#   sample    signal.setitimer(ITIMER_PROF) interrupts the process every few
+#             ms of CPU time and the SIGPROF handler counts the main thread's
+#             stack. The loop runs at full speed between samples, so the
+#             ghost-heavy frames keep their real shape (Linux/macOS only).
+#   cprofile  deterministic cProfile: exact call counts, but every Python call
+#             pays for the hook, which inflates ghost AI and the draw loops.
+#
+# Either way a capture writes to profiles/<date>-<time>-<mode>/:
+#   profile.pstats      python -m pstats / snakeviz
+#   profile.collapsed   flamegraph.pl / speedscope / inferno ("a;b;c count")
+#   top.txt             top functions by own time
+# For cProfile the collapsed stacks are rebuilt from the caller graph: a
+# function's own time is split over its callers in proportion to the time
+# each call edge took, so deep stacks are an estimate.
+import os
+import time
+import marshal
+import pstats
+import signal
+import cProfile
+from collections import Counter
+
+MODES = ("sample", "cprofile")
+SAMPLE_INTERVAL = 0.002   # секунды процессорного времени между сэмплами
+MAX_DEPTH = 64            # кадров стека в сэмпле / в восстановленном стеке cProfile
+MIN_SHARE = 1e-4          # cProfile: более тонкие ветки не разворачиваются
+
+
+def sampling_supported():
+    return hasattr(signal, "setitimer") and hasattr(signal, "SIGPROF")
+
+
+class Profiler:
+    """One capture at a time; the game loop calls poll() once per frame"""
+
+    def __init__(self, seconds=10.0, mode="sample", out_dir="profiles"):
+        self.seconds = seconds
+        self.mode = mode
+        self.out_dir = out_dir
+        self.active = None        # режим текущей записи
+        self.started = 0.0
+        self.profile = None
+        self.samples = None
+        self.last_path = None
+
+    # --- управление ---
+
+    def start(self, mode=None, seconds=None):
+        if self.active:
+            print("Profiler: capture already running")
+            return False
+        mode = mode or self.mode
+        if mode == "sample" and not sampling_supported():
+            print("Profiler: signal.setitimer is not available here, using cProfile")
+            mode = "cprofile"
+        self.capture_seconds = seconds or self.seconds
+        try:
+            if mode == "sample":
+                self.samples = Counter()
+                signal.signal(signal.SIGPROF, self._on_sample)
+                signal.setitimer(signal.ITIMER_PROF, SAMPLE_INTERVAL, SAMPLE_INTERVAL)
+            else:
+                self.profile = cProfile.Profile()
+                self.profile.enable()
+        except Exception as e:
+            print(f"Profiler start error: {e}")
+            return False
+        self.active = mode
+        self.started = time.perf_counter()
+        print(f"Profiler: {mode} capture for {self.capture_seconds:g} s")
+        return True
+
+    def poll(self):
+        """Ends the capture once its time is up; returns the output directory then"""
+        if self.active and time.perf_counter() - self.started >= self.capture_seconds:
+            return self.stop()
+        return None
+
+    def stop(self):
+        """Ends the capture now (end of game, quit) and writes the files"""
+        mode = self.active
+        if not mode:
+            return None
+        elapsed = time.perf_counter() - self.started
+        self.active = None
+        if mode == "sample":
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, signal.SIG_DFL)
+        else:
+            self.profile.disable()
+        path = os.path.join(self.out_dir, time.strftime("%Y%m%d-%H%M%S-") + mode)
+        try:
+            os.makedirs(path, exist_ok=True)
+            if mode == "sample":
+                stats, collapsed = self._sample_results()
+                with open(os.path.join(path, "profile.pstats"), "wb") as f:
+                    marshal.dump(stats, f)
+            else:
+                self.profile.dump_stats(os.path.join(path, "profile.pstats"))
+                collapsed = collapse_pstats(pstats.Stats(self.profile).stats)
+            with open(os.path.join(path, "profile.collapsed"), "w", encoding="utf-8") as f:
+                for stack, value in sorted(collapsed.items()):
+                    if value > 0:
+                        f.write(f"{stack} {value}\n")
+            with open(os.path.join(path, "top.txt"), "w", encoding="utf-8") as f:
+                f.write(f"{mode} capture, {elapsed:.1f} s\n")
+                pstats.Stats(os.path.join(path, "profile.pstats"), stream=f) \
+                    .sort_stats("tottime").print_stats(40)
+        except Exception as e:
+            print(f"Profiler write error: {e}")
+            return None
+        finally:
+            self.profile = None
+            self.samples = None
+        self.last_path = path
+        print(f"Profiler: {mode} capture ({elapsed:.1f} s) saved to {path}")
+        return path
+
+    # --- режим sample ---
+
+    def _on_sample(self, signum, frame):
+        # Обработчик сигнала выполняется в главном потоке: frame - то, что игра делала
+        stack = []
+        while frame is not None and len(stack) < MAX_DEPTH:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        self.samples[tuple(stack)] += 1
+
+    def _sample_results(self):
+        """pstats dict (times = samples * interval) and collapsed stacks (sample counts)"""
+        own = Counter()
+        total = Counter()
+        edges = Counter()
+        edges_total = Counter()
+        collapsed = Counter()
+        for stack, count in self.samples.items():
+            stack = stack[::-1]  # снаружи внутрь
+            collapsed[";".join(_label(c) for c in stack)] += count
+            own[stack[-1]] += count
+            for code in set(stack):
+                total[code] += count   # рекурсия считается один раз
+            for pair in set(zip(stack, stack[1:])):
+                edges_total[pair] += count
+            if len(stack) > 1:
+                edges[(stack[-2], stack[-1])] += count
+        callers = {code: {} for code in total}
+        for (caller, callee), n in edges_total.items():
+            self_n = edges.get((caller, callee), 0)
+            callers[callee][_key(caller)] = (n, n, self_n * SAMPLE_INTERVAL, n * SAMPLE_INTERVAL)
+        stats = {}
+        for code, count in total.items():
+            stats[_key(code)] = (count, count, own[code] * SAMPLE_INTERVAL,
+                                 count * SAMPLE_INTERVAL, callers[code])
+        return stats, collapsed
+
+
+def _key(code):
+    return (code.co_filename, code.co_firstlineno, getattr(code, "co_qualname", code.co_name))
+
+
+def _label(code):
+    return f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _pstats_label(func):
+    filename, _, name = func
+    if filename == "~":
+        return name  # встроенные функции: "<built-in method ...>"
+    return f"{os.path.basename(filename)}:{name}"
+
+
+def collapse_pstats(stats):
+    """Collapsed stacks (microseconds) estimated from a cProfile caller graph"""
+    collapsed = Counter()
+    memo = {}
+
+    def paths(func, depth, seen):
+        """[(stack tuple outermost first, share of func's time)]"""
+        if func in memo:
+            return memo[func]
+        callers = stats[func][4]
+        inclusive = stats[func][3]
+        result = []
+        if not callers or depth >= MAX_DEPTH or inclusive <= 0:
+            result = [((func,), 1.0)]
+        else:
+            total = sum(edge[3] for edge in callers.values()) or 1.0
+            for caller, edge in callers.items():
+                share = edge[3] / total
+                if share < MIN_SHARE or caller in seen or caller not in stats:
+                    continue
+                for stack, caller_share in paths(caller, depth + 1, seen | {func}):
+                    if share * caller_share >= MIN_SHARE:
+                        result.append((stack + (func,), share * caller_share))
+            if not result:
+                result = [((func,), 1.0)]
+        if not seen:
+            memo[func] = result
+        return result
+
+    for func, (cc, nc, tottime, cumtime, callers) in stats.items():
+        if tottime <= 0:
+            continue
+        for stack, share in paths(func, 0, frozenset()):
+            collapsed[";".join(_pstats_label(f) for f in stack)] += int(tottime * share * 1e6)
+    return collapsed
@@ -0,0 +1,195 @@
+# replay.py - record a game's input and play it back bit for bit
+#
+#   python main.py --record run.replay              # play (or --headless) and save the input
+#   python main.py --replay run.replay [--seek N]   # re-simulate and check every tick
+#
+# A game is a GameSession driven by (held movement keys, dt) once per fixed
+# tick plus gameplay key presses between ticks, from one seed. The file keeps
+# exactly that: the seed and the settings that change the simulation, the
+# movement mask run-length encoded ([mask, ticks] pairs), the key presses as
+# [ticks since the previous press, key] and a crc32 state hash per tick, all
+# as zlib-compressed JSON. ReplayPlayer re-runs the session from the seed and
+# reports the first tick whose hash differs. Every `keyframe_interval` ticks
+# it keeps a snapshot, so seek(t) restores the nearest keyframe at or before t
+# and simulates only the rest.
+import base64
+import json
+import time
+import zlib
+
+import numpy as np
+
+from config import config
+from game_session import GameSession, MOVE_KEYS
+from headless import BotKeys
+
+REPLAY_VERSION = 2
+
+
+def settings():
+    """Config values that change the simulation; a replay needs the same ones"""
+    return {
+        "sim_hz": config.SIM_HZ,
+        "difficulty": config.DIFFICULTY_MULTIPLIER,
+        "start_hp": config.PLAYER_START_HP,
+        "start_mana": config.PLAYER_START_MANA,
+        "boss_score": config.BOSS_SPAWN_SCORE_START,
+    }
+
+
+def walls_crc(wall_grid):
+    return zlib.crc32(repr([tuple(w) for w in wall_grid]).encode())
+
+
+class ReplayRecorder:
+    def __init__(self, session):
+        self.header = {
+            "version": REPLAY_VERSION,
+            "seed": session.seed,
+            "world": [session.bg_width, session.bg_height],
+            "walls_crc": walls_crc(session.wall_grid),
+            "settings": settings(),
+        }
+        self.moves = []      # [маска WASD, сколько тиков подряд]
+        self.keys = []       # [тиков с прошлого нажатия, клавиша]
+        self.hashes = []
+        self.last_key_tick = 0
+
+    def tick(self, keys):
+        """Held movement keys for the tick about to run"""
+        mask = 0
+        for bit, key in enumerate(MOVE_KEYS):
+            if keys[key]:
+                mask |= 1 << bit
+        if self.moves and self.moves[-1][0] == mask:
+            self.moves[-1][1] += 1
+        else:
+            self.moves.append([mask, 1])
+
+    def state(self, session):
+        """State hash after the tick"""
+        self.hashes.append(session.state_hash())
+
+    def key(self, session, key):
+        """Gameplay key press applied after session.tick_count ticks"""
+        tick = session.tick_count
+        self.keys.append([tick - self.last_key_tick, key])
+        self.last_key_tick = tick
+
+    def to_bytes(self):
+        data = dict(self.header)
+        data["ticks"] = len(self.hashes)
+        data["moves"] = self.moves
+        data["keys"] = self.keys
+        data["hashes"] = base64.b64encode(np.asarray(self.hashes, dtype="<u4").tobytes()).decode("ascii")
+        return zlib.compress(json.dumps(data, separators=(",", ":")).encode(), 9)
+
+    def save(self, path):
+        try:
+            with open(path, "wb") as f:
+                f.write(self.to_bytes())
+            print(f"Replay saved: {path} ({len(self.hashes)} ticks)")
+        except Exception as e:
+            print(f"Error saving replay {path}: {e}")
+
+
+def load_replay(path):
+    with open(path, "rb") as f:
+        data = json.loads(zlib.decompress(f.read()))
+    if data.get("version") != REPLAY_VERSION:
+        raise ValueError(f"unsupported replay version: {data.get('version')}")
+    return data
+
+
+class ReplayPlayer:
+    """Re-simulates a recorded game; make_session(seed) builds a fresh GameSession"""
+
+    def __init__(self, data, make_session, keyframe_interval=600):
+        self.data = data
+        self.make_session = make_session
+        self.keyframe_interval = keyframe_interval
+        self.total_ticks = data["ticks"]
+        self.dt = 1.0 / data["settings"]["sim_hz"]
+        masks = [mask for mask, _ in data["moves"]]
+        runs = [run for _, run in data["moves"]]
+        self.masks = np.repeat(np.array(masks, dtype=np.uint8), runs)
+        self.hashes = np.frombuffer(base64.b64decode(data["hashes"]), dtype="<u4")
+        self.presses = {}
+        tick = 0
+        for delta, key in data["keys"]:
+            tick += delta
+            self.presses.setdefault(tick, []).append(key)
+        self.held = []
+        for mask in range(1 << len(MOVE_KEYS)):
+            keys = BotKeys()
+            keys.held.update(key for bit, key in enumerate(MOVE_KEYS) if mask & (1 << bit))
+            self.held.append(keys)
+        self.keyframes = {}
+        self.diverged_at = None
+        self.session = None
+
+    def mismatches(self, session):
+        """Settings or map that differ from the recording (a replay would diverge)"""
+        problems = []
+        if settings() != self.data["settings"]:
+            problems.append(f"settings {settings()} != recorded {self.data['settings']}")
+        if walls_crc(session.wall_grid) != self.data["walls_crc"]:
+            problems.append("walls differ from the recorded map")
+        return problems
+
+    def start(self):
+        self.session = self.make_session(self.data["seed"])
+        self.diverged_at = None
+        self._press(self.session)
+        self.keyframes[0] = self.session.snapshot()
+        return self.session
+
+    def _press(self, session):
+        for key in self.presses.get(session.tick_count, ()):
+            session.handle_key(key)
+
+    def step(self):
+        """Runs one recorded tick; returns False at the end of the recording"""
+        session = self.session
+        t = session.tick_count
+        if t >= self.total_ticks:
+            return False
+        session.tick(self.held[self.masks[t]], self.dt)
+        if self.diverged_at is None and session.state_hash() != self.hashes[t]:
+            self.diverged_at = t + 1
+        self._press(session)
+        if session.tick_count % self.keyframe_interval == 0 and session.tick_count not in self.keyframes:
+            self.keyframes[session.tick_count] = session.snapshot()
+        return True
+
+    def run(self):
+        """Plays to the end; returns a summary (diverged_at is the first bad tick, or None)"""
+        if self.session is None:
+            self.start()
+        started = time.perf_counter()
+        while self.step():
+            pass
+        elapsed = time.perf_counter() - started
+        return {
+            "ticks": self.session.tick_count,
+            "recorded_ticks": self.total_ticks,
+            "verified": self.diverged_at is None and self.session.tick_count == self.total_ticks,
+            "diverged_at": self.diverged_at,
+            "score": self.session.score,
+            "seconds": round(elapsed, 3),
+            "keyframes": len(self.keyframes),
+        }
+
+    def seek(self, tick):
+        """Session at `tick`: nearest keyframe at or before it, then the remaining ticks"""
+        tick = max(0, min(tick, self.total_ticks))
+        if self.session is None:
+            self.start()
+        base = max(k for k in self.keyframes if k <= tick)
+        current = self.session.tick_count
+        # Вперед от текущего тика, если он ближе ключевого кадра
+        if not (base <= current <= tick):
+            self.session = GameSession.restore(self.keyframes[base])
+        while self.session.tick_count < tick:
+            self.step()
+        return self.session
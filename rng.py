@@ -0,0 +1,51 @@
+# rng.py - named, seeded random streams (one per subsystem)
+#
+# Every gameplay subsystem draws from its own random.Random, derived from the
+# session seed and the stream name. Adding a roll in one subsystem therefore
+# does not shift the numbers another subsystem sees, and the same seed plus
+# the same input always plays out the same game (replays, soak and perf runs).
+import random
+
+# Потоки, которые использует игра
+WAVES = "waves"            # сторона и тип призрака волны
+BOSSES = "bosses"          # место появления босса
+SUMMONS = "summons"        # призыв призраков боссами
+BOSS_MELEE = "boss_melee"  # 1% удар Пепе в ближнем бою
+ITEMS = "items"            # место зелий и грибов
+
+
+class RandomStreams:
+    def __init__(self, seed=0):
+        self.seed(seed)
+
+    def seed(self, seed):
+        self.base_seed = seed
+        self.streams = {}
+
+    def get(self, name):
+        stream = self.streams.get(name)
+        if stream is None:
+            stream = random.Random(f"{self.base_seed}:{name}")
+            self.streams[name] = stream
+        return stream
+
+    def getstate(self):
+        return self.base_seed, {name: s.getstate() for name, s in self.streams.items()}
+
+    def setstate(self, state):
+        base_seed, streams = state
+        self.seed(base_seed)
+        for name, s in streams.items():
+            self.get(name).setstate(s)
+
+
+STREAMS = RandomStreams()
+
+
+def stream(name):
+    return STREAMS.get(name)
+
+
+def new_seed():
+    """Fresh seed for an interactive game (recorded so the game can be replayed)"""
+    return random.SystemRandom().randrange(2 ** 32)
@@ -1,7 +1,13 @@
 import pygame
 import sys
 import os
+import io
 import json
+import mmap
+import struct
+from collections import OrderedDict
+import tracing
+from memory_accountant import track, track_all, created_total
 
 def resource_path(relative_path):
     try:
@@ -10,28 +16,392 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+
+# Пакет ресурсов (build_pack.py): один файл, открывается один раз через mmap.
+# Формат: MAGIC, uint32 длина индекса, JSON-индекс {путь: [offset, size]}, данные.
+ASSET_PACK = "assets.pak"
+PACK_MAGIC = b"ASHPAK01"
+_pack = None
+
+
+class PackEntryReader(io.RawIOBase):
+    """Read-only file object over a slice of the mmapped pack (no full copy)"""
+
+    def __init__(self, view):
+        self.view = view
+        self.pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = min(len(buffer), len(self.view) - self.pos)
+        if n <= 0:
+            return 0
+        buffer[:n] = self.view[self.pos:self.pos + n]
+        self.pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.pos
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        self.pos = max(0, min(offset, len(self.view)))
+        return self.pos
+
+    def tell(self):
+        return self.pos
+
+
+def open_pack(pack_path=None):
+    """Maps the asset pack once; returns its index ({} when there is no pack)"""
+    global _pack
+    if _pack is not None:
+        return _pack["index"]
+
+    pack_path = pack_path or ASSET_PACK
+    _pack = {"index": {}, "view": None, "mmap": None}
+    full_path = resource_path(pack_path)
+    if not os.path.exists(full_path):
+        return _pack["index"]
+
+    try:
+        with open(full_path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if data[:len(PACK_MAGIC)] != PACK_MAGIC:
+            raise ValueError("bad pack header")
+        header_end = len(PACK_MAGIC) + 4
+        (index_size,) = struct.unpack("<I", data[len(PACK_MAGIC):header_end])
+        index = json.loads(bytes(data[header_end:header_end + index_size]).decode("utf-8"))
+        _pack = {"index": index, "view": memoryview(data), "mmap": data}
+        print(f"Asset pack opened: {len(index)} entries")
+    except Exception as e:
+        print(f"Error opening asset pack {pack_path}: {e}, using loose files")
+        _pack = {"index": {}, "view": None, "mmap": None}
+    return _pack["index"]
+
+
+def get_pack_entry(path):
+    """Zero-copy memoryview of a packed file, or None"""
+    entry = open_pack().get(path.replace("\\", "/"))
+    if entry is None:
+        return None
+    offset, size = entry
+    return _pack["view"][offset:offset + size]
+
+
+def open_asset(path):
+    """File object for path: from the pack if present, else None"""
+    view = get_pack_entry(path)
+    if view is None:
+        return None
+    return PackEntryReader(view)
+
+
+def asset_exists(path):
+    return get_pack_entry(path) is not None or os.path.exists(resource_path(path))
+
+
+def read_asset_text(path):
+    """Whole text file from the pack or from disk (raises if missing)"""
+    view = get_pack_entry(path)
+    if view is not None:
+        return bytes(view).decode("utf-8")
+    with open(resource_path(path)) as f:
+        return f.read()
+
+
+@tracing.traced("asset.decode")
+def decode_image(path, full_path=None):
+    """Decodes an image without convert (safe to call from worker threads)"""
+    reader = open_asset(path)
+    if reader is not None:
+        return pygame.image.load(reader, os.path.basename(path))
+    return pygame.image.load(full_path or resource_path(path))
+
+# Поверхности, заранее декодированные AssetPreloader (уже после convert_alpha)
+_preloaded_images = {}
+
+
+def register_preloaded(path, surface):
+    _preloaded_images[path.replace("\\", "/")] = track(surface, "assets", "images")
+
+
+# Счетчик загрузок (лог кадров считает разницу за кадр)
+_alloc_stats = {"asset_loads": 0}
+
+
+def get_alloc_counts():
+    """(asset loads, tagged surfaces created) so far"""
+    return _alloc_stats["asset_loads"], created_total()
+
+
+@tracing.traced("asset.load")
+def _load_converted(path, full_path):
+    surface = _preloaded_images.get(path.replace("\\", "/"))
+    if surface is not None:
+        return surface
+    _alloc_stats["asset_loads"] += 1
+    return track(decode_image(path, full_path).convert_alpha(), "assets", "images")
+
+
 def safe_load_image(path, fallback_size=(64, 64), fallback_color=(100, 100, 100)):
+    image = _try_load_image(path)
+    if image is None:
+        image = _fallback_image(fallback_size, fallback_color)
+    return image
+
+
+def _try_load_image(path):
+    """The decoded image, or None (with a message) if it is missing or broken"""
+    # Если собран атлас, лист берется из него (subsurface, только для чтения)
+    atlas_image = get_atlas_image(path)
+    if atlas_image is not None:
+        return atlas_image
     try:
         full_path = resource_path(path)
-        if os.path.exists(full_path):
-            return pygame.image.load(full_path).convert_alpha()
-        else:
-            print(f"Image not found: {full_path}, creating fallback")
-            surface = pygame.Surface(fallback_size)
-            surface.fill(fallback_color)
-            return surface.convert_alpha()
+        if get_pack_entry(path) is not None or os.path.exists(full_path):
+            return _load_converted(path, full_path)
+        print(f"Image not found: {full_path}, creating fallback")
     except Exception as e:
         print(f"Error loading image {path}: {e}, creating fallback")
-        surface = pygame.Surface(fallback_size)
-        surface.fill(fallback_color)
-        return surface.convert_alpha()
+    return None
+
+
+def _fallback_image(size, color=(100, 100, 100)):
+    surface = pygame.Surface(size)
+    surface.fill(color)
+    return track(surface.convert_alpha(), "assets", "fallbacks")
+
+# Реестр шрифтов: один pygame.font.Font на (путь, размер)
+_font_cache = {}
+# LRU отрендеренных строк: (font, text, color, antialias) -> Surface
+TEXT_CACHE_SIZE = 256
+_text_cache = OrderedDict()
+_text_stats = {"hits": 0, "misses": 0}
+
 
 def safe_font(size, font_path="assets/PressStart2P-Regular.ttf"):
+    key = (font_path, size)
+    font = _font_cache.get(key)
+    if font is not None:
+        return font
     try:
         full_path = resource_path(font_path)
-        if os.path.exists(full_path):
-            return pygame.font.Font(full_path, size)
+        reader = open_asset(font_path)
+        if reader is not None:
+            font = pygame.font.Font(reader, size)
+        elif os.path.exists(full_path):
+            font = pygame.font.Font(full_path, size)
         else:
-            return pygame.font.Font(None, size)
+            font = pygame.font.Font(None, size)
     except Exception as e:
-        return pygame.font.Font(None, size)
+        font = pygame.font.Font(None, size)
+    _font_cache[key] = font
+    return font
+
+
+def render_text(font, text, color, antialias=True):
+    """Cached font.render; the returned surface is shared, do not modify it"""
+    key = (font, text, tuple(color), antialias)
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_stats["hits"] += 1
+        _text_cache.move_to_end(key)
+        return surface
+
+    _text_stats["misses"] += 1
+    surface = track(font.render(text, antialias, color), "hud", "text cache")
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surface
+
+
+def get_text_cache_stats():
+    """Hit/miss counters of the rendered-text cache and font registry size"""
+    total = _text_stats["hits"] + _text_stats["misses"]
+    return {
+        "hits": _text_stats["hits"],
+        "misses": _text_stats["misses"],
+        "hit_rate": _text_stats["hits"] / total if total else 0.0,
+        "entries": len(_text_cache),
+        "fonts": len(_font_cache),
+    }
+
+
+# Атлас спрайтов, собранный build_atlas.py: несколько страниц вместо 45+ PNG.
+ATLAS_MANIFEST = "assets/atlas/atlas.json"
+_atlas_images = None
+
+
+@tracing.traced("asset.atlas")
+def load_atlas(manifest_path=ATLAS_MANIFEST):
+    """Decodes the atlas pages once and maps asset paths to page subsurfaces"""
+    global _atlas_images
+    if _atlas_images is not None:
+        return _atlas_images
+
+    _atlas_images = {}
+    if not asset_exists(manifest_path):
+        return _atlas_images
+
+    try:
+        manifest = json.loads(read_asset_text(manifest_path))
+        atlas_dir = os.path.dirname(resource_path(manifest_path))
+        manifest_dir = os.path.dirname(manifest_path)
+        pages = [
+            _load_converted(f"{manifest_dir}/{page_name}", os.path.join(atlas_dir, page_name))
+            for page_name in manifest["pages"]
+        ]
+        track_all(pages, "assets", "atlas")
+        for name, entry in manifest["images"].items():
+            page = pages[entry["page"]]
+            _atlas_images[name] = page.subsurface(pygame.Rect(entry["rect"]))
+        print(f"Atlas loaded: {len(_atlas_images)} images from {len(pages)} page(s)")
+    except Exception as e:
+        print(f"Error loading atlas {manifest_path}: {e}, using loose files")
+        _atlas_images = {}
+    return _atlas_images
+
+
+def get_atlas_image(path):
+    """Atlas subsurface for an asset path, or None if it is not packed"""
+    return load_atlas().get(path.replace("\\", "/"))
+
+
+# Общий реестр спрайтов: каждый лист декодируется один раз на процесс,
+# а нарезанные/масштабированные кадры раздаются всем сущностям как кортежи.
+_sheet_cache = {}
+_image_cache = {}
+_frames_cache = {}
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _cache_get(cache, key):
+    value = cache.get(key)
+    if value is None:
+        _cache_stats["misses"] += 1
+    else:
+        _cache_stats["hits"] += 1
+    return value
+
+
+def load_sheet(path, fallback_size=(64, 64)):
+    """Returns the shared decoded sheet for path (never modify it)"""
+    sheet = _sheet_cache.get(path)
+    if sheet is not None:
+        return sheet
+    # Заглушка зависит от размера, который просит вызывающий: ключ (путь, размер)
+    fallback_key = (path, fallback_size)
+    sheet = _sheet_cache.get(fallback_key)
+    if sheet is None:
+        sheet = _try_load_image(path)
+        if sheet is not None:
+            _sheet_cache[path] = sheet
+        else:
+            sheet = _fallback_image(fallback_size)
+            _sheet_cache[fallback_key] = sheet
+    return sheet
+
+
+def load_image(path, size=None, angle=0, flip=False, fallback_size=(64, 64), owner=None):
+    """Shared single image, optionally scaled to size, flipped and rotated
+
+    owner: entity type the transformed copy is accounted to (memory_accountant)
+    """
+    key = (path, size, angle, flip)
+    image = _cache_get(_image_cache, key)
+    if image is not None:
+        return image
+
+    image = load_sheet(path, fallback_size)
+    if size is not None:
+        image = pygame.transform.scale(image, size)
+    if flip:
+        image = pygame.transform.flip(image, True, False)
+    if angle:
+        image = pygame.transform.rotate(image, angle)
+    if size is not None or flip or angle:
+        track(image, "entities" if owner else "assets", owner or "transformed")
+    _image_cache[key] = image
+    return image
+
+
+def load_frames(path, frame_count=None, frame_w=None, frame_h=None, scale=1, flip=False,
+                fallback_size=None, owner=None):
+    """Shared tuple of frames cut from a horizontal sheet.
+
+    frame_w/frame_h default to sheet width // frame_count and the sheet height,
+    frame_count defaults to sheet width // frame_w. owner: entity type the
+    scaled/flipped copies are accounted to (memory_accountant).
+    """
+    key = (path, frame_count, frame_w, frame_h, scale, flip)
+    frames = _cache_get(_frames_cache, key)
+    if frames is not None:
+        return frames
+
+    if fallback_size is None:
+        if frame_count and frame_w and frame_h:
+            fallback_size = (frame_w * frame_count, frame_h)
+        else:
+            fallback_size = (64, 64)
+    sheet = load_sheet(path, fallback_size)
+    sheet_w, sheet_h = sheet.get_size()
+
+    if frame_count is None:
+        frame_count = max(1, sheet_w // frame_w) if frame_w else 1
+    if frame_w is None:
+        frame_w = sheet_w // frame_count
+    if frame_h is None:
+        frame_h = sheet_h
+
+    # Если лист меньше ожидаемого (fallback), растягиваем его под раскладку
+    if sheet_w < frame_w * frame_count or sheet_h < frame_h:
+        sheet = pygame.transform.scale(sheet, (frame_w * frame_count, frame_h))
+
+    size = (int(frame_w * scale), int(frame_h * scale))
+    result = []
+    for i in range(frame_count):
+        frame = sheet.subsurface(pygame.Rect(i * frame_w, 0, frame_w, frame_h))
+        if scale != 1:
+            frame = pygame.transform.scale(frame, size)
+        if flip:
+            frame = pygame.transform.flip(frame, True, False)
+        result.append(frame)
+
+    frames = tuple(result)
+    if scale != 1 or flip:
+        track_all(frames, "entities" if owner else "assets", owner or "frames")
+    _frames_cache[key] = frames
+    return frames
+
+
+def get_cache_stats():
+    """Hit/miss counters and entry counts of the sprite registry"""
+    return {
+        "hits": _cache_stats["hits"],
+        "misses": _cache_stats["misses"],
+        "sheets": len(_sheet_cache),
+        "images": len(_image_cache),
+        "frame_sets": len(_frames_cache),
+    }
+
+
+def clear_cache():
+    """Drops every cached surface (e.g. after the display mode changes)"""
+    global _atlas_images
+    _atlas_images = None
+    _preloaded_images.clear()
+    _sheet_cache.clear()
+    _image_cache.clear()
+    _frames_cache.clear()
+    _cache_stats["hits"] = 0
+    _cache_stats["misses"] = 0
+    _text_cache.clear()
+    _text_stats["hits"] = 0
+    _text_stats["misses"] = 0
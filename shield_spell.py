@@ -1,5 +1,6 @@
 import pygame
 from safe_loader import safe_load_image
+from memory_accountant import track, track_all
 
 class ShieldSpell:
     def __init__(self, player, sprite_path="assets/shield_spell.png", scale=2):
@@ -12,7 +13,7 @@ class ShieldSpell:
         except:
             print(f"Creating fallback shield sprites")
             
-            self.sheet = pygame.Surface((192, 32), pygame.SRCALPHA)
+            self.sheet = track(pygame.Surface((192, 32), pygame.SRCALPHA), "entities", "ShieldSpell")
             colors = [(100, 150, 255), (80, 130, 235), (60, 110, 215), 
                      (40, 90, 195), (20, 70, 175), (100, 100, 100)]
             for i, color in enumerate(colors):
@@ -24,6 +25,7 @@ class ShieldSpell:
                 (32 * scale, 32 * scale)
             ) for i in range(6)
         ]
+        track_all(self.frames, "entities", "ShieldSpell")
         
         self.active = False
         self.appearing = True
@@ -77,6 +79,12 @@ class ShieldSpell:
                     else:
                         self.current_frame = 5
 
+    def hit_rect(self):
+        """World rect that catches enemy projectiles while the shield is up, else None"""
+        if self.active and self.current_frame < len(self.frames):
+            return self.frames[self.current_frame].get_rect(center=self.player.rect.center)
+        return None
+
     def draw(self, surface, camera_offset):
         if self.active and self.current_frame < len(self.frames):
             shield_image = self.frames[self.current_frame]
@@ -0,0 +1,102 @@
+# snapshot.py - deep copies of live game state for replay keyframes
+#
+# clone() copies the object graph the way copy.deepcopy would, with the
+# exceptions that make it usable on a running game: Surfaces, fonts and
+# other C objects without Python state are shared (they are never mutated
+# during play), tuples of shared items are reused as is, NumPy arrays are
+# copied with .copy() and random.Random keeps its exact state. Objects in
+# `shared` (the wall grid, pools, caches) are referenced, not copied.
+import random
+import types
+
+import numpy as np
+import pygame
+
+ATOMIC = (
+    type(None), bool, int, float, complex, str, bytes, range, type,
+    types.FunctionType, types.BuiltinFunctionType, types.MethodType, types.ModuleType,
+    pygame.Surface,
+)
+
+
+def _slot_names(cls):
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name not in ("__dict__", "__weakref__"):
+                yield name
+
+
+def clone(obj, shared=(), memo=None):
+    """Deep copy of obj; ids in `shared` and objects of SHARED_TYPES are kept by reference"""
+    if memo is None:
+        memo = {}
+        for item in shared:
+            memo[id(item)] = item
+    return _clone(obj, memo)
+
+
+def _clone(obj, memo):
+    key = id(obj)
+    found = memo.get(key)
+    if found is not None:
+        return found
+    cls = type(obj)
+    if cls in ATOMIC or isinstance(obj, SHARED_TYPES):
+        return obj
+
+    if cls is list:
+        new = []
+        memo[key] = new
+        new.extend(_clone(item, memo) for item in obj)
+    elif cls is dict:
+        new = {}
+        memo[key] = new
+        for k, v in obj.items():
+            new[_clone(k, memo)] = _clone(v, memo)
+    elif cls is tuple:
+        items = tuple(_clone(item, memo) for item in obj)
+        new = obj if all(a is b for a, b in zip(items, obj)) else items
+        memo[key] = new
+    elif cls is set:
+        new = {_clone(item, memo) for item in obj}
+        memo[key] = new
+    elif cls is np.ndarray:
+        new = obj.copy()
+        memo[key] = new
+    elif cls is pygame.Rect:
+        new = pygame.Rect(obj)
+        memo[key] = new
+    elif cls is pygame.Vector2:
+        new = pygame.Vector2(obj)
+        memo[key] = new
+    elif isinstance(obj, random.Random):
+        new = cls()
+        new.setstate(obj.getstate())
+        memo[key] = new
+    elif hasattr(obj, "__dict__") or any(True for _ in _slot_names(cls)):
+        new = cls.__new__(cls)
+        memo[key] = new
+        for name in _slot_names(cls):
+            if hasattr(obj, name):
+                setattr(new, name, _clone(getattr(obj, name), memo))
+        if hasattr(obj, "__dict__"):
+            for name, value in obj.__dict__.items():
+                new.__dict__[name] = _clone(value, memo)
+    else:
+        # C-объекты без Python-состояния (шрифты, numpy-скаляры) не меняются - общие
+        new = obj
+        memo[key] = new
+    return new
+
+
+# Классы, чьи объекты общие для всех копий (кэши и реестры)
+SHARED_TYPES = ()
+
+
+def share_type(*classes):
+    """Marks classes whose instances are shared registries (never copied)"""
+    global SHARED_TYPES
+    SHARED_TYPES = SHARED_TYPES + tuple(classes)
@@ -0,0 +1,85 @@
+# systems.py - per-tick systems over the ecs.World
+#
+# Components used by the game (see start_game_loop):
+#   body      the entity object (rect, draw(surface, camera_offset, alpha))
+#   velocity  Vector2, pixels per second; body has pos / prev_pos
+#   lifetime  seconds left
+#   anim      True - looping animation, False - play once, then destroy;
+#             body has frames, frame_index, timer, animation_speed
+#   item      inventory item type picked up on contact
+from collision import LAYER_BOSS
+
+FIREBALL_BOSS_DAMAGE = 5
+FIREBALL_GHOST_DAMAGE = 1
+
+
+def movement_system(world, dt):
+    for table in world.query("body", "velocity"):
+        for body, velocity in zip(table.columns["body"], table.columns["velocity"]):
+            body.prev_pos.update(body.pos)
+            body.pos += velocity * dt
+            body.rect.topleft = (round(body.pos.x), round(body.pos.y))
+
+
+def animation_system(world, dt):
+    for table in world.query("body", "anim"):
+        for entity, body, loop in zip(table.entities, table.columns["body"], table.columns["anim"]):
+            body.timer += dt
+            if body.timer >= body.animation_speed:
+                body.timer = 0
+                body.frame_index += 1
+                if body.frame_index >= len(body.frames):
+                    if loop:
+                        body.frame_index = 0
+                    else:
+                        body.frame_index -= 1
+                        world.destroy(entity)
+
+
+def lifetime_system(world, dt):
+    for table in world.query("lifetime"):
+        entities = table.entities
+        lifetime = table.columns["lifetime"]
+        for row in range(len(lifetime)):
+            lifetime[row] -= dt
+            if lifetime[row] <= 0:
+                world.destroy(entities[row])
+
+
+def collision_system(world, collision_phase, player, ghosts, bosses):
+    """One spatial-hash pass; ghost touches are left to GhostSwarm.contact_damage"""
+    return collision_phase.run(player, ghosts,
+                               world.archetypes["fireball"].columns["body"],
+                               bosses,
+                               world.archetypes["pickup"].columns["body"],
+                               ghost_contacts=False)
+
+
+def damage_system(world, contacts, inventory):
+    """Applies contact events; returns the ghosts killed this tick (in kill order)"""
+    killed = {}
+    for kind, a, b in contacts:
+        if kind == "fireball":
+            # Огненный шар поражает одну цель: сначала боссы, потом призраки по порядку
+            for layer, target in b:
+                if layer == LAYER_BOSS:
+                    target.take_damage(FIREBALL_BOSS_DAMAGE)
+                elif target in killed:
+                    continue
+                else:
+                    target.hp -= FIREBALL_GHOST_DAMAGE
+                    if target.hp <= 0:
+                        killed[target] = None
+                world.destroy(world.entity_of(a))
+                break
+        elif kind == "pickup":
+            entity = world.entity_of(a)
+            inventory.add_item(world.get(entity, "item"))
+            world.destroy(entity)
+    return list(killed)
+
+
+def render_system(world, surface, camera_offset, alpha):
+    for table in world.query("body"):
+        for body in table.columns["body"]:
+            body.draw(surface, camera_offset, alpha)
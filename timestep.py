@@ -0,0 +1,55 @@
+# timestep.py - fixed-rate simulation clock and render interpolation helpers
+#
+# The game loop feeds the real frame time into FixedTimestep.advance() and runs
+# that many simulation ticks of exactly `step` seconds. Moving entities keep a
+# float `pos` (and `prev_pos` from the previous tick) apart from their integer
+# collision rect; drawing blends the two with `alpha`, the fraction of a tick
+# that has not been simulated yet.
+import pygame
+
+
+class FixedTimestep:
+    def __init__(self, hz=60, max_substeps=5):
+        self.hz = hz
+        self.step = 1.0 / hz
+        self.max_substeps = max_substeps
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.dropped_time = 0.0  # время, отброшенное после слишком долгих кадров
+
+    def advance(self, frame_dt):
+        """Adds real frame time and returns how many ticks to simulate now"""
+        self.accumulator += frame_dt
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_substeps:
+            # Не догоняем бесконечно: лишнее время просто пропускаем
+            skipped = steps - self.max_substeps
+            self.accumulator -= skipped * self.step
+            self.dropped_time += skipped * self.step
+            steps = self.max_substeps
+        self.accumulator -= steps * self.step
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self):
+        return min(1.0, self.accumulator / self.step)
+
+    def reset(self):
+        self.accumulator = 0.0
+
+
+def interpolate(prev_pos, pos, alpha):
+    return (prev_pos.x + (pos.x - prev_pos.x) * alpha,
+            prev_pos.y + (pos.y - prev_pos.y) * alpha)
+
+
+def render_camera(entity, camera_offset, alpha):
+    """Camera shifted so that drawing at entity.rect lands on the interpolated position.
+
+    Lets draw() keep using self.rect for the sprite and everything attached to it
+    (shield, hp bar) while showing the entity between its last two ticks.
+    """
+    x, y = interpolate(entity.prev_pos, entity.pos, alpha)
+    return pygame.Vector2(camera_offset.x - (x - entity.rect.x),
+                          camera_offset.y - (y - entity.rect.y))
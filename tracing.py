@@ -0,0 +1,150 @@
+# tracing.py - timeline spans exported as Chrome / Perfetto trace JSON (--trace PATH)
+#
+#   with tracing.span("ghost_ai"):          # context manager
+#       ...
+#   @tracing.traced("BossManager.update")  # decorator
+#   def update(self, ...):
+#
+#   python main.py --trace trace.json     # open in ui.perfetto.dev or chrome://tracing
+#
+# Spans stay in the code for good. While tracing is off span() returns one
+# shared do-nothing object and traced functions test one global before
+# calling through (costs: benchmarks/bench_tracing.py).
+# While on, a finished span is one tuple stored into a preallocated ring of
+# `capacity` slots (the oldest spans are overwritten), from any thread - the
+# asset preloader's decode threads get their own rows in the timeline.
+# Nothing is formatted until save().
+import os
+import json
+import time
+import threading
+import itertools
+from functools import wraps
+
+_ring = None          # list of (name, thread id, start, end), None while off
+_capacity = 0
+_next = None          # itertools.count: next(...) is atomic under the GIL
+_threads = {}
+_origin = 0.0
+perf_counter = time.perf_counter
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, self.start, perf_counter())
+        return False
+
+
+def span(name):
+    """Context manager timing one named span"""
+    if _ring is None:
+        return NULL_SPAN
+    return Span(name)
+
+
+def traced(name):
+    """Decorator: times every call of the function as span `name`"""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _ring is None:
+                return func(*args, **kwargs)
+            begin = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, begin, perf_counter())
+        return wrapper
+    return decorate
+
+
+def enabled():
+    return _ring is not None
+
+
+def now():
+    """Span start for record(); 0.0 while off"""
+    return perf_counter() if _ring is not None else 0.0
+
+
+def record(name, start, end):
+    """Stores a finished span (perf_counter seconds); used by PhaseTimer and Span"""
+    ring = _ring
+    if ring is None:
+        return
+    index = next(_next)
+    tid = threading.get_ident()
+    if tid not in _threads:
+        _threads[tid] = threading.current_thread().name
+    ring[index % _capacity] = (name, tid, start, end)
+
+
+def start(capacity=1 << 20):
+    """Allocates the ring and turns tracing on"""
+    global _ring, _capacity, _next, _origin
+    _capacity = capacity
+    _next = itertools.count()
+    _threads.clear()
+    _origin = perf_counter()
+    _ring = [None] * capacity
+    print(f"Tracing on ({capacity} spans)")
+
+
+def stop(path=None):
+    """Turns tracing off; writes the trace to `path` if given. Returns the span count"""
+    global _ring
+    ring, _ring = _ring, None
+    if ring is None:
+        return 0
+    spans = [s for s in ring if s is not None]
+    overwritten = max(0, next(_next) - _capacity)
+    if path:
+        try:
+            save(path, spans, overwritten)
+        except Exception as e:
+            print(f"Trace save error: {e}")
+    return len(spans)
+
+
+def save(path, spans, overwritten=0):
+    pid = os.getpid()
+    # Главный поток - первая строка таймлайна
+    main_id = threading.main_thread().ident
+    tids = {tid: i for i, tid in enumerate(sorted(_threads, key=lambda t: t != main_id))}
+    events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "Ashchime"}}]
+    for tid, index in tids.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": index,
+                       "args": {"name": _threads[tid]}})
+        events.append({"name": "thread_sort_index", "ph": "M", "pid": pid, "tid": index,
+                       "args": {"sort_index": index}})
+    spans.sort(key=lambda s: s[2])
+    for name, tid, begin, end in spans:
+        events.append({"name": name, "ph": "X", "pid": pid, "tid": tids[tid],
+                       "ts": round((begin - _origin) * 1e6, 3),
+                       "dur": round((end - begin) * 1e6, 3)})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                   "otherData": {"overwritten_spans": overwritten}}, f)
+    print(f"Trace saved: {path} ({len(spans)} spans, {overwritten} overwritten)")
@@ -0,0 +1,99 @@
+# wall_grid.py - walls.json compiled into a 32px occupancy bitmap
+#
+# Every wall-aware entity asks the grid instead of looping over the wall list:
+# a rect query only visits the cells it covers, so the cost does not grow with
+# the number of wall tiles placed in wall_editor.py.
+import pygame
+
+CELL_SIZE = 32  # тот же шаг, что у сетки wall_editor.py
+
+# Значения ячеек битовой карты
+EMPTY = 0
+SOLID = 1    # ячейка целиком закрыта стеной
+PARTIAL = 2  # стена задевает ячейку частично - проверяем её прямоугольники
+
+
+class WallGrid:
+    def __init__(self, walls, world_width, world_height, cell_size=CELL_SIZE):
+        self.walls = [pygame.Rect(w) for w in walls]
+        self.cell_size = cell_size
+        right = max([world_width] + [w.right for w in self.walls])
+        bottom = max([world_height] + [w.bottom for w in self.walls])
+        self.cols = -(-right // cell_size)
+        self.rows = -(-bottom // cell_size)
+        self.cells = bytearray(self.cols * self.rows)
+        self.partial = {}   # индекс ячейки -> стены, частично её задевающие
+        self.outside = []   # стены с отрицательными координатами (проверяются напрямую)
+        for wall in self.walls:
+            self._add(wall)
+
+    @classmethod
+    def from_json_data(cls, wall_data, world_width, world_height, cell_size=CELL_SIZE):
+        return cls([pygame.Rect(*r) for r in wall_data], world_width, world_height, cell_size)
+
+    def _add(self, wall):
+        if wall.w <= 0 or wall.h <= 0:
+            return
+        if wall.left < 0 or wall.top < 0:
+            self.outside.append(wall)
+            wall = wall.clip(pygame.Rect(0, 0, self.cols * self.cell_size, self.rows * self.cell_size))
+            if not wall.w or not wall.h:
+                return
+        size = self.cell_size
+        for cy in range(wall.top // size, (wall.bottom - 1) // size + 1):
+            for cx in range(wall.left // size, (wall.right - 1) // size + 1):
+                index = cy * self.cols + cx
+                if self.cells[index] == SOLID:
+                    continue
+                cell = pygame.Rect(cx * size, cy * size, size, size)
+                if wall.contains(cell):
+                    self.cells[index] = SOLID
+                    self.partial.pop(index, None)
+                else:
+                    self.cells[index] = PARTIAL
+                    self.partial.setdefault(index, []).append(wall)
+
+    def blocked(self, cx, cy):
+        """True if any wall touches cell (cx, cy); cells outside the grid count as free"""
+        if 0 <= cx < self.cols and 0 <= cy < self.rows:
+            return self.cells[cy * self.cols + cx] != EMPTY
+        return False
+
+    def collides(self, rect):
+        """Same answer as any(rect.colliderect(w) for w in walls)"""
+        if rect.w <= 0 or rect.h <= 0:
+            return False
+        size = self.cell_size
+        x0 = max(rect.left // size, 0)
+        y0 = max(rect.top // size, 0)
+        x1 = min((rect.right - 1) // size, self.cols - 1)
+        y1 = min((rect.bottom - 1) // size, self.rows - 1)
+        cells = self.cells
+        cols = self.cols
+        for cy in range(y0, y1 + 1):
+            row = cy * cols
+            for cx in range(x0, x1 + 1):
+                value = cells[row + cx]
+                if value == SOLID:
+                    return True
+                if value == PARTIAL and rect.collidelist(self.partial[row + cx]) != -1:
+                    return True
+        if self.outside and rect.collidelist(self.outside) != -1:
+            return True
+        return False
+
+    def find_free_spot(self, make, x_range, y_range, rng, attempts=100):
+        """Rejection-samples make(x, y) until its rect is clear of walls, else None"""
+        for _ in range(attempts + 1):
+            x = rng.randint(*x_range)
+            y = rng.randint(*y_range)
+            obj = make(x, y)
+            if not self.collides(obj.rect):
+                return obj
+        return None
+
+    def __len__(self):
+        return len(self.walls)
+
+    def __iter__(self):
+        return iter(self.walls)